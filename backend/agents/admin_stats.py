@@ -70,6 +70,44 @@ async def get_admin_stats():
         }
 
 
+@router.get("/llm-stats")
+async def get_llm_stats():
+    """LLM latency, token and cost instrumentation per agent, plus AI infrastructure counters"""
+    from ai_utils import (
+        get_llm_metrics,
+        get_response_cache_stats,
+        get_admission_stats,
+        get_provider_health,
+        get_cassette_stats
+    )
+    
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "llm": get_llm_metrics(),
+        "response_cache": get_response_cache_stats(),
+        "admission": get_admission_stats(),
+        "providers": get_provider_health(),
+        "cassette": get_cassette_stats()
+    }
+
+
+@router.get("/legal-stats")
+async def get_legal_stats():
+    """LegalAI knowledge snapshot, result cache hit ratio and prompt cache counters"""
+    from cache_layer import get_legal_check_cache_stats
+    from legal_knowledge import legal_knowledge
+    from legal_prompt import get_prompt_cache_stats
+    
+    snapshot = legal_knowledge.snapshot
+    
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "snapshot": snapshot.summary() if snapshot else None,
+        "check_cache": get_legal_check_cache_stats(),
+        "prompt_cache": get_prompt_cache_stats()
+    }
+
+
 @router.get("/users/list")
 async def list_users(limit: int = 50, offset: int = 0):
     """List all users with pagination"""
@@ -126,14 +164,19 @@ async def health_check():
         else:
             health["services"]["redis"] = "not_configured"
         
-        # Check AI availability
+        # Check AI availability from circuit breaker state (no live LLM call)
         try:
-            from ai_utils import AIProvider
-            provider = AIProvider()
-            test_response = await provider.generate("Say OK", "Test", "health_check")
-            health["services"]["openai"] = "healthy" if test_response else "unhealthy"
+            from ai_utils import get_provider_health
+            providers = get_provider_health()
+            health["ai_providers"] = providers
+            for name, provider_health in providers.items():
+                if provider_health["state"] == "closed":
+                    health["services"][name] = "healthy"
+                else:
+                    health["services"][name] = f"unhealthy: circuit {provider_health['state']}"
+                    health["status"] = "degraded"
         except Exception as e:
-            health["services"]["openai"] = f"unhealthy: {str(e)}"
+            health["services"]["ai"] = f"unhealthy: {str(e)}"
             health["status"] = "degraded"
         
         return health
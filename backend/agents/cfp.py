@@ -1,10 +1,21 @@
 """CFP-AI - Deterministic financial math and verification engine"""
 from fastapi import APIRouter, HTTPException
+import os
 import logging
+from datetime import date
+from typing import Any, Dict, List
+
+import numpy as np
 
 from schemas import (
     CFPSimulateInput,
     CFPSimulateOutput,
+    CFPSweepInput,
+    CFPSweepOutput,
+    CFPRiskInput,
+    CFPRiskOutput,
+    CFPHorizonInput,
+    CFPHorizonOutput,
     CFPVerifyInput,
     CFPVerifyOutput,
     CFPCalculations,
@@ -16,8 +27,18 @@ from math_utils import (
     calculate_snowball_payoff,
     calculate_avalanche_payoff,
     generate_savings_schedule,
+    savings_plan_array,
+    simulate_emergency_fund,
     calculate_dti
 )
+from debt_simulator import (
+    NOT_PAID_OFF,
+    minimum_payment_cents,
+    payoff_dates,
+    payoff_horizon,
+    simulate_payoff_grid
+)
+from money import from_cents_array, to_cents, to_cents_array
 from canonical_json import payload_hash, verify_payload_hash
 
 logger = logging.getLogger(__name__)
@@ -27,6 +48,13 @@ router = APIRouter(prefix="/api/cfp", tags=["cfp"])
 # CFP engine version
 CFP_VERSION = "v1.0"
 
+# Grid points per /sweep request
+CFP_SWEEP_MAX_POINTS = int(os.environ.get('CFP_SWEEP_MAX_POINTS', '2500'))
+
+# Monte Carlo limits per /risk request
+CFP_RISK_MAX_PATHS = int(os.environ.get('CFP_RISK_MAX_PATHS', '50000'))
+CFP_RISK_MAX_WEEKS = int(os.environ.get('CFP_RISK_MAX_WEEKS', '520'))
+
 
 @router.post("/simulate", response_model=CFPSimulateOutput)
 async def simulate_scenario(input_data: CFPSimulateInput):
@@ -85,8 +113,9 @@ async def simulate_scenario(input_data: CFPSimulateInput):
         
         # Assumptions
         assumptions = [
-            "30-day months used for calculations",
-            "Snowball method for debt payoff",
+            "30-day months used for savings calculations",
+            "Snowball method for debt payoff, simulated monthly with APR/12 interest",
+            "Minimum payment defaults to 2% of balance; freed minimums roll over",
             "50% surplus allocated to debt, 50% to savings",
             "Weekly micro-deposits for savings goals"
         ]
@@ -108,6 +137,256 @@ async def simulate_scenario(input_data: CFPSimulateInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/sweep", response_model=CFPSweepOutput)
+async def sweep_scenarios(input_data: CFPSweepInput):
+    """
+    What-if sweep over surplus split, extra payment and goal deadline
+    
+    Every combination of the grid values is evaluated with the same
+    allocation as /simulate, in one vectorized pass (one debt simulation per
+    distinct payment level), and returned as columns - one entry per grid
+    point, debt_share varying slowest and deadline_days fastest.
+    """
+    try:
+        scenario = input_data.scenario
+        grid = input_data.grid
+        goal = scenario.goal if scenario.goal and scenario.goal.type == "emergency" else None
+        deadlines = grid.deadline_days or ([goal.deadline_days] if goal else [0])
+        
+        points = len(grid.debt_share) * len(grid.extra_payment) * len(deadlines)
+        if points == 0 or points > CFP_SWEEP_MAX_POINTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Sweep grid has {points} points (allowed 1-{CFP_SWEEP_MAX_POINTS})"
+            )
+        if goal and min(deadlines) <= 0:
+            raise HTTPException(status_code=400, detail="deadline_days must be positive")
+        
+        monthly_surplus = float(calculate_monthly_surplus(scenario.income, scenario.expenses))
+        share, extra, deadline = (
+            axis.ravel() for axis in np.meshgrid(
+                np.asarray(grid.debt_share, dtype=np.float64),
+                np.asarray(grid.extra_payment, dtype=np.float64),
+                np.asarray(deadlines, dtype=np.int64),
+                indexing='ij'
+            )
+        )
+        
+        # Debt gets surplus * share plus the extra payment, savings the rest
+        debt_extra = np.maximum(to_cents_array(monthly_surplus * share + extra), 0)
+        payoff = simulate_payoff_grid(
+            [b.model_dump() for b in scenario.balances],
+            from_cents_array(debt_extra),
+            input_data.strategy.value
+        )
+        months = payoff["months"]
+        today = date.today()
+        
+        columns: Dict[str, List[Any]] = {
+            "debt_share": share.tolist(),
+            "extra_payment": extra.tolist(),
+            "deadline_days": deadline.tolist() if goal else [None] * points,
+            "debt_extra": from_cents_array(debt_extra).tolist(),
+            "months_to_payoff": [None if m == NOT_PAID_OFF else int(m) for m in months],
+            "payoff_date": payoff_dates(months, today),
+            "total_interest": [
+                interest if paid_off else None
+                for interest, paid_off in zip(from_cents_array(payoff["total_interest"]).tolist(), payoff["paid_off"])
+            ],
+        }
+        
+        if goal:
+            plans = savings_plan_array(np.full(points, goal.amount), deadline)
+            deposits = plans["deposits"]
+            savings_budget = to_cents_array(monthly_surplus * (1 - share))
+            goal_dates = np.datetime64(today, 'D') + 7 * np.maximum(deposits - 1, 0)
+            columns.update({
+                "weekly_deposit": plans["weekly"].tolist(),
+                "goal_date": [str(d) if n else None for d, n in zip(goal_dates, deposits)],
+                # Monthly need goal * 30 / days fits in the savings share of the surplus
+                "goal_funded": (to_cents(goal.amount) * 30 <= savings_budget * deadline).tolist(),
+            })
+        
+        checksum = payload_hash({
+            "monthly_surplus": monthly_surplus,
+            "strategy": input_data.strategy.value,
+            "columns": columns,
+            "cfp_version": CFP_VERSION
+        })
+        
+        assumptions = [
+            "Same allocation as /simulate: surplus x debt_share (+ extra_payment) to debt, the rest to savings",
+            f"{input_data.strategy.value.capitalize()} method for debt payoff, simulated monthly with APR/12 interest",
+            "Minimum payment defaults to 2% of balance; freed minimums roll over",
+            "Goal date is the last weekly micro-deposit of the savings schedule"
+        ]
+        
+        logger.info(f"CFP sweep completed: {points} points, surplus=${monthly_surplus}")
+        
+        return CFPSweepOutput(
+            ok=True,
+            monthly_surplus=monthly_surplus,
+            points=points,
+            columns=columns,
+            checksum=checksum,
+            assumptions=assumptions,
+            provenance_ref=f"cfp_sweep_{input_data.trace_id}"
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"CFP sweep failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/risk", response_model=CFPRiskOutput)
+async def simulate_risk(input_data: CFPRiskInput):
+    """
+    Monte Carlo emergency-fund risk
+    
+    Simulates income/expense paths with volatile income and surprise
+    expenses and reports the probability of reaching the goal by its
+    deadline plus weekly balance percentile bands. The RNG seed defaults to
+    a hash of the inputs, so identical requests give identical results.
+    """
+    try:
+        scenario = input_data.scenario
+        goal = scenario.goal
+        if not goal:
+            raise HTTPException(status_code=400, detail="Scenario goal is required")
+        if goal.deadline_days <= 0:
+            raise HTTPException(status_code=400, detail="deadline_days must be positive")
+        if not 0 < input_data.paths <= CFP_RISK_MAX_PATHS or not 0 < input_data.horizon_weeks <= CFP_RISK_MAX_WEEKS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"paths must be 1-{CFP_RISK_MAX_PATHS} and horizon_weeks 1-{CFP_RISK_MAX_WEEKS}"
+            )
+        # The engine extends the horizon to the deadline, so the deadline is capped too
+        if -(-goal.deadline_days // 7) > CFP_RISK_MAX_WEEKS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"deadline_days must be at most {CFP_RISK_MAX_WEEKS * 7} ({CFP_RISK_MAX_WEEKS} weeks)"
+            )
+        
+        params = input_data.model_dump(exclude={"user_id", "trace_id", "seed"})
+        seed = input_data.seed if input_data.seed is not None else int(payload_hash(params)[:16], 16)
+        
+        result = simulate_emergency_fund(
+            monthly_income=scenario.income,
+            monthly_expenses=scenario.expenses,
+            goal_amount=goal.amount,
+            deadline_days=goal.deadline_days,
+            savings_share=input_data.savings_share,
+            starting_balance=input_data.starting_balance,
+            income_volatility=input_data.income_volatility,
+            expense_volatility=input_data.expense_volatility,
+            shocks_per_year=input_data.shocks_per_year,
+            shock_amount=input_data.shock_amount,
+            paths=input_data.paths,
+            horizon_weeks=input_data.horizon_weeks,
+            seed=seed
+        )
+        
+        checksum = payload_hash({
+            "params": params,
+            "seed": seed,
+            "result": result,
+            "cfp_version": CFP_VERSION
+        })
+        
+        assumptions = [
+            "Weekly steps; monthly income and expenses spread over 52/12 weeks",
+            "Lognormal weekly income, normal weekly expenses, Poisson surprise expenses",
+            f"{input_data.savings_share:.0%} of each positive week saved; shortfalls drawn from the fund",
+            "Fund balance never drops below zero"
+        ]
+        
+        logger.info(
+            f"CFP risk simulation completed: {result['paths']} paths x {result['horizon_weeks']} weeks, "
+            f"p(goal)={result['goal_probability']}"
+        )
+        
+        return CFPRiskOutput(
+            ok=True,
+            seed=seed,
+            checksum=checksum,
+            assumptions=assumptions,
+            provenance_ref=f"cfp_risk_{input_data.trace_id}",
+            **result
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"CFP risk simulation failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/payoff-horizon", response_model=CFPHorizonOutput)
+async def payoff_horizon_summary(input_data: CFPHorizonInput):
+    """
+    Months until debt-free and interest totals for dashboards
+    
+    Every debt is paid independently with its minimum plus extra_payment (no
+    rollover between debts), so the answer is the closed-form NPER per debt -
+    no schedule is iterated.
+    """
+    try:
+        balances = input_data.balances
+        payments = from_cents_array(np.array(
+            [minimum_payment_cents(b.model_dump()) for b in balances], dtype=np.int64
+        )) + max(input_data.extra_payment, 0)
+        horizon = payoff_horizon(
+            np.array([b.balance for b in balances], dtype=np.float64),
+            np.array([b.apr for b in balances], dtype=np.float64),
+            payments
+        )
+        months = horizon["months"]
+        today = date.today()
+        
+        debt_free = bool((months != NOT_PAID_OFF).all())
+        debt_free_months = int(months.max(initial=0)) if debt_free else None
+        columns: Dict[str, List[Any]] = {
+            "account": [b.name for b in balances],
+            "balance": [b.balance for b in balances],
+            "apr": [b.apr for b in balances],
+            "payment": payments.tolist(),
+            "months_to_payoff": [None if m == NOT_PAID_OFF else int(m) for m in months],
+            "payoff_date": payoff_dates(months, today),
+            "total_interest": [
+                None if m == NOT_PAID_OFF else interest
+                for m, interest in zip(months, from_cents_array(horizon["total_interest"]).tolist())
+            ],
+        }
+        total_interest = float(from_cents_array(horizon["total_interest"].sum())) if debt_free else None
+        
+        checksum = payload_hash({
+            "columns": columns,
+            "debt_free_months": debt_free_months,
+            "cfp_version": CFP_VERSION
+        })
+        
+        return CFPHorizonOutput(
+            ok=True,
+            columns=columns,
+            debt_free_months=debt_free_months,
+            debt_free_date=payoff_dates([debt_free_months], today)[0] if debt_free else None,
+            total_interest=total_interest,
+            checksum=checksum,
+            assumptions=[
+                "Each debt paid with its minimum (default 2% of balance) plus extra_payment",
+                "No rollover between debts; interest at APR/12 monthly",
+                "Debts not paid off within 50 years have no payoff date or interest total"
+            ],
+            provenance_ref=f"cfp_horizon_{input_data.trace_id}"
+        )
+        
+    except Exception as e:
+        logger.error(f"CFP payoff horizon failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/verify", response_model=CFPVerifyOutput)
 async def verify_calculations(input_data: CFPVerifyInput):
     """
@@ -186,7 +186,7 @@ async def estimate_credit_score(user_id: str):
         Estimate their credit score and provide recommendations.
         """
         
-        ai_response = await provider.generate(system_prompt, user_prompt, f"credit_{user_id}_{datetime.now().timestamp()}")
+        ai_response = await provider.generate(system_prompt, user_prompt, f"credit_{user_id}_{datetime.now().timestamp()}", caller="CreditAI")
         
         # Parse AI response
         import json
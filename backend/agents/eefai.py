@@ -1,6 +1,10 @@
 """EEFai - Personal financial advisor agent (per-user instance)"""
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+import json
 import logging
+import re
 import uuid
 from datetime import datetime, timezone
 
@@ -11,11 +15,52 @@ from schemas import (
 )
 from database import get_mongo_db
 from ai_utils import extract_intent
+from intent_classifier import intent_classifier, INTENT_CONFIDENCE_THRESHOLD
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/eefai", tags=["eefai"])
 
+# Intents EEFai can route a message to
+AVAILABLE_ACTIONS = [
+    "upload_debt_letter",
+    "create_savings_plan",
+    "dispute_credit_item",
+    "general_question",
+    "check_status"
+]
+
+
+def new_eefai_instance(user_id: str, profile_data: dict = None) -> dict:
+    """Fresh eefai_state document for a user"""
+    return {
+        "user_id": user_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "conversation_history": [],
+        "current_plan_id": None,
+        "stage": "stabilize",
+        "profile": profile_data or {
+            "income": 0,
+            "expenses": 0,
+            "debts": [],
+            "goals": []
+        },
+        "context_refs": {
+            "short_term_memory": [],
+            "long_term_memory": []
+        }
+    }
+
+
+async def publish_user_registered(user_id: str, profile_data: dict):
+    """Publish the user.registered event for a newly created instance"""
+    from event_bus import event_bus
+    await event_bus.publish('user.registered', {
+        'user_id': user_id,
+        'profile': profile_data,
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    })
+
 
 @router.post("/create")
 async def create_eefai_instance(user_id: str = None, profile: dict = None):
@@ -55,33 +100,10 @@ async def create_eefai_instance(user_id: str = None, profile: dict = None):
             return {"message": "EEFai instance already exists", "user_id": user_id}
         
         # Create new instance with profile
-        instance = {
-            "user_id": user_id,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "conversation_history": [],
-            "current_plan_id": None,
-            "stage": "stabilize",
-            "profile": profile_data or {
-                "income": 0,
-                "expenses": 0,
-                "debts": [],
-                "goals": []
-            },
-            "context_refs": {
-                "short_term_memory": [],
-                "long_term_memory": []
-            }
-        }
+        instance = new_eefai_instance(user_id, profile_data)
         
         await db.eefai_state.insert_one(instance)
-        
-        # Publish event
-        from event_bus import event_bus
-        await event_bus.publish('user.registered', {
-            'user_id': user_id,
-            'profile': profile_data,
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        })
+        await publish_user_registered(user_id, profile_data)
         
         logger.info(f"EEFai instance created for {user_id} with profile: {profile_data}")
         
@@ -121,32 +143,101 @@ async def send_message_to_eefai(user_id: str, input_data: EEFaiMessageInput):
     EEFai routes requests through OrchestratorAI for validation
     """
     try:
-        db = get_mongo_db()
-        
-        # Get EEFai state
-        state = await db.eefai_state.find_one({"user_id": user_id})
-        if not state:
-            # Auto-create if not exists
-            await create_eefai_instance(user_id)
-            state = await db.eefai_state.find_one({"user_id": user_id})
-        
         # Extract intent from message
-        available_actions = [
-            "upload_debt_letter",
-            "create_savings_plan",
-            "dispute_credit_item",
-            "general_question",
-            "check_status"
-        ]
-        
-        intent = await extract_intent(input_data.message, available_actions)
+        intent, intent_source = await classify_intent(input_data.message, AVAILABLE_ACTIONS)
         
         # Generate response based on intent
         response_id = str(uuid.uuid4())
-        actions = []
+        response_text, actions = build_eefai_response(intent)
+        
+        # Update conversation history
+        await record_conversation(user_id, input_data.message, response_text, intent, intent_source)
+        
+        result = EEFaiMessageOutput(
+            response_id=response_id,
+            text=response_text,
+            actions=actions,
+            provenance_ref=f"eefai_{input_data.trace_id}"
+        )
         
-        if intent == "upload_debt_letter":
-            response_text = """I can help you respond to that debt collection letter. 
+        logger.info(f"EEFai responded to user {user_id}: intent={intent} ({intent_source})")
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"EEFai message failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{user_id}/message/stream")
+async def stream_message_to_eefai(user_id: str, input_data: EEFaiMessageInput):
+    """
+    Streaming variant of /message using server-sent events
+    
+    Events, in order:
+    - start: response_id, sent before any work so the first byte is immediate
+    - meta: intent and suggested actions once the intent is known
+    - chunk: successive pieces of the reply text
+    - done: provenance_ref
+    - error: detail, if anything fails mid-stream
+    
+    The conversation-history write runs after the stream has closed.
+    """
+    response_id = str(uuid.uuid4())
+    completed = {}
+    
+    async def event_stream():
+        yield format_sse("start", {"response_id": response_id})
+        try:
+            intent, intent_source = await classify_intent(input_data.message, AVAILABLE_ACTIONS)
+            response_text, actions = build_eefai_response(intent)
+            
+            yield format_sse("meta", {
+                "intent": intent,
+                "actions": [action.model_dump() for action in actions]
+            })
+            for chunk in split_response_chunks(response_text):
+                yield format_sse("chunk", {"text": chunk})
+            yield format_sse("done", {"provenance_ref": f"eefai_{input_data.trace_id}"})
+            
+            completed.update(response_text=response_text, intent=intent, intent_source=intent_source)
+            logger.info(f"EEFai streamed response to user {user_id}: intent={intent} ({intent_source})")
+        except Exception as e:
+            logger.error(f"EEFai stream failed: {e}")
+            yield format_sse("error", {"detail": str(e)})
+    
+    async def record_after_stream():
+        if not completed:
+            return
+        try:
+            await record_conversation(
+                user_id,
+                input_data.message,
+                completed["response_text"],
+                completed["intent"],
+                completed["intent_source"]
+            )
+        except Exception as e:
+            logger.error(f"Failed to record streamed conversation for {user_id}: {e}")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(record_after_stream)
+    )
+
+
+def build_eefai_response(intent: str) -> tuple:
+    """
+    Assemble EEFai reply text and suggested actions for an intent
+    
+    Returns: (response_text, actions)
+    """
+    actions = []
+    
+    if intent == "upload_debt_letter":
+        response_text = """I can help you respond to that debt collection letter. 
             
 Under the Fair Debt Collection Practices Act, you have important rights. Let me help you:
             1. Verify this debt is legitimate
@@ -154,10 +245,10 @@ Under the Fair Debt Collection Practices Act, you have important rights. Let me
             3. Draft a proper validation request
             
             Please upload the letter so I can analyze it."""
-            actions.append(EEFaiAction(type="task", ref="upload_document"))
-        
-        elif intent == "create_savings_plan":
-            response_text = """Let's build your emergency fund together!
+        actions.append(EEFaiAction(type="task", ref="upload_document"))
+    
+    elif intent == "create_savings_plan":
+        response_text = """Let's build your emergency fund together!
             
             I'll need to understand your situation:
             - What's your monthly income?
@@ -166,10 +257,10 @@ Under the Fair Debt Collection Practices Act, you have important rights. Let me
             - When do you need it by?
             
             Once I have this info, I'll create a realistic plan with small, daily actions."""
-            actions.append(EEFaiAction(type="plan", ref="emergency_savings_setup"))
-        
-        elif intent == "dispute_credit_item":
-            response_text = """I can help you dispute inaccurate items on your credit report.
+        actions.append(EEFaiAction(type="plan", ref="emergency_savings_setup"))
+    
+    elif intent == "dispute_credit_item":
+        response_text = """I can help you dispute inaccurate items on your credit report.
             
             Under the Fair Credit Reporting Act, you have the right to dispute any inaccurate information. 
             I'll help you:
@@ -178,51 +269,76 @@ Under the Fair Debt Collection Practices Act, you have important rights. Let me
             3. Draft proper dispute letters to all three bureaus
             
             What item do you want to dispute?"""
-            actions.append(EEFaiAction(type="task", ref="credit_dispute_setup"))
-        
-        else:
-            response_text = """I'm here to help you with:
+        actions.append(EEFaiAction(type="task", ref="credit_dispute_setup"))
+    
+    else:
+        response_text = """I'm here to help you with:
             - Emergency expenses and debt collection issues
             - Building your emergency savings fund
             - Improving your credit score
             - Creating a realistic financial plan
             
             What would you like to work on today?"""
-        
-        # Update conversation history
-        conversation_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "user_message": input_data.message,
-            "eefai_response": response_text,
-            "intent": intent
-        }
-        
-        await db.eefai_state.update_one(
-            {"user_id": user_id},
-            {
-                "$push": {
-                    "conversation_history": {
-                        "$each": [conversation_entry],
-                        "$slice": -30  # Keep last 30
-                    }
-                }
+    
+    return response_text, actions
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def split_response_chunks(text: str, words_per_chunk: int = 8) -> list:
+    """Split reply text into word-group chunks, preserving whitespace"""
+    tokens = re.findall(r"\S+\s*", text)
+    return ["".join(tokens[i:i + words_per_chunk]) for i in range(0, len(tokens), words_per_chunk)]
+
+
+async def record_conversation(user_id: str, user_message: str, response_text: str, intent: str, intent_source: str):
+    """
+    Append an exchange to the user's conversation history, creating the instance if needed
+    
+    One upsert does both, so concurrent first messages cannot create two
+    eefai_state documents for a user.
+    """
+    db = get_mongo_db()
+    conversation_entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "user_message": user_message,
+        "eefai_response": response_text,
+        "intent": intent,
+        "intent_source": intent_source
+    }
+    # Auto-create if not exists; user_id comes from the filter, history from $push
+    on_insert = new_eefai_instance(user_id)
+    del on_insert["user_id"], on_insert["conversation_history"]
+    update = {
+        "$push": {
+            "conversation_history": {
+                "$each": [conversation_entry],
+                "$slice": -30  # Keep last 30
             }
-        )
-        
-        result = EEFaiMessageOutput(
-            response_id=response_id,
-            text=response_text,
-            actions=actions,
-            provenance_ref=f"eefai_{input_data.trace_id}"
-        )
-        
-        logger.info(f"EEFai responded to user {user_id}: intent={intent}")
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"EEFai message failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        },
+        "$setOnInsert": on_insert
+    }
+    
+    result = await db.eefai_state.update_one({"user_id": user_id}, update, upsert=True)
+    if result.upserted_id is not None:
+        logger.info(f"EEFai instance created for {user_id} on first message")
+        await publish_user_registered(user_id, {})
+
+
+async def classify_intent(message: str, available_actions: list) -> tuple:
+    """
+    Classify message intent, trying the local classifier before the LLM
+    
+    Returns: (intent, source) where source is "local" or "llm"
+    """
+    intent, confidence = intent_classifier.predict(message)
+    if intent in available_actions and confidence >= INTENT_CONFIDENCE_THRESHOLD:
+        return intent, "local"
+    
+    return await extract_intent(message, available_actions), "llm"
 
 
 @router.post("/{user_id}/assign-plan")
@@ -185,7 +185,7 @@ def extract_fields_from_text(text: str) -> dict:
         user_prompt = f"Extract information from this document:\n\n{text[:2000]}"
         
         # Run AI extraction
-        ai_response = asyncio.run(provider.generate(system_prompt, user_prompt, f"intake_{hash(text)}"))
+        ai_response = asyncio.run(provider.generate(system_prompt, user_prompt, f"intake_{hash(text)}", cache_ttl=3600, caller="IntakeAgent"))
         
         # Parse AI response
         json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
@@ -1,19 +1,40 @@
 """LegalAI - AI-powered legal rules engine with FDCPA/FCRA/CROA"""
 from fastapi import APIRouter, HTTPException
+import os
+import asyncio
 import logging
 from typing import List
-from datetime import datetime, timedelta
 import json
 import re
+import numpy as np
+from datetime import date
 
 from schemas import (
     LegalCheckInput,
     LegalCheckOutput,
     LegalFlag,
     LegalCitation,
+    LegalCheckMode,
+    LegalBatchItem,
+    LegalBatchCheckInput,
+    LegalBatchItemResult,
+    LegalBatchCheckOutput,
     Severity
 )
+from cache_layer import cache_legal_check, get_cached_legal_check, legal_check_cache_key
+from canonical_json import payload_hash
 from database import get_mongo_db
+from legal_index import build_rule_query
+from legal_knowledge import legal_knowledge
+from legal_prompt import (
+    build_system_prompt,
+    build_user_prompt,
+    build_batch_system_prompt,
+    build_batch_user_prompt,
+    rules_key
+)
+from legal_rule_engine import RuleEngine
+from sol_engine import UNKNOWN_SOL, compute_expiry, expired_mask, parse_account_dates
 
 logger = logging.getLogger(__name__)
 
@@ -22,91 +43,194 @@ router = APIRouter(prefix="/api/legal", tags=["legal"])
 # Legal DB version
 LEGAL_DB_VERSION = "v1.0"
 
+# Rules ranked into the LLM prompt per request
+LEGAL_TOP_K_RULES = int(os.environ.get('LEGAL_TOP_K_RULES', '10'))
+
+# Action types answered by deterministic checks alone in auto mode
+DETERMINISTIC_ACTION_TYPES = {"statute_check"}
+
+# Batch limits: items per request and accounts per multi-item LLM prompt
+LEGAL_BATCH_MAX_ITEMS = int(os.environ.get('LEGAL_BATCH_MAX_ITEMS', '1000'))
+LEGAL_BATCH_AI_GROUP_SIZE = int(os.environ.get('LEGAL_BATCH_AI_GROUP_SIZE', '20'))
+
+
+def resolve_check_mode(mode: LegalCheckMode, action_type: str, context: dict, engine: RuleEngine) -> LegalCheckMode:
+    """
+    Concrete mode for a request
+    
+    Auto skips the LLM for deterministic action types, and for action types
+    the rule engine covers when every context field is one its checks read -
+    the LLM only sees residual cases.
+    """
+    if mode != LegalCheckMode.AUTO:
+        return mode
+    if action_type in DETERMINISTIC_ACTION_TYPES:
+        return LegalCheckMode.DETERMINISTIC
+    if engine.covers(action_type) and not engine.residual_context(action_type, context):
+        return LegalCheckMode.DETERMINISTIC
+    return LegalCheckMode.FULL
+
+
+def legal_check_input_hash(input_data: LegalCheckInput, mode: LegalCheckMode) -> str:
+    """
+    Hash of the check input's canonical JSON
+    
+    Only trace_id is excluded. The context is hashed as given - a field set
+    to None or "" is a different request from a missing one, since the rule
+    engine and the LLM can read it differently. Today's date is included
+    because SOL and date-window checks depend on it.
+    """
+    return payload_hash({
+        "state": input_data.user_state.state.upper(),
+        "action_type": input_data.action_type,
+        "mode": mode.value,
+        "context": input_data.context,
+        "as_of": date.today().isoformat()
+    })
+
+
+def batch_item_context(item: LegalBatchItem) -> dict:
+    """
+    Context a batch item is checked with - the /check context it is equivalent to
+    
+    Statute checks read debt_type and account_date from the context, so the
+    item's dedicated fields are folded in for them.
+    """
+    context = dict(item.context)
+    if item.action_type == "statute_check":
+        context["debt_type"] = item.debt_type
+        if item.account_date:
+            context["account_date"] = item.account_date
+    return context
+
+
+async def run_ai_analysis(input_data: LegalCheckInput) -> tuple:
+    """
+    LLM review of the request against the best-matching rules
+    
+    Returns: (flags[], must_escalate, degraded) - degraded when the fallback
+    provider answered or its reply had no parseable JSON
+    """
+    from ai_utils import AIProvider, OPENAI_MODEL
+    
+    flags = []
+    must_escalate = False
+    
+    # Rank the snapshot's rules against this request
+    snapshot = await legal_knowledge.get(get_mongo_db())
+    relevant_rules = snapshot.index.search(
+        build_rule_query(input_data.action_type, input_data.context),
+        k=LEGAL_TOP_K_RULES,
+        state=input_data.user_state.state
+    )
+    
+    # Use AI to analyze legal situation
+    provider = AIProvider(temperature=0.0)  # Deterministic for legal
+    
+    system_prompt = build_system_prompt(LEGAL_DB_VERSION, rules_key(relevant_rules))
+    user_prompt = build_user_prompt(
+        input_data.action_type,
+        input_data.user_state.state,
+        input_data.context
+    )
+    
+    ai_response, source = await provider.generate_with_source(
+        system_prompt,
+        user_prompt,
+        f"legal_{input_data.trace_id}",
+        cache_ttl=600,
+        priority="legal",
+        caller="LegalAI"
+    )
+    degraded = source not in ("cache", OPENAI_MODEL[0])
+    
+    # Parse AI response and add to flags
+    json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
+    if json_match:
+        ai_data = json.loads(json_match.group())
+        
+        for issue in ai_data.get('issues_found', []):
+            flags.append(LegalFlag(
+                code="AI_IDENTIFIED",
+                explanation=issue,
+                severity=Severity.MEDIUM,
+                citation_id="AI_ANALYSIS"
+            ))
+        
+        must_escalate = ai_data.get('must_escalate', False)
+    else:
+        degraded = True
+    
+    return (flags, must_escalate, degraded)
+
+
+async def run_deterministic_checks(action_type: str, state: str, context: dict) -> tuple:
+    """
+    Rule-based checks for an action type
+    
+    Returns: (flags[], citations[])
+    """
+    flags = []
+    citations = []
+    
+    if action_type == "statute_check":
+        sol_flag, sol_citation = await check_statute_of_limitations(
+            state,
+            context.get("debt_type", "credit_card"),
+            context.get("account_date")
+        )
+        if sol_flag:
+            flags.append(sol_flag)
+        if sol_citation:
+            citations.append(sol_citation)
+    
+    # Compiled FDCPA/FCRA checks, all applicable ones in one pass
+    snapshot = await legal_knowledge.get(get_mongo_db())
+    rule_flags, rule_citations = snapshot.engine.evaluate(action_type, state, context, LEGAL_DB_VERSION)
+    flags.extend(rule_flags)
+    citations.extend(rule_citations)
+    
+    return (flags, citations)
+
 
 @router.post("/check", response_model=LegalCheckOutput)
 async def check_legal(input_data: LegalCheckInput):
     """
     Legal validation with AI-powered analysis
+    
+    Deterministic checks and the AI review run concurrently; in deterministic
+    mode (the default for statute checks) the LLM is skipped entirely.
     """
     try:
-        from ai_utils import AIProvider
-        
-        flags: List[LegalFlag] = []
-        citations: List[LegalCitation] = []
-        must_escalate = False
-        
-        # Get relevant rules from database
-        db = get_mongo_db()
-        relevant_rules = await db.legal_rules.find(
-            {"rule_type": {"$in": ["debt_collection", "credit_reporting"]}},
-            {"_id": 0}
-        ).to_list(50)
-        
-        # Use AI to analyze legal situation
-        provider = AIProvider(temperature=0.0)  # Deterministic for legal
-        
-        system_prompt = f"""You are LegalAI, a legal compliance analyzer for FDCPA/FCRA/CROA.
-        
-        Available Legal Rules:
-        {json.dumps([{"code": r['rule_code'], "text": r['rule_text']} for r in relevant_rules[:10]], indent=2)}
-        
-        Analyze the user's situation and identify any legal issues or rights.
-        Respond in JSON format:
-        {{
-          "ok": true,
-          "issues_found": ["issue description"],
-          "applicable_rules": ["FDCPA_809", "FCRA_611"],
-          "must_escalate": false,
-          "advice": "Brief legal guidance"
-        }}
-        """
-        
-        user_prompt = f"""
-        Action Type: {input_data.action_type}
-        State: {input_data.user_state.state}
-        Context: {json.dumps(input_data.context)}
+        snapshot = await legal_knowledge.get(get_mongo_db())
+        mode = resolve_check_mode(input_data.mode, input_data.action_type, input_data.context, snapshot.engine)
+        provenance_ref = f"legal_ai_{input_data.trace_id}"
         
-        Analyze this situation for legal compliance and consumer rights.
-        """
-        
-        ai_response = await provider.generate(system_prompt, user_prompt, f"legal_{input_data.trace_id}")
-        
-        # Parse AI response and add to flags
-        json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
-        if json_match:
-            ai_data = json.loads(json_match.group())
-            
-            for issue in ai_data.get('issues_found', []):
-                flags.append(LegalFlag(
-                    code="AI_IDENTIFIED",
-                    explanation=issue,
-                    severity=Severity.MEDIUM,
-                    citation_id="AI_ANALYSIS"
-                ))
-            
-            must_escalate = ai_data.get('must_escalate', False)
+        # Identical input against the same rule version gives the same answer
+        cache_key = legal_check_cache_key(
+            f"{LEGAL_DB_VERSION}:{snapshot.version}",
+            legal_check_input_hash(input_data, mode)
+        )
+        cached = await get_cached_legal_check(cache_key)
+        if cached:
+            logger.info(f"Legal check cache hit ({mode.value})")
+            return LegalCheckOutput(**{**cached, "provenance_ref": provenance_ref})
+        deterministic = run_deterministic_checks(
+            input_data.action_type,
+            input_data.user_state.state,
+            input_data.context
+        )
         
-        # Also run deterministic checks
-        if input_data.action_type == "statute_check":
-            sol_flag, sol_citation = await check_statute_of_limitations(
-                input_data.user_state.state,
-                input_data.context.get("debt_type", "credit_card"),
-                input_data.context.get("account_date")
+        if mode == LegalCheckMode.FULL:
+            (ai_flags, must_escalate, degraded), (rule_flags, citations) = await asyncio.gather(
+                run_ai_analysis(input_data),
+                deterministic
             )
-            if sol_flag:
-                flags.append(sol_flag)
-            if sol_citation:
-                citations.append(sol_citation)
-        
-        if input_data.action_type == "debt_validation":
-            fdcpa_flags, fdcpa_citations = await check_fdcpa_compliance(input_data.context)
-            flags.extend(fdcpa_flags)
-            citations.extend(fdcpa_citations)
+        else:
+            ai_flags, must_escalate, degraded = [], False, False
+            rule_flags, citations = await deterministic
         
-        if input_data.action_type == "credit_dispute":
-            fcra_flags, fcra_citations = await check_fcra_compliance(input_data.context)
-            flags.extend(fcra_flags)
-            citations.extend(fcra_citations)
+        flags: List[LegalFlag] = ai_flags + rule_flags
         
         for flag in flags:
             if flag.severity == Severity.HIGH:
@@ -120,10 +244,14 @@ async def check_legal(input_data: LegalCheckInput):
             flags=flags,
             citations=citations,
             must_escalate=must_escalate,
-            provenance_ref=f"legal_ai_{input_data.trace_id}"
+            provenance_ref=provenance_ref
         )
         
-        logger.info(f"AI-powered legal check: ok={ok}, escalate={must_escalate}, flags={len(flags)}")
+        # A fallback or unparsed AI review is served but not kept for the full TTL
+        if not degraded:
+            await cache_legal_check(cache_key, result.model_dump(mode="json"))
+        
+        logger.info(f"Legal check ({mode.value}): ok={ok}, escalate={must_escalate}, flags={len(flags)}")
         
         return result
         
@@ -132,21 +260,215 @@ async def check_legal(input_data: LegalCheckInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/check-batch", response_model=LegalBatchCheckOutput)
+async def check_legal_batch(input_data: LegalBatchCheckInput):
+    """
+    Legal validation for a portfolio of accounts
+    
+    Every item gets the same deterministic checks as /check with
+    batch_item_context(item): SOL is resolved once per distinct state/debt
+    type and evaluated as arrays over the whole batch, then the compiled
+    checks (including '*' checks) run per item. Accounts that need AI review
+    are grouped by state into multi-account prompts. An account whose review
+    failed or was left out of the reply keeps its deterministic result and
+    is marked degraded and escalated.
+    """
+    try:
+        items = input_data.items
+        if len(items) > LEGAL_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch too large: {len(items)} items (max {LEGAL_BATCH_MAX_ITEMS})"
+            )
+        
+        flags: List[List[LegalFlag]] = [[] for _ in items]
+        citations: List[List[LegalCitation]] = [[] for _ in items]
+        escalate = [False] * len(items)
+        
+        # AI review first so it overlaps the deterministic pass
+        snapshot = await legal_knowledge.get(get_mongo_db())
+        contexts = [batch_item_context(item) for item in items]
+        ai_indices = [
+            index for index, item in enumerate(items)
+            if resolve_check_mode(input_data.mode, item.action_type, contexts[index], snapshot.engine) == LegalCheckMode.FULL
+        ]
+        ai_task = asyncio.create_task(run_batch_ai_analysis(items, ai_indices, input_data.trace_id))
+        
+        try:
+            # Same order as run_deterministic_checks: SOL finding, then compiled checks
+            statute_indices = [index for index, item in enumerate(items) if item.action_type == "statute_check"]
+            for index, (flag, citation) in (await check_statute_batch(items, statute_indices)).items():
+                flags[index].append(flag)
+                if citation:
+                    citations[index].append(citation)
+            
+            for index, item in enumerate(items):
+                rule_flags, rule_citations = snapshot.engine.evaluate(
+                    item.action_type, item.state, contexts[index], LEGAL_DB_VERSION
+                )
+                flags[index].extend(rule_flags)
+                citations[index].extend(rule_citations)
+            
+            ai_results = await ai_task
+        finally:
+            if not ai_task.done():
+                ai_task.cancel()
+        
+        ai_wanted = set(ai_indices)
+        results = []
+        for index, item in enumerate(items):
+            unreviewed = index in ai_wanted and index not in ai_results
+            ai_flags, ai_escalate = ai_results.get(index, ([], False))
+            item_flags = ai_flags + flags[index]
+            high = any(flag.severity == Severity.HIGH for flag in item_flags)
+            results.append(LegalBatchItemResult(
+                index=index,
+                item_id=item.item_id,
+                ok=not high,
+                flags=item_flags,
+                citations=citations[index],
+                must_escalate=ai_escalate or high or unreviewed,
+                degraded=unreviewed
+            ))
+        
+        logger.info(
+            f"Batch legal check: {len(items)} items, {len(ai_results)}/{len(ai_indices)} AI-reviewed, "
+            f"{sum(1 for r in results if not r.ok)} not ok"
+        )
+        
+        return LegalBatchCheckOutput(results=results, provenance_ref=f"legal_ai_batch_{input_data.trace_id}")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch legal check failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def check_statute_batch(items: List[LegalBatchItem], indices: List[int]) -> dict:
+    """
+    Statute of limitations check over many accounts at once
+    
+    Returns: {item index: (flag, citation)} for expired accounts and
+    accounts whose SOL is not on file (citation is None for those)
+    """
+    if not indices:
+        return {}
+    
+    snapshot = await legal_knowledge.get(get_mongo_db())
+    
+    states = [items[i].state for i in indices]
+    debt_types = [items[i].debt_type for i in indices]
+    years = snapshot.sol_matrix.lookup_many(states, debt_types)
+    expiry, days_remaining = compute_expiry(parse_account_dates([items[i].account_date for i in indices]), years)
+    expired = expired_mask(expiry, days_remaining)
+    
+    # One (flag, citation) pair per distinct state/debt type
+    findings = {}
+    shared = {}
+    for position in np.flatnonzero(expired | (years == UNKNOWN_SOL)):
+        item = items[indices[position]]
+        key = (item.state.upper(), item.debt_type.lower())
+        if key not in shared:
+            if years[position] == UNKNOWN_SOL:
+                shared[key] = sol_unknown_findings(item.state, item.debt_type)
+            else:
+                shared[key] = sol_expired_findings(item.state, item.debt_type, int(years[position]))
+        findings[indices[position]] = shared[key]
+    return findings
+
+
+async def run_batch_ai_analysis(items: List[LegalBatchItem], indices: List[int], trace_id: str) -> dict:
+    """
+    AI review of many accounts, LEGAL_BATCH_AI_GROUP_SIZE accounts per prompt
+    
+    Groups never mix states, so each prompt only carries rules that apply
+    in its state. A group whose call or reply fails is logged and skipped.
+    
+    Returns: {item index: (flags[], must_escalate)} for reviewed items only
+    """
+    if not indices:
+        return {}
+    
+    by_state = {}
+    for index in indices:
+        by_state.setdefault(items[index].state.upper(), []).append(index)
+    groups = [
+        (state, state_indices[start:start + LEGAL_BATCH_AI_GROUP_SIZE])
+        for state, state_indices in by_state.items()
+        for start in range(0, len(state_indices), LEGAL_BATCH_AI_GROUP_SIZE)
+    ]
+    results = {}
+    for (state, group), group_results in zip(groups, await asyncio.gather(*[
+        _analyze_batch_group(items, group, state, f"legal_batch_{trace_id}_{number}")
+        for number, (state, group) in enumerate(groups)
+    ], return_exceptions=True)):
+        if isinstance(group_results, BaseException):
+            logger.warning(f"Batch AI review failed for {len(group)} {state} items: {group_results}")
+            continue
+        results.update(group_results)
+    return results
+
+
+async def _analyze_batch_group(items: List[LegalBatchItem], group: List[int], state: str, session_id: str) -> dict:
+    from ai_utils import AIProvider
+    
+    snapshot = await legal_knowledge.get(get_mongo_db())
+    query = " ".join(
+        build_rule_query(items[i].action_type, {**items[i].context, "debt_type": items[i].debt_type})
+        for i in group
+    )
+    relevant_rules = snapshot.index.search(query, k=LEGAL_TOP_K_RULES, state=state)
+    
+    entries = []
+    for i in group:
+        context = {**items[i].context, "debt_type": items[i].debt_type}
+        if items[i].account_date:
+            context["account_date"] = items[i].account_date
+        entries.append((items[i].action_type, items[i].state, context))
+    
+    provider = AIProvider(temperature=0.0)
+    ai_response = await provider.generate(
+        build_batch_system_prompt(LEGAL_DB_VERSION, rules_key(relevant_rules)),
+        build_batch_user_prompt(entries),
+        session_id,
+        cache_ttl=600,
+        priority="legal",
+        caller="LegalAI"
+    )
+    
+    results = {}
+    json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
+    if json_match:
+        ai_data = json.loads(json_match.group())
+        for entry in ai_data.get('items', []):
+            number = entry.get('item')
+            if not isinstance(number, int) or not 1 <= number <= len(group):
+                continue
+            item_flags = [
+                LegalFlag(
+                    code="AI_IDENTIFIED",
+                    explanation=issue,
+                    severity=Severity.MEDIUM,
+                    citation_id="AI_ANALYSIS"
+                )
+                for issue in entry.get('issues_found', [])
+            ]
+            results[group[number - 1]] = (item_flags, bool(entry.get('must_escalate', False)))
+    return results
+
+
 @router.get("/citation/{citation_id}")
 async def get_citation(citation_id: str):
     """Retrieve full citation details"""
     try:
-        db = get_mongo_db()
+        snapshot = await legal_knowledge.get(get_mongo_db())
         
-        row = await db.legal_rules.find_one({'rule_code': citation_id})
+        row = snapshot.rule(citation_id)
         
         if not row:
             raise HTTPException(status_code=404, detail="Citation not found")
         
-        # Convert MongoDB _id to string if present
-        if '_id' in row:
-            row['_id'] = str(row['_id'])
-        
         return row
         
     except HTTPException:
@@ -157,51 +479,20 @@ async def get_citation(citation_id: str):
 
 
 async def check_statute_of_limitations(state: str, debt_type: str, account_date: str) -> tuple:
-    """Check if debt is past statute of limitations (with caching)"""
+    """Check if debt is past statute of limitations (from the legal snapshot)"""
     try:
-        # Check cache first
-        from cache_layer import get_cached_sol, cache_sol_lookup
+        snapshot = await legal_knowledge.get(get_mongo_db())
+        sol_years = snapshot.sol_matrix.lookup(state, debt_type)
         
-        cached = await get_cached_sol(state, debt_type)
-        if cached:
-            logger.info(f"SOL lookup from cache: {state}/{debt_type}")
-            sol_years = cached['years']
-        else:
-            # Query MongoDB
-            db = get_mongo_db()
-            row = await db.statute_of_limitations.find_one({
-                'state_code': state.upper(),
-                'debt_type': debt_type.lower()
-            })
-            
-            if not row:
-                sol_years = 6  # Default
-            else:
-                sol_years = row['years']
-                # Cache the result
-                await cache_sol_lookup(state, debt_type, {'years': sol_years})
+        if sol_years is None:
+            return sol_unknown_findings(state, debt_type)
         
         # Check if account is past SOL
         if account_date:
-            account_dt = datetime.fromisoformat(account_date)
-            sol_date = account_dt + timedelta(days=sol_years*365)
+            expiry, days_remaining = compute_expiry(parse_account_dates([account_date]), np.array([sol_years]))
             
-            if datetime.now() > sol_date:
-                flag = LegalFlag(
-                    code="SOL_EXPIRED",
-                    explanation=f"This debt is past the {sol_years}-year statute of limitations in {state}.",
-                    severity=Severity.LOW,
-                    citation_id="SOL_STATE"
-                )
-                
-                citation = LegalCitation(
-                    id="SOL_STATE",
-                    title=f"{state} Statute of Limitations for {debt_type}",
-                    text_snippet=f"The statute of limitations for {debt_type} debts in {state} is {sol_years} years.",
-                    db_version=LEGAL_DB_VERSION
-                )
-                
-                return (flag, citation)
+            if expired_mask(expiry, days_remaining)[0]:
+                return sol_expired_findings(state, debt_type, sol_years)
         
         return (None, None)
         
@@ -210,56 +501,35 @@ async def check_statute_of_limitations(state: str, debt_type: str, account_date:
         return (None, None)
 
 
-async def check_fdcpa_compliance(context: dict) -> tuple:
-    """
-    Check FDCPA compliance for debt validation
-    
-    Returns: (flags[], citations[])
-    """
-    flags = []
-    citations = []
+def sol_expired_findings(state: str, debt_type: str, sol_years: int) -> tuple:
+    """(flag, citation) reported for a debt past its statute of limitations"""
+    flag = LegalFlag(
+        code="SOL_EXPIRED",
+        explanation=f"This debt is past the {sol_years}-year statute of limitations in {state}.",
+        severity=Severity.LOW,
+        citation_id="SOL_STATE"
+    )
     
-    # Basic FDCPA checks
-    if not context.get("creditor_name"):
-        flags.append(LegalFlag(
-            code="FDCPA_VALIDATION_REQUIRED",
-            explanation="Under FDCPA § 809, you have the right to request debt validation.",
-            severity=Severity.LOW,
-            citation_id="FDCPA_809"
-        ))
-        
-        citations.append(LegalCitation(
-            id="FDCPA_809",
-            title="FDCPA § 809 - Validation of debts",
-            text_snippet="A debt collector must provide verification of the debt if requested by the consumer within 30 days.",
-            db_version=LEGAL_DB_VERSION
-        ))
+    citation = LegalCitation(
+        id="SOL_STATE",
+        title=f"{state} Statute of Limitations for {debt_type}",
+        text_snippet=f"The statute of limitations for {debt_type} debts in {state} is {sol_years} years.",
+        db_version=LEGAL_DB_VERSION
+    )
     
-    return (flags, citations)
+    return (flag, citation)
 
 
-async def check_fcra_compliance(context: dict) -> tuple:
-    """
-    Check FCRA compliance for credit disputes
-    
-    Returns: (flags[], citations[])
-    """
-    flags = []
-    citations = []
-    
-    # Basic FCRA checks
-    flags.append(LegalFlag(
-        code="FCRA_DISPUTE_RIGHT",
-        explanation="Under FCRA § 611, you have the right to dispute inaccurate information.",
+def sol_unknown_findings(state: str, debt_type: str) -> tuple:
+    """(flag, None) reported when no SOL is on file - nothing is assumed"""
+    flag = LegalFlag(
+        code="SOL_UNKNOWN",
+        explanation=(
+            f"No statute of limitations is on file for {debt_type} debts in {state}; "
+            f"verify the applicable period before treating this debt as time-barred."
+        ),
         severity=Severity.LOW,
-        citation_id="FCRA_611"
-    ))
-    
-    citations.append(LegalCitation(
-        id="FCRA_611",
-        title="FCRA § 611 - Procedure for correcting incomplete or inaccurate information",
-        text_snippet="Credit bureaus must investigate disputes within 30 days and correct or delete inaccurate information.",
-        db_version=LEGAL_DB_VERSION
-    ))
+        citation_id=None
+    )
     
-    return (flags, citations)
+    return (flag, None)
@@ -58,7 +58,13 @@ async def generate_tasks(input_data: MentorGenerateTasksInput):
         
         user_prompt = f"Generate 3 personalized tasks for milestone: {input_data.milestone_id}"
         
-        ai_response = await provider.generate(system_prompt, user_prompt, f"mentor_{input_data.user_id}_{datetime.now().timestamp()}")
+        ai_response = await provider.generate(
+            system_prompt,
+            user_prompt,
+            f"mentor_{input_data.user_id}_{datetime.now().timestamp()}",
+            priority="background",
+            caller="MentorAgent"
+        )
         
         # Parse AI response
         import json
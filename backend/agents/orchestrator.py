@@ -120,6 +120,25 @@ async def get_run_status(run_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/jobs/{job_id}")
+async def get_job_result(job_id: str):
+    """Poll background job status and result"""
+    from job_queue import job_queue
+    
+    try:
+        record = await job_queue.get_result(job_id)
+        if not record:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        return record
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get job result: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 def parse_action_pipeline(action: str) -> list:
     """
     Parse action string into execution steps
@@ -156,7 +156,7 @@ async def get_ai_suggestion(item_id: str):
         What should the reviewer do?
         """
         
-        ai_response = await provider.generate(system_prompt, user_prompt, f"support_suggest_{item_id}")
+        ai_response = await provider.generate(system_prompt, user_prompt, f"support_suggest_{item_id}", priority="background", caller="SupportAgent")
         
         # Parse response
         import json
@@ -278,7 +278,7 @@ async def flag_item_for_review(run_id: str, agent_id: str, payload: dict, reason
         Analyze this flagged item and recommend priority and action.
         """
         
-        ai_response = await provider.generate(system_prompt, user_prompt, f"support_{run_id}")
+        ai_response = await provider.generate(system_prompt, user_prompt, f"support_{run_id}", priority="background", caller="SupportAgent")
         
         # Parse AI response
         import json
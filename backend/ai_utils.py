@@ -1,23 +1,712 @@
 """AI utilities for LLM integration with fallback support"""
 import os
+import time
+import json
+import heapq
+import random
+import itertools
 import logging
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 from typing import Optional, Dict, Any
 import asyncio
+from datetime import datetime, timezone
+
+from canonical_json import payload_hash
+from cache_layer import cache_get, cache_set
 
 logger = logging.getLogger(__name__)
 
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
 
+# (provider, model) pairs used by AIProvider
+OPENAI_MODEL = ("openai", "gpt-4.1")
+CLAUDE_MODEL = ("anthropic", "claude-sonnet-4-20250514")
+
+# In-process response cache size (entries)
+RESPONSE_CACHE_SIZE = int(os.environ.get('AI_RESPONSE_CACHE_SIZE', '1024'))
+
+# Hedged fallback: start Claude in parallel once OpenAI exceeds its observed p95 latency
+AI_HEDGE_ENABLED = os.environ.get('AI_HEDGE_ENABLED', 'true').lower() == 'true'
+AI_HEDGE_PERCENTILE = float(os.environ.get('AI_HEDGE_PERCENTILE', '95'))
+AI_HEDGE_MIN_DELAY = float(os.environ.get('AI_HEDGE_MIN_DELAY', '0.5'))
+AI_HEDGE_MAX_DELAY = float(os.environ.get('AI_HEDGE_MAX_DELAY', '8.0'))  # p95 budget ceiling
+AI_HEDGE_MIN_SAMPLES = 20
+
+# Circuit breaker: open a provider after this failure rate over the rolling window
+AI_BREAKER_WINDOW_SECONDS = float(os.environ.get('AI_BREAKER_WINDOW_SECONDS', '60'))
+AI_BREAKER_FAILURE_RATE = float(os.environ.get('AI_BREAKER_FAILURE_RATE', '0.5'))
+AI_BREAKER_MIN_CALLS = int(os.environ.get('AI_BREAKER_MIN_CALLS', '5'))
+AI_BREAKER_OPEN_SECONDS = float(os.environ.get('AI_BREAKER_OPEN_SECONDS', '30'))
+
+# Admission control: priority classes (highest first), concurrency limits and queue deadlines
+PRIORITY_CLASSES = ("interactive", "legal", "background")
+AI_MAX_CONCURRENCY = int(os.environ.get('AI_MAX_CONCURRENCY', '24'))
+AI_CLASS_LIMITS = {
+    "interactive": int(os.environ.get('AI_LIMIT_INTERACTIVE', '24')),
+    "legal": int(os.environ.get('AI_LIMIT_LEGAL', '12')),
+    "background": int(os.environ.get('AI_LIMIT_BACKGROUND', '4'))
+}
+AI_CLASS_DEADLINES = {"interactive": 15.0, "legal": 30.0, "background": 120.0}
+
+# Instrumentation: rough chars-per-token and list prices (USD per 1M input/output tokens)
+CHARS_PER_TOKEN = 4
+MODEL_COST_PER_1M_TOKENS = {
+    OPENAI_MODEL[1]: (2.0, 8.0),
+    CLAUDE_MODEL[1]: (3.0, 15.0)
+}
+MODEL_BY_PROVIDER = dict([OPENAI_MODEL, CLAUDE_MODEL])
+
+# Record/replay cassettes for offline load and regression testing
+AI_CASSETTE_MODE = os.environ.get('AI_CASSETTE_MODE', 'off').lower()
+AI_CASSETTE_DIR = os.environ.get('AI_CASSETTE_DIR', str(Path(__file__).parent / 'cassettes'))
+AI_CASSETTE_LATENCY = os.environ.get('AI_CASSETTE_LATENCY', 'recorded')
+AI_CASSETTE_SEED = int(os.environ['AI_CASSETTE_SEED']) if os.environ.get('AI_CASSETTE_SEED') else None
+
+# Token-bucket rate limit per provider (requests/second and burst size)
+AI_PROVIDER_RATE = float(os.environ.get('AI_PROVIDER_RATE', '10'))
+AI_PROVIDER_BURST = float(os.environ.get('AI_PROVIDER_BURST', '20'))
+
+
+class LatencyHistogram:
+    """Rolling window of call latencies (seconds) for percentile estimates"""
+    
+    def __init__(self, window: int = 500):
+        self.samples = deque(maxlen=window)
+    
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile, or None when no samples exist"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary statistics for monitoring"""
+        return {
+            "count": len(self.samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+
+# Per-provider latency of successful calls; drives the hedge delay
+latency_histograms: Dict[str, LatencyHistogram] = {
+    OPENAI_MODEL[0]: LatencyHistogram(),
+    CLAUDE_MODEL[0]: LatencyHistogram()
+}
+
+
+def hedge_delay(provider_name: str = OPENAI_MODEL[0]) -> float:
+    """
+    Seconds to wait on the primary before launching the fallback
+    
+    Uses the primary's observed p95, clamped to the configured budget.
+    Until enough samples exist the full budget is used.
+    """
+    histogram = latency_histograms[provider_name]
+    if len(histogram.samples) < AI_HEDGE_MIN_SAMPLES:
+        return AI_HEDGE_MAX_DELAY
+    observed = histogram.percentile(AI_HEDGE_PERCENTILE)
+    return min(max(observed, AI_HEDGE_MIN_DELAY), AI_HEDGE_MAX_DELAY)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for deterministic (temperature=0) LLM responses
+    
+    Tier 1 is an in-process LRU, tier 2 is Redis via cache_layer.
+    Keys are canonical payload hashes of (model, temperature, system, user).
+    Only answers from the primary provider are stored: a fallback answer is
+    degraded, so it is served once and the next call tries the primary again.
+    """
+    
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "sets": 0}
+    
+    @staticmethod
+    def make_key(model: str, temperature: float, system_message: str, user_message: str) -> str:
+        """Build canonical cache key for a prompt"""
+        return payload_hash({
+            "model": model,
+            "temperature": temperature,
+            "system": system_message,
+            "user": user_message
+        })
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Look up response in memory first, then Redis"""
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return value
+            del self._entries[key]
+        
+        cached = await cache_get(f"llm_response:{key}")
+        if cached is not None:
+            self.stats["redis_hits"] += 1
+            # Promote to memory tier for the entry's original TTL
+            self._remember(key, cached["response"], cached.get("ttl", 300))
+            return cached["response"]
+        
+        self.stats["misses"] += 1
+        return None
+    
+    async def set(self, key: str, value: str, ttl: int):
+        """Store response in both tiers"""
+        self._remember(key, value, ttl)
+        self.stats["sets"] += 1
+        await cache_set(f"llm_response:{key}", {"response": value, "ttl": ttl}, ttl=ttl)
+    
+    def _remember(self, key: str, value: str, ttl: int):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory tier size"""
+        lookups = self.stats["memory_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["redis_hits"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0
+        }
+    
+    def clear(self):
+        """Drop the in-process tier (Redis entries expire on their own)"""
+        self._entries.clear()
+
+
+# Process-wide response cache shared by all AIProvider instances
+response_cache = ResponseCache()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key onto one upstream task
+    
+    The shared task is shielded, so a waiter that gives up does not cancel
+    the call for everyone else.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.stats = {"leaders": 0, "followers": 0}
+    
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+    
+    async def run(self, key: str, factory) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+            self.stats["leaders"] += 1
+        else:
+            self.stats["followers"] += 1
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: str, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved even if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "in_flight": len(self._calls)}
+
+
+# Process-wide coalescing of identical temperature=0 prompts
+inflight_calls = SingleFlight()
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker with a rolling error-rate window
+    
+    closed    -> calls flow; opens when the failure rate over the window
+                 reaches the threshold (after a minimum number of calls)
+    open      -> calls are skipped until open_seconds have elapsed
+    half_open -> a single probe call is let through; success closes the
+                 circuit, failure re-opens it
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = AI_BREAKER_WINDOW_SECONDS,
+        failure_rate: float = AI_BREAKER_FAILURE_RATE,
+        min_calls: int = AI_BREAKER_MIN_CALLS,
+        open_seconds: float = AI_BREAKER_OPEN_SECONDS
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.events = deque()  # (timestamp, ok)
+    
+    def _prune(self, now: float):
+        while self.events and now - self.events[0][0] > self.window_seconds:
+            self.events.popleft()
+    
+    def is_available(self) -> bool:
+        """Whether a call could be admitted right now (does not reserve a probe)"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at >= self.open_seconds
+        if self.state == self.HALF_OPEN:
+            return not self.probe_in_flight
+        return True
+    
+    def allow_request(self) -> bool:
+        """Admit a call, moving open -> half_open and reserving the probe slot"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+            logger.info(f"Circuit {self.name}: half-open, probing")
+        if self.state == self.HALF_OPEN:
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+        return True
+    
+    def record_success(self):
+        now = time.monotonic()
+        if self.state == self.HALF_OPEN:
+            logger.info(f"Circuit {self.name}: closed after successful probe")
+            self.state = self.CLOSED
+            self.probe_in_flight = False
+            self.events.clear()
+        self.events.append((now, True))
+        self._prune(now)
+    
+    def record_failure(self):
+        now = time.monotonic()
+        if self.state == self.HALF_OPEN:
+            self._open(now)
+            return
+        self.events.append((now, False))
+        self._prune(now)
+        failures = sum(1 for _, ok in self.events if not ok)
+        if len(self.events) >= self.min_calls and failures / len(self.events) >= self.failure_rate:
+            self._open(now)
+    
+    def release_probe(self):
+        """Give back a half-open probe slot whose call was cancelled"""
+        self.probe_in_flight = False
+    
+    def _open(self, now: float):
+        logger.warning(f"Circuit {self.name}: opened")
+        self.state = self.OPEN
+        self.opened_at = now
+        self.probe_in_flight = False
+        self.events.clear()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for health reporting"""
+        self._prune(time.monotonic())
+        failures = sum(1 for _, ok in self.events if not ok)
+        return {
+            "state": self.state,
+            "calls_in_window": len(self.events),
+            "failures_in_window": failures,
+            "retry_in_seconds": round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 1)
+            if self.state == self.OPEN else 0.0
+        }
+
+
+# Process-wide breakers shared by all AIProvider instances
+circuit_breakers: Dict[str, CircuitBreaker] = {
+    OPENAI_MODEL[0]: CircuitBreaker(OPENAI_MODEL[0]),
+    CLAUDE_MODEL[0]: CircuitBreaker(CLAUDE_MODEL[0])
+}
+
+PROVIDER_LABELS = {OPENAI_MODEL[0]: "OpenAI", CLAUDE_MODEL[0]: "Claude"}
+
+
+def _all_failed_error(errors: Dict[str, Exception]) -> Exception:
+    if all(isinstance(error, AIOverloadedError) for error in errors.values()):
+        return AIOverloadedError("All AI providers rate limited past the call deadline")
+    detail = ", ".join(f"{PROVIDER_LABELS[name]}: {error}" for name, error in errors.items())
+    return Exception(f"All AI providers failed. {detail}")
+
+
+class AIOverloadedError(Exception):
+    """Raised when an LLM call is shed because its deadline cannot be met"""
+
+
+class TokenBucket:
+    """Token-bucket rate limit for calls to one provider"""
+    
+    def __init__(self, rate: float = AI_PROVIDER_RATE, capacity: float = AI_PROVIDER_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    async def acquire(self, deadline: Optional[float] = None):
+        """Take one token, waiting for a refill unless that would pass the deadline"""
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            wait = (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                raise AIOverloadedError("Provider rate limit cannot be met before deadline")
+            await asyncio.sleep(wait)
+
+
+class AdmissionController:
+    """
+    Bounds concurrent LLM calls per priority class and overall
+    
+    Calls that cannot start immediately wait in a priority queue
+    (interactive before legal before background). A call is shed with
+    AIOverloadedError when its deadline passes while queued, or up front
+    when the estimated queue wait already exceeds it.
+    """
+    
+    def __init__(self, max_concurrency: int = AI_MAX_CONCURRENCY, class_limits: Optional[Dict[str, int]] = None):
+        self.max_concurrency = max_concurrency
+        self.class_limits = class_limits or dict(AI_CLASS_LIMITS)
+        self.active = {cls: 0 for cls in PRIORITY_CLASSES}
+        self.total_active = 0
+        self._waiters = []  # heap of (rank, seq, future, class)
+        self._seq = itertools.count()
+        self.stats = {"admitted": 0, "queued": 0, "shed": 0}
+    
+    def _can_admit(self, priority: str) -> bool:
+        return self.total_active < self.max_concurrency and self.active[priority] < self.class_limits[priority]
+    
+    def _admit(self, priority: str):
+        self.active[priority] += 1
+        self.total_active += 1
+        self.stats["admitted"] += 1
+    
+    def _waiting_ahead(self, rank: int) -> int:
+        return sum(1 for entry in self._waiters if entry[0] <= rank and not entry[2].done())
+    
+    def _estimated_wait(self, priority: str, ahead: int) -> float:
+        service_time = latency_histograms[OPENAI_MODEL[0]].percentile(50) or 0.0
+        slots = max(1, min(self.max_concurrency, self.class_limits[priority]))
+        return (ahead + 1) / slots * service_time
+    
+    def _shed(self, priority: str, reason: str):
+        self.stats["shed"] += 1
+        logger.warning(f"LLM call shed ({priority}): {reason}")
+        raise AIOverloadedError(f"AI capacity exceeded for {priority} calls: {reason}")
+    
+    async def acquire(self, priority: str, deadline: float):
+        """Wait for a slot in the given class until the (monotonic) deadline"""
+        if priority not in self.class_limits:
+            raise ValueError(f"Unknown LLM priority class: {priority}")
+        rank = PRIORITY_CLASSES.index(priority)
+        ahead = self._waiting_ahead(rank)
+        if ahead == 0 and self._can_admit(priority):
+            self._admit(priority)
+            return
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._shed(priority, "deadline already passed")
+        if self._estimated_wait(priority, ahead) > remaining:
+            self._shed(priority, f"{ahead} calls queued ahead")
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (rank, next(self._seq), future, priority))
+        self.stats["queued"] += 1
+        try:
+            await asyncio.wait_for(future, timeout=remaining)
+        except asyncio.TimeoutError:
+            self._shed(priority, "deadline passed while queued")
+        except BaseException:
+            # Admitted just as the caller was cancelled: hand the slot back
+            if future.done() and not future.cancelled():
+                self.release(priority)
+            raise
+    
+    def release(self, priority: str):
+        """Free a slot and admit the highest-priority waiters that fit"""
+        self.active[priority] -= 1
+        self.total_active -= 1
+        
+        skipped = []
+        while self._waiters and self.total_active < self.max_concurrency:
+            entry = heapq.heappop(self._waiters)
+            future, waiter_priority = entry[2], entry[3]
+            if future.done():
+                continue
+            if self.active[waiter_priority] >= self.class_limits[waiter_priority]:
+                skipped.append(entry)
+                continue
+            self._admit(waiter_priority)
+            future.set_result(True)
+        for entry in skipped:
+            heapq.heappush(self._waiters, entry)
+    
+    @asynccontextmanager
+    async def slot(self, priority: str, deadline: float):
+        await self.acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self.release(priority)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current occupancy and counters"""
+        return {
+            **self.stats,
+            "active": dict(self.active),
+            "waiting": sum(1 for entry in self._waiters if not entry[2].done()),
+            "limits": dict(self.class_limits),
+            "max_concurrency": self.max_concurrency
+        }
+
+
+# Process-wide governor and per-provider rate limits
+admission_controller = AdmissionController()
+rate_limiters: Dict[str, TokenBucket] = {
+    OPENAI_MODEL[0]: TokenBucket(),
+    CLAUDE_MODEL[0]: TokenBucket()
+}
+
+# Absolute deadline of the call currently being generated (inherited by hedge tasks)
+_call_deadline: ContextVar[Optional[float]] = ContextVar("ai_call_deadline", default=None)
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode when no recording exists for a prompt"""
+
+
+class Cassette:
+    """
+    Record/replay store for provider responses
+    
+    record: every upstream response is written to <directory>/<hash>.json,
+            keyed by the canonical hash of (temperature, system, user), along
+            with the model that answered and the observed latency.
+    replay: responses are served from the store without any network access,
+            after a synthetic delay drawn from the latency spec:
+              recorded               - the latency observed when recording
+              none                   - no delay
+              fixed:<s>              - constant seconds
+              uniform:<lo>,<hi>      - uniform seconds
+              lognormal:<mu>,<sigma> - lognormal seconds (parameters of ln)
+    """
+    
+    MODES = ("off", "record", "replay")
+    
+    def __init__(
+        self,
+        mode: str = AI_CASSETTE_MODE,
+        directory: str = AI_CASSETTE_DIR,
+        latency_spec: str = AI_CASSETTE_LATENCY,
+        seed: Optional[int] = AI_CASSETTE_SEED
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"AI_CASSETTE_MODE must be one of {self.MODES}, got {mode!r}")
+        self.mode = mode
+        self.directory = Path(directory)
+        self.latency_spec = latency_spec
+        self._rng = random.Random(seed)
+        self._loaded: Dict[str, dict] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+    
+    @staticmethod
+    def make_key(temperature: float, system_message: str, user_message: str) -> str:
+        return payload_hash({"temperature": temperature, "system": system_message, "user": user_message})
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    
+    def record(self, model: tuple, temperature: float, system_message: str, user_message: str, response: str, latency: float):
+        """Store one provider response"""
+        key = self.make_key(temperature, system_message, user_message)
+        entry = {
+            "provider": model[0],
+            "model": model[1],
+            "temperature": temperature,
+            "system": system_message,
+            "user": user_message,
+            "response": response,
+            "latency": round(latency, 4),
+            "recorded_at": datetime.now(timezone.utc).isoformat()
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path(key).with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self._path(key))
+        self._loaded[key] = entry
+        self.stats["recorded"] += 1
+    
+    def lookup(self, temperature: float, system_message: str, user_message: str) -> Optional[dict]:
+        key = self.make_key(temperature, system_message, user_message)
+        if key not in self._loaded:
+            path = self._path(key)
+            if not path.exists():
+                return None
+            self._loaded[key] = json.loads(path.read_text(encoding="utf-8"))
+        return self._loaded[key]
+    
+    def sample_latency(self, recorded: float) -> float:
+        """Synthetic delay in seconds according to the latency spec"""
+        kind, _, params = self.latency_spec.partition(":")
+        values = [float(v) for v in params.split(",") if v]
+        if kind == "recorded":
+            return recorded
+        if kind == "none":
+            return 0.0
+        if kind == "fixed":
+            return values[0]
+        if kind == "uniform":
+            return self._rng.uniform(values[0], values[1])
+        if kind == "lognormal":
+            return self._rng.lognormvariate(values[0], values[1])
+        raise ValueError(f"Unknown AI_CASSETTE_LATENCY spec: {self.latency_spec}")
+    
+    async def replay(self, temperature: float, system_message: str, user_message: str) -> str:
+        """Serve a recorded response after a synthetic delay"""
+        entry = self.lookup(temperature, system_message, user_message)
+        if entry is None:
+            self.stats["misses"] += 1
+            raise CassetteMissError(
+                f"No cassette recording for prompt {self.make_key(temperature, system_message, user_message)[:12]}"
+            )
+        delay = self.sample_latency(entry.get("latency", 0.0))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.stats["replayed"] += 1
+        return entry["response"]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "directory": str(self.directory), "latency": self.latency_spec, **self.stats}
+
+
+# Process-wide record/replay store (mode "off" leaves provider calls untouched)
+cassette = Cassette()
+
+
+class LLMMetrics:
+    """
+    Per-call LLM instrumentation aggregated by (caller, provider, model)
+    
+    Counters are cumulative since process start; latency is a rolling
+    window. Token counts are estimated from prompt/response size.
+    """
+    
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._series: Dict[tuple, Dict[str, Any]] = {}
+    
+    def _entry(self, caller: str, provider: str, model: str) -> Dict[str, Any]:
+        key = (caller, provider, model)
+        if key not in self._series:
+            self._series[key] = {
+                "calls": 0,
+                "errors": {},
+                "fallbacks": 0,
+                "prompt_chars": 0,
+                "response_chars": 0,
+                "latency": LatencyHistogram()
+            }
+        return self._series[key]
+    
+    def record(
+        self,
+        caller: str,
+        provider: str,
+        model: str,
+        prompt_chars: int,
+        response_chars: int,
+        latency: float,
+        fallback: bool = False,
+        error_class: Optional[str] = None
+    ):
+        entry = self._entry(caller, provider, model)
+        entry["calls"] += 1
+        entry["prompt_chars"] += prompt_chars
+        entry["response_chars"] += response_chars
+        entry["latency"].record(latency)
+        if fallback:
+            entry["fallbacks"] += 1
+        if error_class:
+            entry["errors"][error_class] = entry["errors"].get(error_class, 0) + 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Aggregates grouped by caller, then provider/model"""
+        callers: Dict[str, Any] = {}
+        for (caller, provider, model), entry in sorted(self._series.items()):
+            prompt_tokens = entry["prompt_chars"] // CHARS_PER_TOKEN
+            response_tokens = entry["response_chars"] // CHARS_PER_TOKEN
+            # Cache hits and coalesced waiters cost nothing upstream
+            billable = provider in MODEL_BY_PROVIDER
+            input_price, output_price = MODEL_COST_PER_1M_TOKENS.get(model, (0.0, 0.0)) if billable else (0.0, 0.0)
+            callers.setdefault(caller, {})[f"{provider}/{model}"] = {
+                "calls": entry["calls"],
+                "errors": dict(entry["errors"]),
+                "fallbacks": entry["fallbacks"],
+                "prompt_tokens_est": prompt_tokens,
+                "response_tokens_est": response_tokens,
+                "cost_usd_est": round((prompt_tokens * input_price + response_tokens * output_price) / 1_000_000, 4),
+                "latency": entry["latency"].snapshot()
+            }
+        return {"since": self.started_at, "callers": callers}
+
+
+# Process-wide LLM call metrics
+llm_metrics = LLMMetrics()
+
 
 class AIProvider:
     """Unified AI provider with OpenAI primary and Claude fallback"""
     
-    def __init__(self, temperature: float = 0.0):
+    def __init__(self, temperature: float = 0.0, hedge: Optional[bool] = None):
         self.temperature = temperature
         self.api_key = EMERGENT_LLM_KEY
+        self.hedge = AI_HEDGE_ENABLED if hedge is None else hedge
     
-    async def generate(self, system_message: str, user_message: str, session_id: str = "default") -> str:
+    async def generate(
+        self,
+        system_message: str,
+        user_message: str,
+        session_id: str = "default",
+        cache_ttl: Optional[int] = None,
+        priority: str = "interactive",
+        deadline: Optional[float] = None,
+        caller: str = "unknown"
+    ) -> str:
         """
         Generate AI response with fallback logic
         
@@ -25,50 +714,311 @@ class AIProvider:
             system_message: System prompt
             user_message: User query
             session_id: Unique session identifier
+            cache_ttl: Cache lifetime in seconds; only applied when temperature is 0,
+                and only primary-provider answers are cached
+            priority: Admission class - "interactive", "legal" or "background"
+            deadline: Seconds the caller is willing to wait (defaults per class)
+            caller: Agent tag used to attribute latency and spend in llm_metrics
         
         Returns:
             AI-generated text response
+        
+        Raises:
+            AIOverloadedError: if the call was shed because its deadline cannot be met
         """
-        # Try OpenAI first (primary)
+        response, _ = await self.generate_with_source(
+            system_message, user_message, session_id, cache_ttl, priority, deadline, caller
+        )
+        return response
+    
+    async def generate_with_source(
+        self,
+        system_message: str,
+        user_message: str,
+        session_id: str = "default",
+        cache_ttl: Optional[int] = None,
+        priority: str = "interactive",
+        deadline: Optional[float] = None,
+        caller: str = "unknown"
+    ) -> tuple:
+        """
+        generate(), also saying who answered
+        
+        Returns:
+            (response, source) - source is "cache" or the provider name; an
+            answer from any provider but OPENAI_MODEL[0] is a fallback
+        """
+        if self.temperature != 0:
+            return await self._generate_uncached(
+                system_message, user_message, session_id, priority, deadline, caller
+            )
+        
+        prompt_chars = len(system_message) + len(user_message)
+        cache_key = ResponseCache.make_key(OPENAI_MODEL[1], self.temperature, system_message, user_message)
+        if cache_ttl:
+            start = time.monotonic()
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                llm_metrics.record(caller, "cache", OPENAI_MODEL[1], prompt_chars, len(cached), time.monotonic() - start)
+                return cached, "cache"
+        
+        # Identical deterministic prompts already in flight share one upstream call.
+        # Flights are per priority class so an interactive caller never waits
+        # behind a background leader's admission slot and deadline.
+        start = time.monotonic()
+        flight_key = f"{priority}:{cache_key}"
+        follower = inflight_calls.in_flight(flight_key)
+        response, source = await inflight_calls.run(
+            flight_key,
+            lambda: self._generate_and_cache(
+                cache_key, cache_ttl, system_message, user_message, session_id, priority, deadline, caller
+            )
+        )
+        if follower:
+            llm_metrics.record(caller, "coalesced", OPENAI_MODEL[1], prompt_chars, len(response), time.monotonic() - start)
+        return response, source
+    
+    async def _generate_and_cache(
+        self,
+        cache_key: str,
+        cache_ttl: Optional[int],
+        system_message: str,
+        user_message: str,
+        session_id: str,
+        priority: str,
+        deadline: Optional[float],
+        caller: str
+    ) -> tuple:
+        """(response, provider name); only primary answers are cached - a fallback answer is degraded"""
+        response, provider_name = await self._generate_uncached(
+            system_message, user_message, session_id, priority, deadline, caller
+        )
+        if cache_ttl and provider_name == OPENAI_MODEL[0]:
+            await response_cache.set(cache_key, response, cache_ttl)
+        return response, provider_name
+    
+    async def _generate_uncached(
+        self,
+        system_message: str,
+        user_message: str,
+        session_id: str,
+        priority: str,
+        deadline: Optional[float],
+        caller: str
+    ) -> tuple:
+        """Admit the call, run it against the available providers and record metrics; returns (response, provider name)"""
+        prompt_chars = len(system_message) + len(user_message)
+        start = time.monotonic()
         try:
-            response = await self._call_openai(system_message, user_message, session_id)
-            return response
+            response, provider_name = await self._generate_admitted(
+                system_message, user_message, session_id, priority, deadline
+            )
         except Exception as e:
-            logger.warning(f"OpenAI failed: {e}, falling back to Claude")
-            
-            # Fallback to Claude
+            llm_metrics.record(
+                caller, "none", "none", prompt_chars, 0, time.monotonic() - start,
+                error_class=type(e).__name__
+            )
+            raise
+        
+        llm_metrics.record(
+            caller,
+            provider_name,
+            MODEL_BY_PROVIDER[provider_name],
+            prompt_chars,
+            len(response),
+            time.monotonic() - start,
+            fallback=provider_name != OPENAI_MODEL[0]
+        )
+        return response, provider_name
+    
+    async def _generate_admitted(
+        self,
+        system_message: str,
+        user_message: str,
+        session_id: str,
+        priority: str,
+        deadline: Optional[float]
+    ) -> tuple:
+        """Run the call inside an admission slot; returns (response, provider name)"""
+        providers = self._provider_order()
+        if not providers:
+            raise Exception("All AI providers unavailable: circuits open")
+        
+        absolute_deadline = time.monotonic() + (deadline or AI_CLASS_DEADLINES.get(priority, 30.0))
+        async with admission_controller.slot(priority, absolute_deadline):
+            token = _call_deadline.set(absolute_deadline)
             try:
-                response = await self._call_claude(system_message, user_message, session_id)
-                return response
-            except Exception as e2:
-                logger.error(f"Claude fallback also failed: {e2}")
-                raise Exception(f"All AI providers failed. OpenAI: {e}, Claude: {e2}")
+                if self.hedge and len(providers) > 1:
+                    return await self._generate_hedged(providers, system_message, user_message, session_id)
+                return await self._generate_with_fallback(providers, system_message, user_message, session_id)
+            finally:
+                _call_deadline.reset(token)
     
-    async def _call_openai(self, system_message: str, user_message: str, session_id: str) -> str:
-        """Call OpenAI GPT-4.1"""
-        chat = LlmChat(
-            api_key=self.api_key,
-            session_id=session_id,
-            system_message=system_message
-        ).with_model("openai", "gpt-4.1")
+    def _provider_order(self) -> list:
+        """(name, call) pairs in preference order, skipping providers with an open circuit"""
+        providers = [
+            (OPENAI_MODEL[0], self._call_openai),
+            (CLAUDE_MODEL[0], self._call_claude)
+        ]
+        return [(name, call) for name, call in providers if circuit_breakers[name].is_available()]
+    
+    async def _generate_with_fallback(self, providers: list, system_message: str, user_message: str, session_id: str) -> tuple:
+        """Call providers in order, falling back on failure; returns (response, provider name)"""
+        errors: Dict[str, Exception] = {}
+        for name, call in providers:
+            if not circuit_breakers[name].allow_request():
+                continue
+            try:
+                response = await self._timed_call(name, call, system_message, user_message, session_id)
+                return response, name
+            except Exception as e:
+                logger.warning(f"{PROVIDER_LABELS[name]} failed: {e}")
+                errors[name] = e
         
-        msg = UserMessage(text=user_message)
-        response = await chat.send_message(msg)
+        if not errors:
+            raise Exception("All AI providers unavailable: circuits open")
+        logger.error(f"All AI providers failed: {errors}")
+        raise _all_failed_error(errors)
+    
+    async def _generate_hedged(self, providers: list, system_message: str, user_message: str, session_id: str) -> tuple:
+        """
+        Call the primary and, if it has not answered within hedge_delay(), race the fallback against it
+        
+        The first successful answer wins and the other call is cancelled.
+        If the primary fails before the hedge fires, the fallback is called immediately.
+        Returns (response, provider name).
+        """
+        (primary_name, primary_call), (fallback_name, fallback_call) = providers[:2]
+        if not circuit_breakers[primary_name].allow_request():
+            return await self._generate_with_fallback(providers[1:], system_message, user_message, session_id)
+        
+        primary = asyncio.create_task(
+            self._timed_call(primary_name, primary_call, system_message, user_message, session_id)
+        )
+        tasks = {primary: primary_name}
+        errors: Dict[str, Exception] = {}
+        
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay(primary_name))
+            if done:
+                try:
+                    return primary.result(), primary_name
+                except Exception as e:
+                    logger.warning(f"{PROVIDER_LABELS[primary_name]} failed: {e}, falling back to {PROVIDER_LABELS[fallback_name]}")
+                    errors[primary_name] = e
+                    del tasks[primary]
+            else:
+                logger.info(f"{PROVIDER_LABELS[primary_name]} slower than hedge delay, racing {PROVIDER_LABELS[fallback_name]}")
+            
+            if circuit_breakers[fallback_name].allow_request():
+                fallback = asyncio.create_task(
+                    self._timed_call(fallback_name, fallback_call, system_message, user_message, session_id)
+                )
+                tasks[fallback] = fallback_name
+            
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), tasks[task]
+                    errors[tasks[task]] = task.exception()
+            
+            logger.error(f"Hedged AI call failed on all providers: {errors}")
+            raise _all_failed_error(errors)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _timed_call(self, provider_name: str, call, system_message: str, user_message: str, session_id: str) -> str:
+        """
+        Run a provider call, recording its latency and outcome
+        
+        A call cancelled after losing a hedge race records its elapsed time as a
+        lower bound, so a consistently slow provider still pushes its p95 up.
+        Cancellation and rate-limit shedding do not count against the provider's circuit.
+        """
+        breaker = circuit_breakers[provider_name]
+        try:
+            await rate_limiters[provider_name].acquire(_call_deadline.get())
+        except BaseException:
+            breaker.release_probe()
+            raise
+        
+        start = time.monotonic()
+        try:
+            response = await call(system_message, user_message, session_id)
+        except asyncio.CancelledError:
+            latency_histograms[provider_name].record(time.monotonic() - start)
+            breaker.release_probe()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        latency_histograms[provider_name].record(time.monotonic() - start)
+        breaker.record_success()
         return response
     
+    async def _call_openai(self, system_message: str, user_message: str, session_id: str) -> str:
+        """Call OpenAI GPT-4.1"""
+        return await self._call_model(OPENAI_MODEL, system_message, user_message, session_id)
+    
     async def _call_claude(self, system_message: str, user_message: str, session_id: str) -> str:
         """Call Claude Sonnet 4 as fallback"""
+        return await self._call_model(CLAUDE_MODEL, system_message, user_message, session_id)
+    
+    async def _call_model(self, model: tuple, system_message: str, user_message: str, session_id: str) -> str:
+        """Send one message through a fresh LlmChat for (provider, model), or the cassette store"""
+        if cassette.mode == "replay":
+            return await cassette.replay(self.temperature, system_message, user_message)
+        
+        # A new client per call: LlmChat keeps conversation history on the instance
         chat = LlmChat(
             api_key=self.api_key,
             session_id=session_id,
             system_message=system_message
-        ).with_model("anthropic", "claude-sonnet-4-20250514")
-        
+        ).with_model(*model)
+        start = time.monotonic()
         msg = UserMessage(text=user_message)
         response = await chat.send_message(msg)
+        
+        if cassette.mode == "record":
+            cassette.record(model, self.temperature, system_message, user_message, response, time.monotonic() - start)
         return response
 
 
+def get_provider_health() -> Dict[str, Any]:
+    """Circuit breaker state and latency summary per provider (no live calls)"""
+    return {
+        name: {
+            **breaker.snapshot(),
+            "latency": latency_histograms[name].snapshot()
+        }
+        for name, breaker in circuit_breakers.items()
+    }
+
+
+def get_cassette_stats() -> Dict[str, Any]:
+    """Record/replay mode and counters"""
+    return cassette.snapshot()
+
+
+def get_llm_metrics() -> Dict[str, Any]:
+    """Per-caller LLM latency, size, fallback, error and cost aggregates"""
+    return llm_metrics.snapshot()
+
+
+def get_admission_stats() -> Dict[str, Any]:
+    """Admission controller occupancy and shed counters"""
+    return admission_controller.snapshot()
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Response cache hit/miss counters, plus request coalescing counters"""
+    return {**response_cache.get_stats(), "coalescing": inflight_calls.snapshot()}
+
+
 async def paraphrase_text(text: str, context: str = "") -> str:
     """
     Paraphrase text for readability using temp=0 (deterministic)
@@ -78,7 +1028,14 @@ async def paraphrase_text(text: str, context: str = "") -> str:
     system = "You are a helpful financial advisor. Paraphrase the following text for clarity and readability. Keep all facts intact, just improve the wording."
     user = f"Context: {context}\n\nText to paraphrase: {text}"
     
-    result = await provider.generate(system, user, session_id=f"paraphrase_{hash(text)}")
+    result = await provider.generate(
+        system,
+        user,
+        session_id=f"paraphrase_{hash(text)}",
+        cache_ttl=86400,
+        priority="background",
+        caller="paraphrase"
+    )
     return result
 
 
@@ -94,5 +1051,11 @@ async def extract_intent(user_message: str, available_actions: list) -> str:
     Classify the user's message into ONE of these actions. Return ONLY the action name, nothing else.
     """
     
-    result = await provider.generate(system, user_message, session_id=f"intent_{hash(user_message)}")
+    result = await provider.generate(
+        system,
+        user_message,
+        session_id=f"intent_{hash(user_message)}",
+        cache_ttl=3600,
+        caller="EEFai"
+    )
     return result.strip().lower()
@@ -1,6 +1,6 @@
 """
 Redis caching layer for high-performance lookups
-Caches: SOL lookups, legal rules, CFP calculations, letter templates
+Caches: SOL lookups, legal rules, legal check results, CFP calculations, letter templates
 """
 import logging
 from typing import Optional, Any
@@ -11,6 +11,11 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TTL = 600  # 10 minutes
 
+LEGAL_CHECK_TTL = 3600  # 1 hour
+
+# Per-process hit/miss counters for legal check results
+legal_check_cache_stats = {"hits": 0, "misses": 0}
+
 
 async def cache_get(key: str) -> Optional[Any]:
     """Get value from cache"""
@@ -84,6 +89,32 @@ async def get_cached_legal_rule(rule_code: str) -> Optional[dict]:
     return await cache_get(key)
 
 
+def legal_check_cache_key(kb_version: str, input_hash: str) -> str:
+    """Key for a legal check result; a new knowledge version means new keys"""
+    return f"legal_check:{kb_version}:{input_hash}"
+
+
+async def cache_legal_check(key: str, result: dict):
+    """Cache legal check result"""
+    await cache_set(key, result, ttl=LEGAL_CHECK_TTL)
+
+
+async def get_cached_legal_check(key: str) -> Optional[dict]:
+    """Get cached legal check result (counted in legal_check_cache_stats)"""
+    result = await cache_get(key)
+    legal_check_cache_stats["hits" if result is not None else "misses"] += 1
+    return result
+
+
+def get_legal_check_cache_stats() -> dict:
+    """Legal check cache hits, misses and hit ratio"""
+    total = legal_check_cache_stats["hits"] + legal_check_cache_stats["misses"]
+    return {
+        **legal_check_cache_stats,
+        "hit_ratio": round(legal_check_cache_stats["hits"] / total, 4) if total else 0.0
+    }
+
+
 async def cache_cfp_calculation(user_id: str, scenario_hash: str, result: dict):
     """Cache CFP calculation"""
     key = f"cfp:{user_id}:{scenario_hash}"
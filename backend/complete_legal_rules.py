@@ -192,15 +192,80 @@ COMPLETE_CROA_RULES = [
      'severity': 'low', 'db_version': 'v1.0'},
 ]
 
-async def seed_complete_legal_rules(db):
-    """Seed complete FDCPA, FCRA, CROA rulesets into MongoDB"""
-    all_rules = COMPLETE_FDCPA_RULES + COMPLETE_FCRA_RULES + COMPLETE_CROA_RULES
-    
-    for rule in all_rules:
-        await db.legal_rules.update_one(
-            {'rule_code': rule['rule_code']},
-            {'$set': rule},
-            upsert=True
-        )
-    
-    return len(all_rules)
+# Deterministic checks compiled by legal_rule_engine (stored in legal_checks)
+FDCPA_805_CITATION = {'id': 'FDCPA_805', 'title': 'FDCPA § 805 - Communication restrictions',
+                      'text_snippet': 'Debt collectors may not communicate with consumers at unusual times or places, or directly once they know the consumer is represented by an attorney.'}
+
+DEFAULT_LEGAL_CHECKS = [
+    {'check_code': 'FDCPA_VALIDATION_REQUIRED', 'action_types': ['debt_validation'],
+     'when': {'field': 'context.creditor_name', 'op': 'falsy'},
+     'severity': 'low',
+     'explanation': 'Under FDCPA § 809, you have the right to request debt validation.',
+     'citation': {'id': 'FDCPA_809', 'title': 'FDCPA § 809 - Validation of debts',
+                  'text_snippet': 'A debt collector must provide verification of the debt if requested by the consumer within 30 days.'},
+     'db_version': 'v1.0'},
+    
+    {'check_code': 'FDCPA_VALIDATION_WINDOW_OPEN', 'action_types': ['debt_validation'],
+     'when': {'field': 'context.validation_notice_date', 'op': 'days_since_lte', 'value': 30},
+     'severity': 'low',
+     'explanation': 'You are still within the 30-day window to dispute this debt in writing; the collector must pause collection until it sends verification.',
+     'citation': {'id': 'FDCPA_809', 'title': 'FDCPA § 809 - Validation of debts',
+                  'text_snippet': 'A debt collector must provide verification of the debt if requested by the consumer within 30 days.'},
+     'db_version': 'v1.0'},
+    
+    {'check_code': 'FDCPA_CONTACT_HOURS', 'action_types': ['debt_validation', 'collection_contact'],
+     'when': {'any': [{'field': 'context.contact_hour', 'op': 'lt', 'value': 8},
+                      {'field': 'context.contact_hour', 'op': 'gte', 'value': 21}]},
+     'severity': 'medium',
+     'explanation': 'Under FDCPA § 805, collectors may not contact you before 8 a.m. or after 9 p.m. your local time.',
+     'citation': FDCPA_805_CITATION,
+     'db_version': 'v1.0'},
+    
+    {'check_code': 'FDCPA_ATTORNEY_REPRESENTED', 'action_types': ['debt_validation', 'collection_contact'],
+     'when': {'all': [{'field': 'context.has_attorney', 'op': 'truthy'},
+                      {'field': 'context.collector_contacted_directly', 'op': 'truthy'}]},
+     'severity': 'high',
+     'explanation': 'Under FDCPA § 805, a collector who knows you are represented by an attorney must contact the attorney, not you.',
+     'citation': FDCPA_805_CITATION,
+     'db_version': 'v1.0'},
+    
+    {'check_code': 'FDCPA_EXCESSIVE_CALLS', 'action_types': ['debt_validation', 'collection_contact'],
+     'when': {'field': 'context.calls_last_7_days', 'op': 'gt', 'value': 7},
+     'severity': 'high',
+     'explanation': 'More than 7 collection calls within 7 days is presumed harassment under FDCPA § 806 (Regulation F).',
+     'citation': {'id': 'FDCPA_806', 'title': 'FDCPA § 806 - Harassment or abuse',
+                  'text_snippet': 'Debt collectors may not harass, oppress, or abuse any person including threats of violence, obscene language, or repeated calls.'},
+     'db_version': 'v1.0'},
+    
+    {'check_code': 'FCRA_DISPUTE_RIGHT', 'action_types': ['credit_dispute'],
+     'when': {},
+     'severity': 'low',
+     'explanation': 'Under FCRA § 611, you have the right to dispute inaccurate information.',
+     'citation': {'id': 'FCRA_611', 'title': 'FCRA § 611 - Procedure for correcting incomplete or inaccurate information',
+                  'text_snippet': 'Credit bureaus must investigate disputes within 30 days and correct or delete inaccurate information.'},
+     'db_version': 'v1.0'},
+    
+    {'check_code': 'FCRA_INVESTIGATION_OVERDUE', 'action_types': ['credit_dispute'],
+     'when': {'all': [{'field': 'context.dispute_date', 'op': 'days_since_gt', 'value': 30},
+                      {'field': 'context.dispute_resolved', 'op': 'falsy'}]},
+     'severity': 'medium',
+     'explanation': 'The credit bureau has had more than 30 days to investigate your dispute without resolving it (FCRA § 611).',
+     'citation': {'id': 'FCRA_611', 'title': 'FCRA § 611 - Procedure for correcting incomplete or inaccurate information',
+                  'text_snippet': 'Credit bureaus must investigate disputes within 30 days and correct or delete inaccurate information.'},
+     'db_version': 'v1.0'},
+    
+    {'check_code': 'FCRA_OBSOLETE_INFORMATION', 'action_types': ['credit_dispute'],
+     'when': {'field': 'context.date_of_first_delinquency', 'op': 'days_since_gt', 'value': 2555},
+     'severity': 'medium',
+     'explanation': 'This item is more than 7 years past its first delinquency and should no longer appear on your credit report (FCRA § 605).',
+     'citation': {'id': 'FCRA_605', 'title': 'FCRA § 605 - Requirements relating to information contained in consumer reports',
+                  'text_snippet': 'Most negative information must be removed after 7 years. Bankruptcies after 10 years.'},
+     'db_version': 'v1.0'},
+]
+
+
+async def seed_complete_legal_rules(db, dry_run: bool = False):
+    """Seed complete FDCPA, FCRA, CROA rulesets and deterministic checks into MongoDB"""
+    from legal_seed import seed_legal_knowledge
+    await seed_legal_knowledge(db, dry_run)
+    return len(COMPLETE_FDCPA_RULES + COMPLETE_FCRA_RULES + COMPLETE_CROA_RULES)
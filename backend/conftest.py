@@ -0,0 +1,210 @@
+"""Shared pytest fixtures: a scriptable fake LlmChat, fresh AI call state, in-memory Redis and Mongo"""
+import asyncio
+import sys
+import types
+
+import pytest
+
+try:
+    import emergentintegrations.llm.chat  # noqa: F401
+except ImportError:
+    # The LLM SDK is installed from a private index; ai_utils only needs its two
+    # names at import time, and the fake_llm fixture replaces both in every test
+    _sdk = types.ModuleType("emergentintegrations.llm.chat")
+    _sdk.LlmChat = _sdk.UserMessage = None
+    for _name in ("emergentintegrations", "emergentintegrations.llm"):
+        sys.modules.setdefault(_name, types.ModuleType(_name))
+    sys.modules["emergentintegrations.llm.chat"] = _sdk
+
+
+class FakeRedis:
+    """The string and sorted-set commands the backend uses, in memory"""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def zadd(self, key, mapping):
+        self.sets.setdefault(key, {}).update(mapping)
+
+    async def zpopmax(self, key, count=1):
+        members = sorted(self.sets.get(key, {}).items(), key=lambda item: item[1], reverse=True)[:count]
+        for member, _ in members:
+            del self.sets[key][member]
+        return members
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """FakeRedis installed as database.redis_client (cache_layer reads it from there)"""
+    import database
+
+    redis = FakeRedis()
+    monkeypatch.setattr(database, "redis_client", redis)
+    return redis
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs[:length]]
+
+
+class FakeCollection:
+    """
+    In-memory Motor collection: equality filters and the update operators
+    the backend uses ($set, $setOnInsert, $push with $each/$slice). Each
+    call yields to the event loop first, like a round trip, then applies
+    atomically like MongoDB - so check-then-act races show up in tests.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.docs = []
+
+    def _match(self, query):
+        return [doc for doc in self.docs if all(doc.get(key) == value for key, value in (query or {}).items())]
+
+    def find(self, query=None, projection=None):
+        hidden = {key for key, shown in (projection or {}).items() if not shown}
+        return FakeCursor([
+            {key: value for key, value in doc.items() if key not in hidden} for doc in self._match(query)
+        ])
+
+    async def find_one(self, query=None, projection=None):
+        await asyncio.sleep(0)
+        found = self._match(query)
+        return dict(found[0]) if found else None
+
+    async def insert_one(self, doc):
+        await asyncio.sleep(0)
+        self.docs.append(dict(doc))
+
+    async def update_one(self, query, update, upsert=False):
+        await asyncio.sleep(0)
+        found = self._match(query)
+        upserted_id = None
+        if found:
+            doc = found[0]
+        elif upsert:
+            doc = {**query, **update.get('$setOnInsert', {}), '_id': query.get('_id', f"{self.name}_{len(self.docs)}")}
+            self.docs.append(doc)
+            upserted_id = doc['_id']
+        else:
+            return types.SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+
+        doc.update(update.get('$set', {}))
+        for key, push in update.get('$push', {}).items():
+            values = doc.setdefault(key, [])
+            values.extend(push['$each'] if isinstance(push, dict) else [push])
+            if isinstance(push, dict) and '$slice' in push:
+                doc[key] = values[push['$slice']:]
+        return types.SimpleNamespace(
+            matched_count=len(found[:1]), modified_count=len(found[:1]), upserted_id=upserted_id
+        )
+
+    async def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            await self.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+
+
+class FakeMongo:
+    """Database whose collections spring into existence on first access"""
+
+    def __init__(self):
+        self.collections = {}
+
+    def __getattr__(self, name):
+        return self.collections.setdefault(name, FakeCollection(name))
+
+
+@pytest.fixture
+def fake_mongo(monkeypatch):
+    """FakeMongo installed as database.mongo_db"""
+    import database
+
+    db = FakeMongo()
+    monkeypatch.setattr(database, "mongo_db", db)
+    return db
+
+
+class FakeUserMessage:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeLLM:
+    """
+    Stand-in for the LLM SDK
+
+    Replies "<provider>: <text>" after delays[provider] seconds, or raises
+    failures[provider]. Chats keep their history in `messages` like LlmChat.
+    """
+
+    def __init__(self):
+        self.delays = {}
+        self.failures = {}
+        self.calls = []  # (provider, session_id, text, history length before the call)
+        self.chats = []
+        self.active = 0
+        self.max_active = 0
+        fake = self
+
+        class FakeLlmChat:
+            def __init__(self, api_key, session_id, system_message):
+                self.session_id = session_id
+                self.messages = [{"role": "system", "content": system_message}]
+                self.provider = self.model = None
+                fake.chats.append(self)
+
+            def with_model(self, provider, model):
+                self.provider, self.model = provider, model
+                return self
+
+            async def send_message(self, message):
+                fake.calls.append((self.provider, self.session_id, message.text, len(self.messages)))
+                self.messages.append({"role": "user", "content": message.text})
+                fake.active += 1
+                fake.max_active = max(fake.max_active, fake.active)
+                try:
+                    await asyncio.sleep(fake.delays.get(self.provider, 0))
+                    if self.provider in fake.failures:
+                        raise fake.failures[self.provider]
+                    reply = f"{self.provider}: {message.text}"
+                    self.messages.append({"role": "assistant", "content": reply})
+                    return reply
+                finally:
+                    fake.active -= 1
+
+        self.LlmChat = FakeLlmChat
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """FakeLLM wired into ai_utils, with fresh process-wide caches, breakers and limits"""
+    import ai_utils
+
+    fake = FakeLLM()
+    providers = (ai_utils.OPENAI_MODEL[0], ai_utils.CLAUDE_MODEL[0])
+    monkeypatch.setattr(ai_utils, "LlmChat", fake.LlmChat)
+    monkeypatch.setattr(ai_utils, "UserMessage", FakeUserMessage)
+    monkeypatch.setattr(ai_utils, "response_cache", ai_utils.ResponseCache())
+    monkeypatch.setattr(ai_utils, "inflight_calls", ai_utils.SingleFlight())
+    monkeypatch.setattr(ai_utils, "admission_controller", ai_utils.AdmissionController())
+    monkeypatch.setattr(ai_utils, "llm_metrics", ai_utils.LLMMetrics())
+    monkeypatch.setattr(ai_utils, "cassette", ai_utils.Cassette(mode="off"))
+    monkeypatch.setattr(ai_utils, "circuit_breakers", {name: ai_utils.CircuitBreaker(name) for name in providers})
+    monkeypatch.setattr(ai_utils, "latency_histograms", {name: ai_utils.LatencyHistogram() for name in providers})
+    monkeypatch.setattr(ai_utils, "rate_limiters", {name: ai_utils.TokenBucket() for name in providers})
+    return fake
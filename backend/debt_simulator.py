@@ -0,0 +1,350 @@
+"""
+Month-by-month debt payoff simulator for CFP-AI
+
+Balances are simulated in integer cents. Each month every open debt accrues
+interest (rounded half-up to the cent), receives its minimum payment, and the
+rest of the fixed monthly budget goes to debts in priority order (snowball:
+smallest balance first, avalanche: highest APR first). Minimums freed by a
+paid-off debt stay in the budget, so they roll over to the next target.
+All per-month work is vectorized across debts with NumPy.
+
+payoff_horizon is the closed-form NPER / annuity estimate for dashboards;
+it does not round month by month, so schedules always use the loop.
+"""
+import calendar
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from money import div_round, div_round_array, from_cents, from_cents_array, to_cents, to_cents_array
+
+# Simulation horizon; debts still open after this are reported as not paid off
+MAX_SIMULATION_MONTHS = 600
+
+# APR is carried as an exact rational with this many decimal places
+APR_SCALE = 10 ** 6
+RATE_DEN = 12 * APR_SCALE
+
+# Minimum payment used when a debt does not specify one (original CFP rule)
+DEFAULT_MIN_PAYMENT_RATE = Decimal('0.02')
+
+STRATEGIES = ("snowball", "avalanche")
+
+# payoff_month of a debt still open at the end of the horizon
+NOT_PAID_OFF = -1
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def add_months(start: date, months: int) -> date:
+    """Same day-of-month `months` later, clamped to the month's last day"""
+    month_index = start.month - 1 + months
+    year = start.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def payoff_dates(months: Sequence[int], start: date) -> List[Optional[str]]:
+    """Calendar date `months` after start per entry; None where not paid off"""
+    months = np.asarray(months, dtype=np.int64)
+    dates = {int(m): add_months(start, int(m)).strftime('%Y-%m-%d') for m in np.unique(months) if m != NOT_PAID_OFF}
+    return [dates.get(int(m)) for m in months]
+
+
+def payoff_order(balances: Sequence[Dict[str, Any]], strategy: str) -> List[int]:
+    """Indices of debts in the order extra payments target them"""
+    if strategy == "snowball":
+        return sorted(range(len(balances)), key=lambda i: balances[i]['balance'])
+    if strategy == "avalanche":
+        return sorted(range(len(balances)), key=lambda i: balances[i]['apr'], reverse=True)
+    raise ValueError(f"Unknown payoff strategy: {strategy}")
+
+
+def minimum_payment_cents(balance: Dict[str, Any]) -> int:
+    """Fixed monthly minimum: min_payment if given, else 2% of the starting balance"""
+    if balance.get('min_payment') is not None:
+        return to_cents(balance['min_payment'])
+    return to_cents(Decimal(str(balance['balance'])) * DEFAULT_MIN_PAYMENT_RATE)
+
+
+class PayoffSimulation:
+    """Result arrays of one simulation; debts are in payoff order"""
+
+    def __init__(self, names, order, payments, interest, payoff_month):
+        self.names: List[str] = names
+        self.order: List[int] = order
+        self.payments: np.ndarray = payments          # (months, debts) cents paid
+        self.interest: np.ndarray = interest          # (months, debts) cents accrued
+        self.payoff_month: np.ndarray = payoff_month  # 1-based month, NOT_PAID_OFF if still open
+
+    @property
+    def months(self) -> int:
+        return self.payments.shape[0]
+
+    @property
+    def paid_off(self) -> bool:
+        return bool((self.payoff_month != NOT_PAID_OFF).all())
+
+    def total_interest_cents(self) -> int:
+        return int(self.interest.sum())
+
+    def interest_by_debt_cents(self) -> np.ndarray:
+        return self.interest.sum(axis=0)
+
+    def peak_payment_cents(self) -> np.ndarray:
+        """Largest monthly payment per debt - its full payment once it is the target"""
+        return self.payments.max(axis=0, initial=0)
+
+
+def _prepare(balances: Sequence[Dict[str, Any]], strategy: str):
+    """Payoff order plus per-debt cents arrays (balance, minimum, monthly rate numerator)"""
+    order = payoff_order(balances, strategy)
+    ordered = [balances[i] for i in order]
+    balance = np.array([to_cents(b['balance']) for b in ordered], dtype=np.int64)
+    minimum = np.array([minimum_payment_cents(b) for b in ordered], dtype=np.int64)
+    # Monthly rate = apr / 12 as the exact fraction rate_num / RATE_DEN
+    rate_num = np.array([int(Decimal(str(b['apr'])) * APR_SCALE) for b in ordered], dtype=np.int64)
+    return order, ordered, balance, minimum, rate_num
+
+
+def _accrue(balance: np.ndarray, rate_num: np.ndarray) -> np.ndarray:
+    """Monthly interest cents, rounded half-up; exact Python ints when balance * rate_num would overflow int64"""
+    largest_rate = int(rate_num.max(initial=0))
+    if largest_rate == 0 or int(balance.max(initial=0)) <= INT64_MAX // largest_rate:
+        return div_round_array(balance * rate_num, RATE_DEN)
+    rates = np.broadcast_to(rate_num, balance.shape)
+    return np.array(
+        [div_round(int(b) * int(r), RATE_DEN) for b, r in zip(balance.ravel(), rates.ravel())], dtype=np.int64
+    ).reshape(balance.shape)
+
+
+def _run(balance: np.ndarray, minimum: np.ndarray, rate_num: np.ndarray, budget: np.ndarray, max_months: int, history=None):
+    """
+    Month loop over a batch of scenarios sharing the same debts
+
+    Args:
+        balance: (scenarios, debts) starting cents, debts in payoff order
+        minimum, rate_num: (debts,) minimum payment cents / monthly rate numerators
+        budget: (scenarios,) total monthly payment cents
+        history: Optional list receiving (paid, accrued) arrays per month
+
+    Returns:
+        (payoff_month, interest, peak_payment), each (scenarios, debts);
+        payoff_month is 1-based, 0 for debts starting at zero and
+        NOT_PAID_OFF for debts still open at the horizon
+
+    A debt whose monthly interest reaches the whole budget can never shrink,
+    so its scenario stops there (never pays off) instead of compounding
+    until the horizon.
+    """
+    payoff_month = np.where(balance > 0, NOT_PAID_OFF, 0).astype(np.int64)
+    interest = np.zeros(balance.shape, dtype=np.int64)
+    peak_payment = np.zeros(balance.shape, dtype=np.int64)
+    diverged = np.zeros(balance.shape[0], dtype=bool)
+
+    for month in range(max_months):
+        open_debts = (balance > 0) & ~diverged[:, None]
+        if not open_debts.any():
+            break
+
+        # Interest, rounded half-up to the cent
+        accrued = np.where(open_debts, _accrue(balance, rate_num), 0)
+        diverged |= (accrued >= budget[:, None]).any(axis=1)
+        if diverged.all():
+            break
+        open_debts &= ~diverged[:, None]
+        accrued = np.where(open_debts, accrued, 0)
+        balance = balance + accrued
+
+        # Minimums, then the rest of the budget in payoff order (cascades within the month)
+        paid = np.where(open_debts, np.minimum(minimum, balance), 0)
+        balance = balance - paid
+        available = np.where(diverged, 0, np.maximum(budget - paid.sum(axis=1), 0))
+        ahead = np.cumsum(balance, axis=1) - balance
+        extra = np.where(open_debts, np.minimum(balance, np.maximum(available[:, None] - ahead, 0)), 0)
+        balance = balance - extra
+        paid = paid + extra
+
+        interest += accrued
+        np.maximum(peak_payment, paid, out=peak_payment)
+        payoff_month[open_debts & (balance <= 0)] = month + 1
+        if history is not None:
+            history.append((paid, accrued))
+
+    return payoff_month, interest, peak_payment
+
+
+def nper(balance: np.ndarray, apr: np.ndarray, payment: np.ndarray) -> np.ndarray:
+    """
+    Fractional number of monthly payments that retire a balance (inverse of
+    calculate_amortization): n = -ln(1 - rB/A) / ln(1 + r), r = apr / 12
+
+    Arrays broadcast; inf where the payment does not cover the interest.
+    """
+    balance, apr, payment = np.broadcast_arrays(
+        np.asarray(balance, dtype=np.float64), np.asarray(apr, dtype=np.float64), np.asarray(payment, dtype=np.float64)
+    )
+    rate = apr / 12
+    covers = (payment > 0) & (payment > rate * balance)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        periods = np.where(
+            rate == 0,
+            balance / payment,
+            -np.log1p(-rate * balance / payment) / np.log1p(rate)
+        )
+    return np.where(covers, np.maximum(periods, 0), np.inf)
+
+
+def payoff_horizon(
+    balance: np.ndarray,
+    apr: np.ndarray,
+    payment: np.ndarray,
+    max_months: int = MAX_SIMULATION_MONTHS
+) -> Dict[str, np.ndarray]:
+    """
+    Closed-form payoff of debts paid with a fixed monthly payment
+
+    An unrounded estimate: it can differ from the cent-rounded month loop by
+    a month and by dollars of interest, so only dashboards use it.
+
+    Args:
+        balance, apr, payment: Broadcastable arrays (dollars, APR fractions)
+
+    Returns:
+        {"months": whole months to payoff (0 without a balance, NOT_PAID_OFF
+        beyond max_months or when interest outpaces the payment),
+        "total_interest": cents, "final_payment": cents}; both are 0 for
+        debts that are not paid off
+    """
+    periods = nper(balance, apr, payment)
+    balance, apr, payment = np.broadcast_arrays(
+        np.asarray(balance, dtype=np.float64), np.asarray(apr, dtype=np.float64), np.asarray(payment, dtype=np.float64)
+    )
+    rate = apr / 12
+    growth = 1 + rate
+
+    # Tolerance absorbs float noise when the last payment is exactly full
+    months = np.where(balance > 0, np.ceil(periods - 1e-6), 0)
+    paid_off = months <= max_months
+    elapsed = np.where(paid_off, np.maximum(months - 1, 0), max_months)
+
+    # Balance after `elapsed` payments: B g^k - A (g^k - 1) / r
+    grown = growth ** elapsed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        remaining = np.where(rate == 0, balance - payment * elapsed, balance * grown - payment * (grown - 1) / rate)
+    final_payment = np.where(paid_off & (months > 0), remaining * growth, 0)
+    # A balance compounding for max_months is meaningless (and overflows int64)
+    interest = np.where(paid_off & (months > 0), payment * elapsed + final_payment - balance, 0)
+
+    return {
+        "months": np.where(paid_off, months, NOT_PAID_OFF).astype(np.int64),
+        "total_interest": np.rint(interest * 100).astype(np.int64),
+        "final_payment": np.rint(final_payment * 100).astype(np.int64)
+    }
+
+
+def simulate_payoff(
+    balances: Sequence[Dict[str, Any]],
+    extra_payment: float,
+    strategy: str = "snowball",
+    max_months: int = MAX_SIMULATION_MONTHS
+) -> PayoffSimulation:
+    """
+    Simulate paying off debts with a fixed monthly budget
+
+    Args:
+        balances: Dicts with name, balance, apr (fraction, e.g. 0.24) and optional min_payment
+        extra_payment: Monthly amount on top of all minimums
+        strategy: "snowball" or "avalanche"
+        max_months: Simulation horizon
+
+    Returns:
+        PayoffSimulation with per-month payment/interest arrays in cents
+    """
+    order, ordered, balance, minimum, rate_num = _prepare(balances, strategy)
+    budget = np.array([int(minimum.sum()) + max(to_cents(extra_payment), 0)], dtype=np.int64)
+
+    history = []
+    payoff_month, _, _ = _run(balance[None, :], minimum, rate_num, budget, max_months, history)
+    shape = (len(history), len(ordered))
+
+    return PayoffSimulation(
+        names=[b['name'] for b in ordered],
+        order=order,
+        payments=np.array([paid[0] for paid, _ in history], dtype=np.int64).reshape(shape),
+        interest=np.array([accrued[0] for _, accrued in history], dtype=np.int64).reshape(shape),
+        payoff_month=payoff_month[0]
+    )
+
+
+def simulate_payoff_grid(
+    balances: Sequence[Dict[str, Any]],
+    extra_payments: Sequence[float],
+    strategy: str = "snowball",
+    max_months: int = MAX_SIMULATION_MONTHS
+) -> Dict[str, np.ndarray]:
+    """
+    Payoff totals for many extra-payment levels in one vectorized pass
+
+    Duplicate levels (after rounding to cents) are simulated once.
+
+    Returns:
+        {"months": months until debt-free (NOT_PAID_OFF beyond the horizon),
+        "total_interest": cents (0 unless paid off), "paid_off": bool} per
+        entry of extra_payments
+    """
+    extra_cents = np.maximum(to_cents_array(extra_payments), 0)
+    levels, inverse = np.unique(extra_cents, return_inverse=True)
+    if not balances:
+        zeros = np.zeros(len(extra_cents), dtype=np.int64)
+        return {"months": zeros, "total_interest": zeros, "paid_off": np.ones(len(extra_cents), dtype=bool)}
+
+    _, _, balance, minimum, rate_num = _prepare(balances, strategy)
+    budget = int(minimum.sum()) + levels
+    start = np.broadcast_to(balance, (len(levels), len(balance)))
+    payoff_month, interest, _ = _run(start, minimum, rate_num, budget, max_months)
+
+    paid_off = (payoff_month != NOT_PAID_OFF).all(axis=1)
+    months = np.where(paid_off, payoff_month.max(axis=1), NOT_PAID_OFF)
+    return {
+        "months": months[inverse],
+        "total_interest": np.where(paid_off, interest.sum(axis=1), 0)[inverse],
+        "paid_off": paid_off[inverse]
+    }
+
+
+def payoff_schedule(
+    balances: Sequence[Dict[str, Any]],
+    extra_payment: float,
+    strategy: str,
+    start: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    One row per debt in payoff order with its real payoff date
+
+    Rows: account, payment (monthly payment once it is the target), balance,
+    apr, date (payoff date or None), payoff_month, interest_paid; the last
+    three are None for debts that never pay off
+    """
+    start = start or date.today()
+    order, _, balance, minimum, rate_num = _prepare(balances, strategy)
+    budget = np.array([int(minimum.sum()) + max(to_cents(extra_payment), 0)], dtype=np.int64)
+    payoff_month, interest, peak_payment = _run(balance[None, :], minimum, rate_num, budget, MAX_SIMULATION_MONTHS)
+    dates = payoff_dates(payoff_month[0], start)
+
+    schedule = []
+    for position, index in enumerate(order):
+        month = int(payoff_month[0, position])
+        paid_off = month != NOT_PAID_OFF
+        schedule.append({
+            "account": balances[index]['name'],
+            "payment": from_cents(int(peak_payment[0, position])),
+            "balance": balances[index]['balance'],
+            "apr": balances[index]['apr'],
+            "date": dates[position],
+            "payoff_month": month if paid_off else None,
+            "interest_paid": from_cents(int(interest[0, position])) if paid_off else None
+        })
+    return schedule
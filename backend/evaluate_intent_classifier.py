@@ -0,0 +1,91 @@
+"""
+Offline evaluation of the local intent classifier against LLM labels
+Usage: python evaluate_intent_classifier.py [--holdout 0.2] [--threshold 0.85]
+
+Trains on part of the logged conversation history and reports how often
+the local classifier agrees with the LLM-assigned intent on the rest.
+"""
+import argparse
+import asyncio
+import logging
+import random
+from collections import Counter
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Load environment
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+from database import init_databases, close_databases, get_mongo_db
+from intent_classifier import IntentClassifier, fetch_labelled_intents, INTENT_CONFIDENCE_THRESHOLD
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def evaluate(train, test, threshold: float) -> dict:
+    """Agreement of local predictions with LLM labels on the test split"""
+    classifier = IntentClassifier()
+    classifier.train(train)
+    
+    confusion = Counter()
+    agree_all = 0
+    confident = 0
+    agree_confident = 0
+    for message, label in test:
+        predicted, confidence = classifier.predict(message)
+        confusion[(label, predicted)] += 1
+        if predicted == label:
+            agree_all += 1
+        if predicted is not None and confidence >= threshold:
+            confident += 1
+            if predicted == label:
+                agree_confident += 1
+    
+    total = len(test)
+    return {
+        "train_size": len(train),
+        "test_size": total,
+        "model_active": classifier.trained,
+        "agreement": agree_all / total if total else 0.0,
+        "coverage": confident / total if total else 0.0,
+        "agreement_when_confident": agree_confident / confident if confident else 0.0,
+        "confusion": confusion
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Evaluate local intent classifier against LLM labels")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of examples held out for testing")
+    parser.add_argument("--threshold", type=float, default=INTENT_CONFIDENCE_THRESHOLD, help="Local confidence threshold")
+    parser.add_argument("--limit", type=int, default=5000, help="Maximum examples to load")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    await init_databases()
+    try:
+        examples = await fetch_labelled_intents(get_mongo_db(), args.limit)
+    finally:
+        await close_databases()
+    
+    if not examples:
+        logger.info("No labelled intents found in conversation history")
+        return
+    
+    random.Random(args.seed).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+    report = evaluate(examples[:split], examples[split:], args.threshold)
+    
+    print(f"Examples: {report['train_size']} train / {report['test_size']} test "
+          f"({'n-gram model' if report['model_active'] else 'keyword rules only'})")
+    print(f"Agreement with LLM (all):        {report['agreement']:.1%}")
+    print(f"Coverage at threshold {args.threshold:.2f}:   {report['coverage']:.1%}")
+    print(f"Agreement when confident:        {report['agreement_when_confident']:.1%}")
+    print("\nLLM label -> local prediction:")
+    for (label, predicted), count in report["confusion"].most_common():
+        print(f"  {label:22} -> {str(predicted):22} {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
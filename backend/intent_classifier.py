@@ -0,0 +1,203 @@
+"""
+Local intent classifier for EEFai - answers confident messages without an LLM call
+
+Combines keyword rules with a character n-gram Naive Bayes model trained on
+intents previously labelled by the LLM (eefai_state.conversation_history).
+A message is answered locally only when a keyword rule fires and the model
+(once trained) agrees; everything else is routed to ai_utils.extract_intent.
+"""
+import math
+import os
+import re
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Predictions at or above this confidence skip the LLM
+INTENT_CONFIDENCE_THRESHOLD = float(os.environ.get('INTENT_CONFIDENCE_THRESHOLD', '0.85'))
+
+# Minimum labelled examples before the n-gram model is used
+MIN_TRAINING_EXAMPLES = 50
+
+KEYWORD_CONFIDENCE = 0.9
+
+# Cap for model-only predictions: the posterior is normalized over known
+# intents, so out-of-domain text ("what is the weather") still scores high
+MODEL_ONLY_CONFIDENCE = 0.5
+
+INTENT_KEYWORDS = {
+    "upload_debt_letter": [
+        "collection letter", "debt collector", "debt collection", "collection agency",
+        "collections", "collector", "validation letter", "got a letter"
+    ],
+    "create_savings_plan": [
+        "save", "saving", "savings", "emergency fund", "rainy day", "put money aside"
+    ],
+    "dispute_credit_item": [
+        "dispute", "credit report", "inaccurate", "equifax", "experian", "transunion",
+        "credit bureau", "wrong on my credit"
+    ],
+    "check_status": [
+        "status", "progress", "any update", "where is my", "where are we"
+    ],
+    "general_question": [
+        "hi", "hello", "hey", "good morning", "what can you do", "who are you"
+    ]
+}
+
+_KEYWORD_PATTERNS = {
+    intent: [re.compile(r"\b" + re.escape(keyword) + r"\b") for keyword in keywords]
+    for intent, keywords in INTENT_KEYWORDS.items()
+}
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase and collapse non-alphanumeric runs to single spaces"""
+    return re.sub(r"[^a-z0-9']+", " ", message.lower()).strip()
+
+
+def char_ngrams(text: str, sizes: Tuple[int, ...] = (3, 4)) -> List[str]:
+    """Character n-grams of a normalized message, padded at word edges"""
+    padded = f" {text} "
+    grams = []
+    for n in sizes:
+        grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+class IntentClassifier:
+    """Keyword + character n-gram Naive Bayes intent classifier"""
+
+    # Scales the per-feature mean log-likelihood so confidences are not
+    # saturated by the number of n-grams in a message
+    SHARPNESS = 8.0
+
+    def __init__(self, intents: Optional[Iterable[str]] = None):
+        self.intents = list(intents or INTENT_KEYWORDS.keys())
+        self.trained = False
+        self.class_counts: Dict[str, int] = {}
+        self.feature_counts: Dict[str, Counter] = {}
+        self.feature_totals: Dict[str, int] = {}
+        self.vocabulary_size = 0
+        self.training_size = 0
+
+    def train(self, examples: Iterable[Tuple[str, str]]) -> int:
+        """
+        Fit the n-gram model on (message, intent) pairs
+
+        Returns:
+            Number of examples used
+        """
+        class_counts: Dict[str, int] = defaultdict(int)
+        feature_counts: Dict[str, Counter] = defaultdict(Counter)
+        vocabulary = set()
+
+        used = 0
+        for message, intent in examples:
+            if intent not in self.intents or not message:
+                continue
+            grams = char_ngrams(normalize_message(message))
+            if not grams:
+                continue
+            class_counts[intent] += 1
+            feature_counts[intent].update(grams)
+            vocabulary.update(grams)
+            used += 1
+
+        self.class_counts = dict(class_counts)
+        self.feature_counts = dict(feature_counts)
+        self.feature_totals = {intent: sum(counts.values()) for intent, counts in feature_counts.items()}
+        self.vocabulary_size = len(vocabulary)
+        self.training_size = used
+        self.trained = used >= MIN_TRAINING_EXAMPLES
+        return used
+
+    def keyword_intent(self, text: str) -> Optional[str]:
+        """Intent whose keywords match, or None when none or several intents match"""
+        matched = [
+            intent for intent, patterns in _KEYWORD_PATTERNS.items()
+            if intent in self.intents and any(pattern.search(text) for pattern in patterns)
+        ]
+        return matched[0] if len(matched) == 1 else None
+
+    def ngram_scores(self, text: str) -> Dict[str, float]:
+        """Posterior over trained intents for a normalized message"""
+        grams = char_ngrams(text)
+        if not self.trained or not grams:
+            return {}
+
+        log_scores = {}
+        for intent, count in self.class_counts.items():
+            counts = self.feature_counts[intent]
+            denominator = self.feature_totals[intent] + self.vocabulary_size
+            log_likelihood = sum(math.log((counts[gram] + 1) / denominator) for gram in grams)
+            log_prior = math.log(count / self.training_size)
+            log_scores[intent] = log_prior + self.SHARPNESS * log_likelihood / len(grams)
+
+        top = max(log_scores.values())
+        weights = {intent: math.exp(score - top) for intent, score in log_scores.items()}
+        total = sum(weights.values())
+        return {intent: weight / total for intent, weight in weights.items()}
+
+    def predict(self, message: str) -> Tuple[Optional[str], float]:
+        """
+        Classify a message
+
+        Returns:
+            (intent, confidence); intent is None when nothing matched.
+            Confidence clears the threshold only when a keyword rule matched
+            and the model (if trained) agrees with it.
+        """
+        text = normalize_message(message)
+        keyword = self.keyword_intent(text)
+        scores = self.ngram_scores(text)
+
+        if not scores:
+            return (keyword, KEYWORD_CONFIDENCE) if keyword else (None, 0.0)
+
+        best = max(scores, key=scores.get)
+        if keyword is None:
+            return best, min(scores[best], MODEL_ONLY_CONFIDENCE)
+        if keyword == best:
+            return best, max(KEYWORD_CONFIDENCE, scores[best])
+        # Rules and model disagree - leave it to the LLM
+        return keyword, min(scores.get(keyword, 0.0), 1 - scores[best])
+
+
+# Process-wide classifier used by EEFai
+intent_classifier = IntentClassifier()
+
+
+async def fetch_labelled_intents(db, limit: int = 5000) -> List[Tuple[str, str]]:
+    """
+    Load (message, intent) pairs labelled by the LLM from conversation history
+
+    Entries classified locally are skipped so the model never trains on its
+    own predictions.
+    """
+    pipeline = [
+        {"$unwind": "$conversation_history"},
+        {"$match": {"conversation_history.intent_source": {"$ne": "local"}}},
+        {"$sort": {"conversation_history.timestamp": -1}},
+        {"$limit": limit},
+        {"$project": {
+            "_id": 0,
+            "message": "$conversation_history.user_message",
+            "intent": "$conversation_history.intent"
+        }}
+    ]
+    rows = await db.eefai_state.aggregate(pipeline).to_list(limit)
+    return [(row["message"], row["intent"]) for row in rows if row.get("message") and row.get("intent")]
+
+
+async def load_intent_classifier(db, limit: int = 5000) -> int:
+    """Train the process-wide classifier from logged LLM intents"""
+    examples = await fetch_labelled_intents(db, limit)
+    used = intent_classifier.train(examples)
+    logger.info(
+        f"Intent classifier trained on {used} examples "
+        f"({'n-gram model active' if intent_classifier.trained else 'keyword rules only'})"
+    )
+    return used
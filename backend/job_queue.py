@@ -5,7 +5,8 @@ Handles: OCR, PDF generation, AI calls, emails, notifications
 import asyncio
 import json
 import logging
-from typing import Any, Callable
+import uuid
+from typing import Any, Callable, Optional
 from datetime import datetime, timezone
 import redis.asyncio as aioredis
 import os
@@ -14,6 +15,12 @@ logger = logging.getLogger(__name__)
 
 REDIS_URL = f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/{os.getenv('REDIS_DB', '0')}"
 
+# How long job results stay pollable
+RESULT_TTL = 3600
+
+# Admission class of ai queue jobs (see ai_utils.AI_CLASS_LIMITS)
+AI_WORKER_PRIORITY = "background"
+
 
 class JobQueue:
     """Async job queue using Redis"""
@@ -45,7 +52,7 @@ class JobQueue:
             return None
         
         job = {
-            "id": f"{queue_name}_{datetime.now().timestamp()}",
+            "id": f"{queue_name}_{datetime.now().timestamp()}_{uuid.uuid4().hex[:8]}",
             "queue": queue_name,
             "data": job_data,
             "priority": priority,
@@ -55,10 +62,17 @@ class JobQueue:
         
         # Add to Redis list with priority
         await self.redis.zadd(f"queue:{queue_name}", {json.dumps(job): priority})
+        await self.store_result(job["id"], "pending")
         
         logger.info(f"Job enqueued: {job['id']} on {queue_name}")
         return job["id"]
     
+    async def requeue(self, job: dict):
+        """Put a failed job back under its original id with lower priority"""
+        job["priority"] = job["priority"] - 10
+        await self.redis.zadd(f"queue:{job['queue']}", {json.dumps(job): job["priority"]})
+        await self.store_result(job["id"], "retrying", error=job.get("last_error"))
+    
     async def dequeue(self, queue_name: str, timeout: int = 5):
         """Dequeue next job from queue"""
         if not self.redis:
@@ -73,6 +87,39 @@ class JobQueue:
         job = json.loads(job_json)
         return job
     
+    async def dequeue_batch(self, queue_name: str, max_jobs: int) -> list:
+        """Pop up to max_jobs highest-priority jobs in one round trip"""
+        if not self.redis or max_jobs <= 0:
+            return []
+        
+        result = await self.redis.zpopmax(f"queue:{queue_name}", max_jobs)
+        return [json.loads(job_json) for job_json, priority in result]
+    
+    async def store_result(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        """Record job status/result so callers can poll by job id"""
+        if not self.redis:
+            return
+        
+        record = {
+            "job_id": job_id,
+            "status": status,
+            "result": result,
+            "error": error,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        try:
+            await self.redis.set(f"job_result:{job_id}", json.dumps(record), ex=RESULT_TTL)
+        except Exception as e:
+            logger.warning(f"Failed to store result for {job_id}: {e}")
+    
+    async def get_result(self, job_id: str) -> Optional[dict]:
+        """Fetch job status/result, or None if unknown or expired"""
+        if not self.redis:
+            return None
+        
+        record = await self.redis.get(f"job_result:{job_id}")
+        return json.loads(record) if record else None
+    
     def register_worker(self, queue_name: str, handler: Callable):
         """Register a worker function for a queue"""
         self.workers[queue_name] = handler
@@ -93,17 +140,7 @@ class JobQueue:
                 
                 if job:
                     logger.info(f"Processing job: {job['id']}")
-                    
-                    try:
-                        # Execute handler
-                        result = await handler(job['data'])
-                        logger.info(f"Job completed: {job['id']}")
-                    except Exception as e:
-                        logger.error(f"Job failed: {job['id']} - {e}")
-                        # Re-queue with lower priority for retry
-                        job['retry_count'] = job.get('retry_count', 0) + 1
-                        if job['retry_count'] < 3:
-                            await self.enqueue(queue_name, job['data'], priority=job['priority'] - 10)
+                    await self._run_job(handler, job)
                 else:
                     # No jobs, wait a bit
                     await asyncio.sleep(1)
@@ -111,6 +148,74 @@ class JobQueue:
             except Exception as e:
                 logger.error(f"Worker error: {e}")
                 await asyncio.sleep(5)
+    
+    async def start_batch_worker(self, queue_name: str, batch_size: int = 16, concurrency: int = 8):
+        """
+        Process jobs in micro-batches with bounded concurrency
+        
+        Free worker slots are refilled with one batched pop, and jobs run
+        concurrently (at most `concurrency` at a time). Results are written
+        to the result store; failed jobs are retried under their original id.
+        When the worker is cancelled its in-flight jobs are cancelled and
+        awaited, and each goes back on the queue.
+        """
+        if queue_name not in self.workers:
+            raise ValueError(f"No worker registered for {queue_name}")
+        
+        handler = self.workers[queue_name]
+        in_flight = set()
+        
+        logger.info(f"Batch worker started for {queue_name} (batch={batch_size}, concurrency={concurrency})")
+        
+        try:
+            while True:
+                try:
+                    free = concurrency - len(in_flight)
+                    jobs = await self.dequeue_batch(queue_name, min(batch_size, free))
+                    for job in jobs:
+                        in_flight.add(asyncio.create_task(self._run_job(handler, job)))
+                    
+                    if in_flight:
+                        # Wake as soon as any job finishes so its slot can be refilled
+                        done, in_flight = await asyncio.wait(
+                            in_flight,
+                            timeout=1 if not jobs else 0.05,
+                            return_when=asyncio.FIRST_COMPLETED
+                        )
+                    elif not jobs:
+                        # No jobs, wait a bit
+                        await asyncio.sleep(1)
+                        
+                except Exception as e:
+                    logger.error(f"Batch worker error: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            if in_flight:
+                logger.info(f"Batch worker for {queue_name} stopped; {len(in_flight)} in-flight jobs re-queued")
+    
+    async def _run_job(self, handler: Callable, job: dict):
+        """Run one job and record its outcome; failed is stored only once retries run out"""
+        try:
+            await self.store_result(job['id'], "running")
+            result = await handler(job['data'])
+            await self.store_result(job['id'], "completed", result)
+            logger.info(f"Job completed: {job['id']}")
+        except asyncio.CancelledError:
+            # Worker shutdown: put the job back untouched for the next worker
+            await self.redis.zadd(f"queue:{job['queue']}", {json.dumps(job): job["priority"]})
+            await self.store_result(job['id'], "pending")
+            raise
+        except Exception as e:
+            logger.error(f"Job failed: {job['id']} - {e}")
+            job['retry_count'] = job.get('retry_count', 0) + 1
+            job['last_error'] = str(e)
+            if job['retry_count'] < 3:
+                await self.requeue(job)
+            else:
+                await self.store_result(job['id'], "failed", error=str(e))
 
 
 # Global job queue instance
@@ -151,15 +256,41 @@ async def email_worker(job_data: dict):
     return {"status": "completed"}
 
 
-async def ai_worker(job_data: dict):
-    """Worker for AI processing"""
+_ai_providers = {}
+
+
+def ai_worker_concurrency(requested: Optional[int] = None) -> int:
+    """
+    Concurrent ai jobs per worker, capped at the admission limit of their class
+    
+    Jobs beyond the class limit would only wait in the admission queue and
+    risk its deadline, which re-queues them.
+    """
+    from ai_utils import AI_CLASS_LIMITS
+    
+    limit = AI_CLASS_LIMITS[AI_WORKER_PRIORITY]
+    return min(requested, limit) if requested else limit
+
+
+def get_worker_provider(temperature: float):
+    """Shared AIProvider per temperature for the ai worker"""
     from ai_utils import AIProvider
     
-    provider = AIProvider()
+    if temperature not in _ai_providers:
+        _ai_providers[temperature] = AIProvider(temperature=temperature)
+    return _ai_providers[temperature]
+
+
+async def ai_worker(job_data: dict):
+    """Worker for AI processing"""
+    provider = get_worker_provider(job_data.get('temperature', 0.0))
     result = await provider.generate(
         job_data['system_message'],
         job_data['user_message'],
-        job_data.get('session_id', 'worker')
+        job_data.get('session_id', 'worker'),
+        cache_ttl=job_data.get('cache_ttl'),
+        priority=AI_WORKER_PRIORITY,
+        caller=job_data.get('caller', 'ai_worker')
     )
     
     return {"status": "completed", "result": result}
@@ -0,0 +1,161 @@
+"""
+BM25 relevance index over legal rules for LegalAI
+
+Indexes rule_text, citation title/statute and rule_type so check_legal can
+send the LLM the handful of rules that actually match the request instead
+of the first N rules of a type.
+"""
+import re
+import math
+import heapq
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Field weights: a term in rule_type counts as much as several in the text
+FIELD_WEIGHTS = {
+    "rule_type": 3,
+    "title": 2,
+    "rule_text": 1,
+    "statute": 1,
+}
+
+# Upper bound on context text folded into a query
+MAX_QUERY_CHARS = 2000
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have if in into is it its may must not of on or "
+    "such that the their them they this to was were will with within".split()
+)
+
+# Vocabulary each action type should pull in even with an empty context
+ACTION_QUERY_TERMS = {
+    "debt_validation": "debt collector validation verification notice dispute creditor amount collection",
+    "credit_dispute": "credit reporting dispute inaccurate information investigate bureau consumer report",
+    "statute_check": "debt collection legal action statute time barred judicial district",
+    "collection_contact": "debt collector communication harassment abuse calls cease contact",
+    "credit_repair": "credit repair organization fees contract disclosures cancel",
+}
+
+
+def _stem(token: str) -> str:
+    """Light suffix stripping so 'disputes'/'disputed'/'disputing' share a term"""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, lightly stemmed"""
+    return [
+        _stem(token) for token in re.findall(r"[a-z0-9]+", str(text).lower())
+        if token not in STOPWORDS
+    ]
+
+
+def _rule_fields(rule: Dict[str, Any]) -> Dict[str, str]:
+    citations = rule.get('citations') or {}
+    return {
+        "rule_type": (rule.get('rule_type') or "").replace("_", " "),
+        "title": citations.get('title', ""),
+        "rule_text": rule.get('rule_text', ""),
+        "statute": citations.get('statute', ""),
+    }
+
+
+class RuleIndex:
+    """Inverted index with BM25 scoring over a fixed set of rules"""
+
+    def __init__(self, rules: Iterable[Dict[str, Any]]):
+        self.rules: Tuple[Dict[str, Any], ...] = tuple(rules)
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.doc_lengths: List[int] = []
+
+        for doc_id, rule in enumerate(self.rules):
+            terms: Counter = Counter()
+            for field, text in _rule_fields(rule).items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    terms[token] += weight
+            self.doc_lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, []).append((doc_id, frequency))
+
+        count = len(self.rules)
+        self.average_length = (sum(self.doc_lengths) / count) if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+        # Length normalisation per document, precomputed once
+        self._norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * length / self.average_length) if self.average_length else BM25_K1
+            for length in self.doc_lengths
+        ]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def score(self, query: str) -> Dict[int, float]:
+        """BM25 score per matching document id"""
+        scores: Dict[int, float] = {}
+        for term, query_frequency in Counter(tokenize(query)).items():
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf[term]
+            for doc_id, frequency in docs:
+                gain = idf * frequency * (BM25_K1 + 1) / (frequency + self._norms[doc_id])
+                scores[doc_id] = scores.get(doc_id, 0.0) + gain * query_frequency
+        return scores
+
+    def search(self, query: str, k: int = 10, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Top-k rules for a query
+
+        Args:
+            query: Free text (see build_rule_query)
+            k: Number of rules to return
+            state: Two-letter state; rules scoped to other states are excluded
+        """
+        state = state.upper() if state else None
+        candidates = (
+            (score, doc_id) for doc_id, score in self.score(query).items()
+            if self.rules[doc_id].get('state_code') in (None, state)
+        )
+        top = heapq.nlargest(k, candidates, key=lambda item: (item[0], -item[1]))
+        return [self.rules[doc_id] for _, doc_id in top]
+
+
+def _context_text(value: Any) -> Iterable[str]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield str(key).replace("_", " ")
+            yield from _context_text(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _context_text(item)
+    elif isinstance(value, str):
+        yield value
+
+
+def build_rule_query(action_type: str, context: Optional[Dict[str, Any]] = None) -> str:
+    """Query text for an action type plus the textual parts of its context"""
+    parts = [
+        action_type.replace("_", " "),
+        ACTION_QUERY_TERMS.get(action_type, ""),
+        " ".join(_context_text(context or {}))[:MAX_QUERY_CHARS]
+    ]
+    return " ".join(part for part in parts if part)
+
+
+@lru_cache(maxsize=1)
+def complete_rule_index() -> RuleIndex:
+    """Index over the bundled FDCPA/FCRA/CROA rulesets"""
+    from complete_legal_rules import COMPLETE_FDCPA_RULES, COMPLETE_FCRA_RULES, COMPLETE_CROA_RULES
+    return RuleIndex(COMPLETE_FDCPA_RULES + COMPLETE_FCRA_RULES + COMPLETE_CROA_RULES)
@@ -0,0 +1,202 @@
+"""
+In-process legal knowledge snapshot with versioned hot reload
+
+All legal rules, deterministic checks and statute of limitations rows are
+loaded once into an immutable, indexed snapshot so LegalAI lookups need no
+database round trip.
+Seeders bump a version key (Mongo legal_meta + Redis); each process polls
+the key and swaps in a freshly built snapshot when it changes.
+"""
+import os
+import asyncio
+import logging
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from database import get_redis
+from legal_index import RuleIndex, complete_rule_index
+from legal_rule_engine import RuleEngine
+from sol_engine import SOLMatrix, seed_sol_matrix
+
+logger = logging.getLogger(__name__)
+
+# Redis key / legal_meta document id holding the current knowledge version
+LEGAL_KB_VERSION_KEY = "legal_kb_version"
+
+# How often each process checks the version key
+LEGAL_KB_REFRESH_SECONDS = float(os.environ.get('LEGAL_KB_REFRESH_SECONDS', '30'))
+
+UNVERSIONED = "unversioned"
+
+
+class LegalSnapshot:
+    """Read-only view of legal rules, checks and SOL rows, indexed for lookups"""
+
+    def __init__(
+        self,
+        version: str,
+        rules: Iterable[Dict[str, Any]],
+        sol_rows: Iterable[Dict[str, Any]],
+        checks: Iterable[Dict[str, Any]] = ()
+    ):
+        self.version = version
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+
+        rules = tuple(rules)
+        sol_rows = tuple(sol_rows)
+        by_type: Dict[str, List[dict]] = {}
+        by_state: Dict[Optional[str], List[dict]] = {}
+        for rule in rules:
+            by_type.setdefault(rule.get('rule_type'), []).append(rule)
+            by_state.setdefault(rule.get('state_code'), []).append(rule)
+
+        self.rules = rules
+        self.rules_by_code: Mapping[str, dict] = MappingProxyType({rule['rule_code']: rule for rule in rules})
+        self.rules_by_type: Mapping[str, Tuple[dict, ...]] = MappingProxyType(
+            {key: tuple(items) for key, items in by_type.items()}
+        )
+        self.rules_by_state: Mapping[Optional[str], Tuple[dict, ...]] = MappingProxyType(
+            {key: tuple(items) for key, items in by_state.items()}
+        )
+        self.sol: Mapping[Tuple[str, str], dict] = MappingProxyType({
+            (row['state_code'].upper(), row['debt_type'].lower()): row for row in sol_rows
+        })
+        # Relevance index and SOL matrix; fall back to the bundled data before the DB is seeded
+        self.index = RuleIndex(rules) if rules else complete_rule_index()
+        self.sol_matrix = SOLMatrix.from_rows(sol_rows) if sol_rows else seed_sol_matrix()
+        
+        # Deterministic checks compiled once per snapshot
+        checks = tuple(checks)
+        if not checks:
+            from complete_legal_rules import DEFAULT_LEGAL_CHECKS
+            checks = DEFAULT_LEGAL_CHECKS
+        self.engine = RuleEngine(checks)
+
+    def rule(self, rule_code: str) -> Optional[dict]:
+        return self.rules_by_code.get(rule_code)
+
+    def rules_of_type(self, *rule_types: str) -> List[dict]:
+        """Rules of the given types, in load order"""
+        wanted = set(rule_types)
+        return [rule for rule in self.rules if rule.get('rule_type') in wanted]
+
+    def rules_for_state(self, state_code: Optional[str]) -> List[dict]:
+        """Federal rules plus any rules specific to state_code"""
+        rules = list(self.rules_by_state.get(None, ()))
+        if state_code:
+            rules.extend(self.rules_by_state.get(state_code.upper(), ()))
+        return rules
+
+    def sol_row(self, state: str, debt_type: str) -> Optional[dict]:
+        return self.sol.get((state.upper(), debt_type.lower()))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "rules": len(self.rules),
+            "sol_rows": len(self.sol),
+            "checks": len(self.engine.checks)
+        }
+
+
+class LegalKnowledgeBase:
+    """Holds the current snapshot and replaces it when the version key changes"""
+
+    def __init__(self):
+        self.snapshot: Optional[LegalSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.snapshot is not None
+
+    async def current_version(self, db) -> str:
+        """Version key from Redis, falling back to Mongo"""
+        redis = get_redis()
+        if redis:
+            try:
+                version = await redis.get(LEGAL_KB_VERSION_KEY)
+                if version:
+                    return version
+            except Exception as e:
+                logger.warning(f"Legal KB version read from Redis failed: {e}")
+
+        meta = await db.legal_meta.find_one({'_id': LEGAL_KB_VERSION_KEY})
+        return meta['version'] if meta else UNVERSIONED
+
+    async def load(self, db, version: Optional[str] = None) -> LegalSnapshot:
+        """Build a new snapshot from Mongo and swap it in"""
+        async with self._lock:
+            version = version or await self.current_version(db)
+            rules = await db.legal_rules.find({}, {'_id': 0}).to_list(None)
+            sol_rows = await db.statute_of_limitations.find({}, {'_id': 0}).to_list(None)
+            checks = await db.legal_checks.find({}, {'_id': 0}).to_list(None)
+            snapshot = LegalSnapshot(version, rules, sol_rows, checks)
+            # Single reference assignment - readers see the old or the new snapshot, never a mix
+            self.snapshot = snapshot
+            logger.info(
+                f"Legal KB snapshot {version} loaded: {len(rules)} rules, "
+                f"{len(sol_rows)} SOL rows, {len(snapshot.engine.checks)} checks"
+            )
+            return snapshot
+
+    async def get(self, db) -> LegalSnapshot:
+        """Current snapshot, loading it on first use"""
+        if self.snapshot is None:
+            return await self.load(db)
+        return self.snapshot
+
+    async def refresh_if_changed(self, db) -> bool:
+        """Reload when the version key differs from the loaded snapshot"""
+        version = await self.current_version(db)
+        if self.snapshot is not None and self.snapshot.version == version:
+            return False
+        await self.load(db, version)
+        return True
+
+    async def _refresh_loop(self, get_db, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh_if_changed(get_db())
+            except Exception as e:
+                logger.warning(f"Legal KB refresh failed: {e}")
+
+    def start_refresh_loop(self, get_db, interval: float = LEGAL_KB_REFRESH_SECONDS):
+        """Poll the version key in the background"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop(get_db, interval))
+
+    async def stop_refresh_loop(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+# Process-wide legal knowledge used by LegalAI
+legal_knowledge = LegalKnowledgeBase()
+
+
+async def bump_legal_version(db) -> str:
+    """Publish a new knowledge version after legal data changes"""
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    await db.legal_meta.update_one(
+        {'_id': LEGAL_KB_VERSION_KEY},
+        {'$set': {'version': version, 'updated_at': datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    redis = get_redis()
+    if redis:
+        try:
+            await redis.set(LEGAL_KB_VERSION_KEY, version)
+        except Exception as e:
+            logger.warning(f"Legal KB version publish to Redis failed: {e}")
+    logger.info(f"Legal KB version bumped to {version}")
+    return version
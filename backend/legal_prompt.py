@@ -0,0 +1,191 @@
+"""
+Token-budgeted prompt assembly for LegalAI
+
+The system prompt (instructions + compacted rule list) depends only on the
+legal DB version and the rules selected, so it is built once and cached; the
+identical prefix also lets the response cache reuse work.
+Request context is cleaned, deduplicated and truncated to a token budget
+before it is placed in the user prompt.
+"""
+import os
+import re
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Rough token estimate used across the backend (see ai_utils.CHARS_PER_TOKEN)
+CHARS_PER_TOKEN = 4
+
+# Budget for the serialized request context in the user prompt
+LEGAL_CONTEXT_TOKEN_BUDGET = int(os.environ.get('LEGAL_CONTEXT_TOKEN_BUDGET', '600'))
+
+# Budget for the rule list in the system prompt
+LEGAL_RULES_TOKEN_BUDGET = int(os.environ.get('LEGAL_RULES_TOKEN_BUDGET', '900'))
+
+# Per-rule text cap before the overall rules budget is applied
+MAX_RULE_CHARS = 240
+
+# Strings shorter than this are never truncated further
+MIN_FIELD_CHARS = 16
+
+ELLIPSIS = "…"
+
+SYSTEM_INSTRUCTIONS = """You are LegalAI, a legal compliance analyzer for FDCPA/FCRA/CROA.
+Analyze the user's situation and identify any legal issues or rights, citing rule codes from the list.
+Respond in JSON format:
+{"ok": true, "issues_found": ["issue description"], "applicable_rules": ["FDCPA_809", "FCRA_611"], "must_escalate": false, "advice": "Brief legal guidance"}"""
+
+
+BATCH_SYSTEM_INSTRUCTIONS = """You are LegalAI, a legal compliance analyzer for FDCPA/FCRA/CROA.
+You will receive several numbered accounts. Analyze each one separately for legal issues or rights, citing rule codes from the list.
+Respond in JSON format with one entry per account:
+{"items": [{"item": 1, "issues_found": ["issue description"], "applicable_rules": ["FDCPA_809"], "must_escalate": false}]}"""
+
+# Smallest per-item context budget in a batch prompt
+MIN_BATCH_ITEM_TOKENS = 60
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a string"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compact_text(text: str, max_chars: int) -> str:
+    """Collapse whitespace and cut to max_chars on a word boundary"""
+    text = re.sub(r"\s+", " ", str(text)).strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max(max_chars - len(ELLIPSIS), 1)]
+    if " " in cut[len(cut) // 2:]:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,;:.") + ELLIPSIS
+
+
+def rules_key(rules: Iterable[Dict[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable (rule_code, rule_text) tuple used to key the system prompt cache"""
+    return tuple((rule['rule_code'], rule.get('rule_text', '')) for rule in rules)
+
+
+def _render_rules(rules: Tuple[Tuple[str, str], ...]) -> str:
+    """One "- CODE: text" line per rule until the rules token budget is spent"""
+    budget = LEGAL_RULES_TOKEN_BUDGET * CHARS_PER_TOKEN
+    lines: List[str] = []
+    for code, text in rules:
+        line = f"- {code}: {compact_text(text, MAX_RULE_CHARS)}"
+        if lines and len(line) > budget:
+            break
+        lines.append(line)
+        budget -= len(line) + 1
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=128)
+def build_system_prompt(db_version: str, rules: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    System prompt for one legal DB version and rule selection
+
+    Rules are rendered one per line as "CODE: text" rather than indented JSON,
+    and the list stops once the rules token budget is spent.
+    """
+    return f"{SYSTEM_INSTRUCTIONS}\n\nAvailable Legal Rules (DB {db_version}):\n{_render_rules(rules)}"
+
+
+@lru_cache(maxsize=32)
+def build_batch_system_prompt(db_version: str, rules: Tuple[Tuple[str, str], ...]) -> str:
+    """System prompt for a multi-account batch review"""
+    return f"{BATCH_SYSTEM_INSTRUCTIONS}\n\nAvailable Legal Rules (DB {db_version}):\n{_render_rules(rules)}"
+
+
+def _clean_value(value: Any) -> Any:
+    """Drop empty entries, collapse whitespace and dedupe list items"""
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    if isinstance(value, dict):
+        cleaned = {key: _clean_value(item) for key, item in value.items()}
+        return {key: item for key, item in cleaned.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple, set)):
+        items = []
+        seen = set()
+        for item in value:
+            item = _clean_value(item)
+            marker = json.dumps(item, sort_keys=True, default=str)
+            if item in (None, "", [], {}) or marker in seen:
+                continue
+            seen.add(marker)
+            items.append(item)
+        return items
+    return value
+
+
+def compact_context(context: Dict[str, Any], token_budget: int = LEGAL_CONTEXT_TOKEN_BUDGET) -> Dict[str, Any]:
+    """
+    Clean and shrink request context to fit a token budget
+
+    Empty fields are dropped, a value repeated under several keys is kept only
+    under the first, and long fields are truncated - shortest fields keep
+    their full text and the remaining budget is shared among the longer ones.
+    """
+    cleaned = _clean_value(context or {})
+
+    fields: Dict[str, str] = {}
+    seen_values = set()
+    for key in sorted(cleaned):
+        value = cleaned[key]
+        text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+        if len(text) > MIN_FIELD_CHARS and text in seen_values:
+            continue
+        seen_values.add(text)
+        fields[key] = text
+
+    # Overhead of keys, quotes and separators in the serialized object
+    overhead = sum(len(key) + 6 for key in fields)
+    remaining = max(token_budget * CHARS_PER_TOKEN - overhead, 0)
+
+    result: Dict[str, Any] = {}
+    pending = sorted(fields, key=lambda key: len(fields[key]))
+    for index, key in enumerate(pending):
+        share = max(remaining // (len(pending) - index), MIN_FIELD_CHARS)
+        text = fields[key]
+        if len(text) <= share:
+            result[key] = cleaned[key]
+        else:
+            result[key] = compact_text(text, share)
+        remaining = max(remaining - len(text if len(text) <= share else result[key]), 0)
+
+    return {key: result[key] for key in sorted(result)}
+
+
+def build_user_prompt(action_type: str, state: str, context: Dict[str, Any]) -> str:
+    """User prompt with the context compacted to LEGAL_CONTEXT_TOKEN_BUDGET"""
+    compacted = compact_context(context)
+    return (
+        f"Action Type: {action_type}\n"
+        f"State: {state}\n"
+        f"Context: {json.dumps(compacted, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)}\n\n"
+        f"Analyze this situation for legal compliance and consumer rights."
+    )
+
+
+def build_batch_user_prompt(entries: List[Tuple[str, str, Dict[str, Any]]]) -> str:
+    """
+    Numbered multi-account user prompt
+
+    Args:
+        entries: (action_type, state, context) per account; the context token
+            budget is split across accounts
+    """
+    item_budget = max(LEGAL_CONTEXT_TOKEN_BUDGET // max(len(entries), 1), MIN_BATCH_ITEM_TOKENS)
+    lines = []
+    for number, (action_type, state, context) in enumerate(entries, start=1):
+        compacted = compact_context(context, item_budget)
+        lines.append(
+            f"{number}. Action Type: {action_type}; State: {state}; "
+            f"Context: {json.dumps(compacted, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)}"
+        )
+    return "Accounts:\n" + "\n".join(lines) + "\n\nAnalyze each account for legal compliance and consumer rights."
+
+
+def get_prompt_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters of the system prompt cache"""
+    info = build_system_prompt.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
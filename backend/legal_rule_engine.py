@@ -0,0 +1,275 @@
+"""
+Compiled deterministic rule engine for LegalAI
+
+Checks are declarative documents stored in the legal_checks collection next
+to legal_rules (seeded from complete_legal_rules.DEFAULT_LEGAL_CHECKS):
+
+    {
+        'check_code': 'FDCPA_VALIDATION_REQUIRED',
+        'action_types': ['debt_validation'],          # '*' for every action
+        'when': {'field': 'context.creditor_name', 'op': 'falsy'},
+        'severity': 'low',
+        'explanation': 'Under FDCPA § 809, ...',
+        'citation': {'id': 'FDCPA_809', 'title': '...', 'text_snippet': '...'}
+    }
+
+Conditions read fields of {"state", "action_type", "context"} by dotted
+path and combine with {'all': [...]}, {'any': [...]} and {'not': {...}}.
+Every check is compiled into a Python predicate once, when the legal
+snapshot loads, so evaluating all applicable checks is a single pass of
+plain function calls.
+"""
+import re
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from schemas import LegalCitation, LegalFlag, Severity
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[Dict[str, Any], date], bool]
+
+_MISSING = object()
+
+ANY_ACTION = "*"
+
+
+def _getter(path: str) -> Callable[[Dict[str, Any]], Any]:
+    """Accessor for a dotted path; returns _MISSING when any segment is absent"""
+    parts = path.split(".")
+
+    def get(document: Dict[str, Any]) -> Any:
+        value = document
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                return _MISSING
+            value = value[part]
+        return value
+
+    return get
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value).date()
+        except ValueError:
+            return None
+    return None
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is _MISSING or value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def _compare(number_test: Callable[[float, float], bool]) -> Callable[[Any, Any, date], bool]:
+    def test(value: Any, expected: Any, today: date) -> bool:
+        number = _as_number(value)
+        return number is not None and number_test(number, float(expected))
+    return test
+
+
+def _days_since(number_test: Callable[[float, float], bool]) -> Callable[[Any, Any, date], bool]:
+    def test(value: Any, expected: Any, today: date) -> bool:
+        day = _as_date(value)
+        return day is not None and number_test((today - day).days, float(expected))
+    return test
+
+
+# op -> test(value, expected, today); value is _MISSING when the field is absent.
+# "matches" (case-insensitive regex) is handled in compile_condition.
+OPERATORS: Dict[str, Callable[[Any, Any, date], bool]] = {
+    "exists": lambda value, expected, today: value is not _MISSING and value is not None,
+    "missing": lambda value, expected, today: value is _MISSING or value is None,
+    "truthy": lambda value, expected, today: value is not _MISSING and bool(value),
+    "falsy": lambda value, expected, today: value is _MISSING or not value,
+    "eq": lambda value, expected, today: _lower(value) == _lower(expected),
+    "ne": lambda value, expected, today: _lower(value) != _lower(expected),
+    "in": lambda value, expected, today: _lower(value) in {_lower(item) for item in expected},
+    "not_in": lambda value, expected, today: _lower(value) not in {_lower(item) for item in expected},
+    "contains": lambda value, expected, today: isinstance(value, str) and str(expected).lower() in value.lower(),
+    "gt": _compare(lambda a, b: a > b),
+    "gte": _compare(lambda a, b: a >= b),
+    "lt": _compare(lambda a, b: a < b),
+    "lte": _compare(lambda a, b: a <= b),
+    "days_since_gt": _days_since(lambda a, b: a > b),
+    "days_since_lte": _days_since(lambda a, b: a <= b),
+}
+
+
+def compile_condition(condition: Dict[str, Any], fields: Set[str]) -> Predicate:
+    """
+    Compile a condition document into a predicate(document, today)
+
+    Args:
+        condition: Leaf {'field', 'op', 'value'} or {'all'|'any': [...]} / {'not': {...}};
+            an empty condition always matches
+        fields: Collects every field path the condition reads
+    """
+    if not condition:
+        return lambda document, today: True
+
+    if "all" in condition:
+        parts = [compile_condition(part, fields) for part in condition["all"]]
+        return lambda document, today: all(part(document, today) for part in parts)
+
+    if "any" in condition:
+        parts = [compile_condition(part, fields) for part in condition["any"]]
+        return lambda document, today: any(part(document, today) for part in parts)
+
+    if "not" in condition:
+        inner = compile_condition(condition["not"], fields)
+        return lambda document, today: not inner(document, today)
+
+    op = condition.get("op")
+    if "field" not in condition:
+        raise ValueError(f"Condition without field: {condition}")
+
+    path = condition["field"]
+    get = _getter(path)
+    expected = condition.get("value")
+
+    if op == "matches":
+        # Regex is compiled once here rather than per evaluation
+        pattern = re.compile(expected, re.IGNORECASE)
+        fields.add(path)
+        return lambda document, today: isinstance(get(document), str) and bool(pattern.search(get(document)))
+
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown operator: {op}")
+    if op in ("in", "not_in") and not isinstance(expected, (list, tuple, set)):
+        raise ValueError(f"'{op}' needs a list value: {condition}")
+
+    fields.add(path)
+    test = OPERATORS[op]
+    return lambda document, today: test(get(document), expected, today)
+
+
+class CompiledCheck:
+    """One DSL check with its predicate and output templates"""
+
+    def __init__(self, definition: Dict[str, Any]):
+        self.code = definition['check_code']
+        self.action_types = tuple(definition.get('action_types') or (ANY_ACTION,))
+        self.fields: Set[str] = set()
+        self.predicate = compile_condition(definition.get('when') or {}, self.fields)
+        self.severity = Severity(definition.get('severity', 'low'))
+        self.explanation = definition['explanation']
+        self.citation = definition.get('citation')
+
+    def flag(self) -> LegalFlag:
+        return LegalFlag(
+            code=self.code,
+            explanation=self.explanation,
+            severity=self.severity,
+            citation_id=self.citation['id'] if self.citation else None
+        )
+
+    def cite(self, db_version: str) -> Optional[LegalCitation]:
+        if not self.citation:
+            return None
+        return LegalCitation(
+            id=self.citation['id'],
+            title=self.citation['title'],
+            text_snippet=self.citation['text_snippet'],
+            db_version=db_version
+        )
+
+
+class RuleEngine:
+    """Evaluates every compiled check applicable to an action type"""
+
+    def __init__(self, definitions: Iterable[Dict[str, Any]]):
+        self.checks: List[CompiledCheck] = []
+        self.by_action: Dict[str, List[CompiledCheck]] = {}
+        self.errors: Dict[str, str] = {}
+
+        for definition in definitions:
+            try:
+                check = CompiledCheck(definition)
+            except Exception as e:
+                code = definition.get('check_code', '?')
+                self.errors[code] = str(e)
+                logger.error(f"Legal check {code} failed to compile: {e}")
+                continue
+            self.checks.append(check)
+            for action_type in check.action_types:
+                self.by_action.setdefault(action_type, []).append(check)
+
+    def applicable(self, action_type: str) -> List[CompiledCheck]:
+        """Checks for an action type, in definition order"""
+        specific = self.by_action.get(action_type, [])
+        generic = self.by_action.get(ANY_ACTION, [])
+        if not generic:
+            return specific
+        wanted = set(map(id, specific)) | set(map(id, generic))
+        return [check for check in self.checks if id(check) in wanted]
+
+    def covers(self, action_type: str) -> bool:
+        return bool(self.by_action.get(action_type))
+
+    def context_fields(self, action_type: str) -> Set[str]:
+        """Top-level context keys read by the checks for an action type"""
+        return {
+            path.split(".")[1] for check in self.applicable(action_type)
+            for path in check.fields if path.startswith("context.")
+        }
+
+    def residual_context(self, action_type: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Non-empty context fields no check reads - what is left for the LLM"""
+        understood = self.context_fields(action_type)
+        return {
+            key: value for key, value in (context or {}).items()
+            if key not in understood and value not in (None, "", [], {})
+        }
+
+    def evaluate(
+        self,
+        action_type: str,
+        state: str,
+        context: Dict[str, Any],
+        db_version: str,
+        today: Optional[date] = None
+    ) -> Tuple[List[LegalFlag], List[LegalCitation]]:
+        """
+        Run all applicable checks in one pass
+
+        Returns: (flags[], citations[]); a citation is listed once even when
+        several checks cite it
+        """
+        document = {"state": state, "action_type": action_type, "context": context or {}}
+        today = today or date.today()
+
+        flags: List[LegalFlag] = []
+        citations: List[LegalCitation] = []
+        cited = set()
+        for check in self.applicable(action_type):
+            if not check.predicate(document, today):
+                continue
+            flags.append(check.flag())
+            citation = check.cite(db_version)
+            if citation and citation.id not in cited:
+                cited.add(citation.id)
+                citations.append(citation)
+        return (flags, citations)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "checks": len(self.checks),
+            "action_types": sorted(self.by_action),
+            "compile_errors": self.errors
+        }
@@ -0,0 +1,178 @@
+"""
+Bulk seeding pipeline for legal rules, checks and SOL data
+Usage: python legal_seed.py [--dry-run]
+
+Each seed document carries a content_hash; rows whose hash is unchanged are
+skipped and the rest go to Mongo in one unordered bulk_write of upserts per
+collection. The legal knowledge version is bumped (and the local snapshot
+reloaded) once at the end, only when something changed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from pymongo import UpdateOne
+
+from canonical_json import payload_hash
+
+logger = logging.getLogger(__name__)
+
+# Bookkeeping fields excluded from the content hash
+SEED_META_FIELDS = ('content_hash', 'updated_at')
+
+
+def content_hash(doc: Dict[str, Any]) -> str:
+    """Hash of a seed document's content, ignoring bookkeeping fields"""
+    return payload_hash({key: value for key, value in doc.items() if key not in SEED_META_FIELDS})
+
+
+def _doc_key(doc: Dict[str, Any], key_fields: Sequence[str]) -> Tuple:
+    return tuple(doc.get(field) for field in key_fields)
+
+
+def _changed_fields(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {
+        field: {"old": old.get(field), "new": value}
+        for field, value in new.items()
+        if field not in SEED_META_FIELDS and old.get(field) != value
+    }
+
+
+async def bulk_upsert(collection, docs: Iterable[Dict[str, Any]], key_fields: Sequence[str], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Upsert seed documents, skipping unchanged ones
+
+    Args:
+        collection: Motor collection
+        docs: Seed documents (later duplicates of a key win)
+        key_fields: Fields identifying a document
+        dry_run: Only compute the diff report
+
+    Returns:
+        Diff report: inserted keys, updated keys with changed fields, unchanged count
+    """
+    desired: Dict[Tuple, Dict[str, Any]] = {}
+    for doc in docs:
+        desired[_doc_key(doc, key_fields)] = doc
+
+    projection = {'_id': 0}
+    existing = {
+        _doc_key(doc, key_fields): doc
+        for doc in await collection.find({}, projection).to_list(None)
+    }
+
+    now = datetime.now(timezone.utc)
+    operations = []
+    report = {"collection": collection.name, "inserted": [], "updated": {}, "unchanged": 0}
+    for key, doc in desired.items():
+        digest = content_hash(doc)
+        old = existing.get(key)
+        label = "/".join(str(part) for part in key)
+
+        if old is not None and (old.get('content_hash') or content_hash(old)) == digest:
+            report["unchanged"] += 1
+            continue
+
+        if old is None:
+            report["inserted"].append(label)
+        else:
+            report["updated"][label] = _changed_fields(old, doc)
+
+        operations.append(UpdateOne(
+            {field: doc.get(field) for field in key_fields},
+            {'$set': {**doc, 'content_hash': digest, 'updated_at': now}},
+            upsert=True
+        ))
+
+    if operations and not dry_run:
+        await collection.bulk_write(operations, ordered=False)
+
+    logger.info(
+        f"{'Planned' if dry_run else 'Seeded'} {collection.name}: {len(report['inserted'])} inserted, "
+        f"{len(report['updated'])} updated, {report['unchanged']} unchanged"
+    )
+    return report
+
+
+def sol_seed_documents() -> List[Dict[str, Any]]:
+    from database import SOL_SEED_DATA
+    return [
+        {
+            'state_code': state,
+            'debt_type': debt_type,
+            'years': years,
+            'notes': f"Statute of limitations for {debt_type} in {state}"
+        }
+        for state, debt_type, years in SOL_SEED_DATA
+    ]
+
+
+def has_changes(reports: Iterable[Dict[str, Any]]) -> bool:
+    return any(report["inserted"] or report["updated"] for report in reports)
+
+
+async def refresh_legal_caches(db) -> str:
+    """Publish a new knowledge version and reload this process's snapshot"""
+    from legal_knowledge import bump_legal_version, legal_knowledge
+    version = await bump_legal_version(db)
+    await legal_knowledge.load(db, version)
+    return version
+
+
+async def seed_legal_knowledge(db, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Seed SOL rows, the complete legal rulesets and deterministic checks
+
+    This is the single seeding path; the legacy seeders delegate here so the
+    stored content (and its hash) has one source of truth.
+    """
+    from complete_legal_rules import (
+        COMPLETE_FDCPA_RULES,
+        COMPLETE_FCRA_RULES,
+        COMPLETE_CROA_RULES,
+        DEFAULT_LEGAL_CHECKS
+    )
+
+    reports = [
+        await bulk_upsert(db.statute_of_limitations, sol_seed_documents(), ('state_code', 'debt_type'), dry_run),
+        await bulk_upsert(
+            db.legal_rules,
+            COMPLETE_FDCPA_RULES + COMPLETE_FCRA_RULES + COMPLETE_CROA_RULES,
+            ('rule_code',),
+            dry_run
+        ),
+        await bulk_upsert(db.legal_checks, DEFAULT_LEGAL_CHECKS, ('check_code',), dry_run),
+    ]
+
+    version = None
+    if has_changes(reports) and not dry_run:
+        version = await refresh_legal_caches(db)
+
+    return {"dry_run": dry_run, "version": version, "collections": reports}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Seed legal knowledge (rules, checks, SOL)")
+    parser.add_argument("--dry-run", action="store_true", help="Report the diff without writing")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from pathlib import Path
+    load_dotenv(Path(__file__).parent / '.env')
+
+    from database import init_databases, close_databases, get_mongo_db
+    await init_databases()
+    try:
+        report = await seed_legal_knowledge(get_mongo_db(), dry_run=args.dry_run)
+    finally:
+        await close_databases()
+
+    print(json.dumps(report, indent=2, default=str, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -1,22 +1,78 @@
-"""Deterministic math utilities for CFP-AI"""
+"""
+Deterministic math utilities for CFP-AI
+
+Money is computed in integer cents (see money.py) with one explicit
+rounding point per result. The original Decimal implementations are kept
+as _*_decimal fallbacks for inputs with sub-cent digits and for the few
+inputs where their 28-digit intermediate rounding decides the result;
+cfp_golden_vectors.json pins both paths to the original outputs.
+"""
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from math import gcd
 import hashlib
 import json
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from datetime import datetime
+
+import numpy as np
+
+from debt_simulator import nper, payoff_schedule
+from money import (
+    cents_to_decimal,
+    div_round,
+    div_round_array,
+    exact_cents,
+    exact_cents_array,
+    from_cents,
+    from_cents_array,
+    is_tie
+)
+
+# Safety limit of the savings schedule (entries for weeks 0..200)
+MAX_SAVINGS_ENTRIES = 201
+
+# Monte Carlo emergency-fund defaults
+RISK_PATHS = 10000
+RISK_HORIZON_WEEKS = 104
+RISK_PERCENTILES = (5, 25, 50, 75, 95)
+WEEKS_PER_MONTH = 52 / 12
+
+# Relative distance from a half-cent tie inside which the exact amortization
+# result defers to the Decimal path (whose powers carry ~1e-27 error)
+AMORTIZATION_TIE_TOLERANCE = 10 ** 15
+
+
+def _terminates(numerator: int, denominator: int) -> bool:
+    """True when numerator / denominator has a finite decimal expansion"""
+    denominator //= gcd(numerator, denominator) or 1
+    for factor in (2, 5):
+        while denominator % factor == 0:
+            denominator //= factor
+    return denominator == 1
 
 
 def calculate_monthly_surplus(income: float, expenses: float) -> Decimal:
     """Calculate monthly surplus"""
-    return Decimal(str(income)) - Decimal(str(expenses))
+    income_cents = exact_cents(income)
+    expenses_cents = exact_cents(expenses)
+    if income_cents is None or expenses_cents is None:
+        return Decimal(str(income)) - Decimal(str(expenses))
+    return cents_to_decimal(income_cents - expenses_cents)
 
 
-def calculate_amortization(principal: float, apr: float, months: int) -> Decimal:
-    """
-    Calculate monthly payment for amortizing loan
-    
-    Formula: M = P * [r(1+r)^n] / [(1+r)^n - 1]
-    """
+def monthly_surplus_array(incomes: Sequence[float], expenses: Sequence[float]) -> np.ndarray:
+    """Monthly surplus for many scenarios at once (float dollars)"""
+    income_cents, income_exact = exact_cents_array(incomes)
+    expenses_cents, expenses_exact = exact_cents_array(expenses)
+    surplus = from_cents_array(income_cents - expenses_cents)
+    for index in np.flatnonzero(~(income_exact & expenses_exact)):
+        surplus[index] = float(Decimal(str(float(incomes[index]))) - Decimal(str(float(expenses[index]))))
+    return surplus
+
+
+def _amortization_decimal(principal: float, apr: float, months: int) -> Decimal:
+    """Original Decimal amortization"""
     P = Decimal(str(principal))
     r = Decimal(str(apr)) / Decimal('12')  # Monthly rate
     n = Decimal(str(months))
@@ -31,80 +87,71 @@ def calculate_amortization(principal: float, apr: float, months: int) -> Decimal
     return monthly_payment.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
 
-def calculate_snowball_payoff(balances: List[Dict[str, Any]], monthly_surplus: float) -> List[Dict[str, Any]]:
+def calculate_amortization(principal: float, apr: float, months: int) -> Decimal:
     """
-    Snowball method: Pay minimum on all, extra on smallest balance
+    Calculate monthly payment for amortizing loan
     
-    Returns: List of payoff schedule entries
-    """
-    # Sort by balance (smallest first)
-    sorted_balances = sorted(balances, key=lambda x: x['balance'])
-    
-    schedule = []
-    surplus = Decimal(str(monthly_surplus))
-    current_date = datetime.now()
-    
-    for idx, balance in enumerate(sorted_balances):
-        payment = Decimal(str(balance.get('min_payment', balance['balance'] * 0.02)))
-        total_payment = payment + surplus
-        
-        # Calculate payment date (staggered by month)
-        payment_date = current_date + timedelta(days=idx * 30)
-        
-        schedule.append({
-            "account": balance['name'],
-            "payment": float(total_payment),
-            "balance": balance['balance'],
-            "date": payment_date.strftime('%Y-%m-%d')
-        })
-        
-        # After this debt is paid, all its payment goes to next
-        surplus = total_payment
+    Formula: M = P * [r(1+r)^n] / [(1+r)^n - 1]
     
-    return schedule
+    Evaluated as an exact integer ratio in cents and rounded once (half-up).
+    A zero APR returns the unrounded P / n, as it always has.
+    """
+    principal_cents = exact_cents(principal)
+    if apr == 0 or principal_cents is None or not isinstance(months, int) or months <= 0:
+        return _amortization_decimal(principal, apr, months)
+    
+    # r = rate_num / (12 * rate_den), so (1 + r)^n = growth^n / base^n
+    rate_num, rate_den = Decimal(str(apr)).as_integer_ratio()
+    base = 12 * rate_den
+    grown = (base + rate_num) ** months
+    scale = base ** months
+    numerator = principal_cents * rate_num * grown
+    denominator = base * (grown - scale)
+    if denominator == 0:
+        return _amortization_decimal(principal, apr, months)
+    
+    payment = div_round(numerator, denominator)
+    distance = abs(2 * (abs(numerator) % abs(denominator)) - abs(denominator))
+    if distance * AMORTIZATION_TIE_TOLERANCE < abs(denominator) * max(abs(payment), 1):
+        return _amortization_decimal(principal, apr, months)
+    return cents_to_decimal(payment)
 
 
-def calculate_avalanche_payoff(balances: List[Dict[str, Any]], monthly_surplus: float) -> List[Dict[str, Any]]:
+def calculate_nper(principal: float, apr: float, payment: float) -> float:
     """
-    Avalanche method: Pay minimum on all, extra on highest APR
+    Number of monthly payments that retire a loan - the inverse of
+    calculate_amortization (fractional; inf if the payment never covers interest)
+    """
+    return float(nper(principal, apr, payment))
+
+
+def calculate_snowball_payoff(balances: List[Dict[str, Any]], monthly_surplus: float) -> List[Dict[str, Any]]:
+    """
+    Snowball method: Pay minimum on all, extra on smallest balance
     
-    Returns: List of payoff schedule entries
-    """
-    # Sort by APR (highest first)
-    sorted_balances = sorted(balances, key=lambda x: x['apr'], reverse=True)
-    
-    schedule = []
-    surplus = Decimal(str(monthly_surplus))
-    current_date = datetime.now()
-    
-    for idx, balance in enumerate(sorted_balances):
-        payment = Decimal(str(balance.get('min_payment', balance['balance'] * 0.02)))
-        total_payment = payment + surplus
-        
-        # Calculate payment date (staggered by month)
-        payment_date = current_date + timedelta(days=idx * 30)
-        
-        schedule.append({
-            "account": balance['name'],
-            "payment": float(total_payment),
-            "balance": balance['balance'],
-            "apr": balance['apr'],
-            "date": payment_date.strftime('%Y-%m-%d')
-        })
-        
-        surplus = total_payment
+    Simulated month by month (see debt_simulator); freed minimums roll over
+    to the next debt.
     
+    Returns: List of payoff schedule entries (one per debt, with payoff date)
+    """
+    schedule = payoff_schedule(balances, monthly_surplus, "snowball")
+    for entry in schedule:
+        del entry["apr"]
     return schedule
 
 
-def generate_savings_schedule(goal_amount: float, deadline_days: int, monthly_surplus: float) -> List[Dict[str, str]]:
+def calculate_avalanche_payoff(balances: List[Dict[str, Any]], monthly_surplus: float) -> List[Dict[str, Any]]:
     """
-    Generate micro-savings schedule to reach goal
+    Avalanche method: Pay minimum on all, extra on highest APR
     
-    Returns: List of {date, amount} entries
+    Returns: List of payoff schedule entries (one per debt, with payoff date)
     """
+    return payoff_schedule(balances, monthly_surplus, "avalanche")
+
+
+def _savings_amounts_decimal(goal_amount: float, deadline_days: int) -> List[float]:
+    """Deposit amounts of the original Decimal savings loop"""
     goal = Decimal(str(goal_amount))
-    surplus = Decimal(str(monthly_surplus))
     
     # Calculate required savings per month
     months = Decimal(str(deadline_days)) / Decimal('30')
@@ -113,27 +160,213 @@ def generate_savings_schedule(goal_amount: float, deadline_days: int, monthly_su
     # Break into weekly micro-deposits
     weekly_savings = monthly_savings / Decimal('4')
     
-    schedule = []
-    current_date = datetime.now()
+    amounts = []
     total_saved = Decimal('0')
-    
-    week = 0
-    while total_saved < goal:
-        save_date = current_date + timedelta(weeks=week)
+    while total_saved < goal and len(amounts) < MAX_SAVINGS_ENTRIES:
         amount = min(weekly_savings, goal - total_saved)
-        
-        schedule.append({
-            "date": save_date.strftime('%Y-%m-%d'),
-            "amount": float(amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
-        })
-        
+        amounts.append(float(amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)))
         total_saved += amount
-        week += 1
-        
-        if week > 200:  # Safety limit
-            break
+    return amounts
+
+
+@lru_cache(maxsize=4096)
+def _savings_summary_decimal(goal_amount: float, deadline_days: int) -> Tuple[int, int, int]:
+    """(regular, count, final) in cents from the Decimal loop; grids repeat these"""
+    amounts = _savings_amounts_decimal(goal_amount, deadline_days)
+    if not amounts:
+        return (0, 0, 0)
+    return (round(amounts[0] * 100), len(amounts), round(amounts[-1] * 100))
+
+
+def _savings_plan_cents(goal_amount: float, deadline_days: int) -> Optional[Tuple[int, int, int]]:
+    """
+    (regular deposit cents, deposit count, final deposit cents) of a savings schedule
     
-    return schedule
+    The weekly deposit is goal * 30 / (4 * days); there are floor(2 * days / 15)
+    full deposits plus one for any remainder. Returns None where only the
+    Decimal loop gives the original answer: sub-cent goals, non-positive
+    deadlines, and inexact weekly amounts that land on a zero remainder or a
+    half-cent tie.
+    """
+    goal_cents = exact_cents(goal_amount)
+    if goal_cents is None or not isinstance(deadline_days, int) or deadline_days <= 0:
+        return None
+    if goal_cents <= 0:
+        return (0, 0, 0)
+    
+    weekly_num, weekly_den = goal_cents * 30, 4 * deadline_days
+    full = (2 * deadline_days) // 15
+    if full >= MAX_SAVINGS_ENTRIES:
+        weekly = div_round(weekly_num, weekly_den)
+        return (weekly, MAX_SAVINGS_ENTRIES, weekly)
+    remainder_num = goal_cents * (weekly_den - 30 * full)
+    
+    # The Decimal path divides by days / 30 first; it is exact only then
+    decimal_exact = deadline_days % 3 == 0 and _terminates(weekly_num, weekly_den)
+    if not decimal_exact and (
+        remainder_num == 0 or is_tie(weekly_num, weekly_den) or is_tie(remainder_num, weekly_den)
+    ):
+        return None
+    
+    weekly = div_round(weekly_num, weekly_den)
+    if remainder_num == 0:
+        return (weekly, full, weekly)
+    final = div_round(remainder_num, weekly_den)
+    return (weekly if full else final, full + 1, final)
+
+
+def generate_savings_schedule(goal_amount: float, deadline_days: int, monthly_surplus: float) -> List[Dict[str, str]]:
+    """
+    Generate micro-savings schedule to reach goal
+    
+    Returns: List of {date, amount} entries
+    """
+    plan = _savings_plan_cents(goal_amount, deadline_days)
+    if plan is None:
+        amounts = _savings_amounts_decimal(goal_amount, deadline_days)
+    else:
+        weekly, count, final = plan
+        amounts = [from_cents(weekly)] * (count - 1) + [from_cents(final)] if count else []
+    
+    dates = np.datetime64(datetime.now().date(), 'D') + 7 * np.arange(len(amounts))
+    return [
+        {"date": str(save_date), "amount": amount}
+        for save_date, amount in zip(dates, amounts)
+    ]
+
+
+def savings_plan_array(goal_amounts: Sequence[float], deadline_days: Sequence[int]) -> Dict[str, np.ndarray]:
+    """
+    Savings schedule summaries for many scenarios at once
+    
+    Returns: {"weekly": regular deposit, "final": last deposit} float dollar
+    arrays and a "deposits" count array, matching generate_savings_schedule
+    """
+    days = np.asarray(deadline_days, dtype=np.int64)
+    goal_cents, exact = exact_cents_array(goal_amounts)
+    positive = goal_cents > 0
+    valid = exact & (days > 0)
+    safe_days = np.where(valid, days, 1)
+    
+    weekly_num = goal_cents * 30
+    weekly_den = 4 * safe_days
+    full = np.minimum((2 * safe_days) // 15, MAX_SAVINGS_ENTRIES)
+    capped = full >= MAX_SAVINGS_ENTRIES
+    remainder_num = np.where(capped, 0, goal_cents * (weekly_den - 30 * full))
+    
+    weekly = div_round_array(weekly_num, weekly_den)
+    final = np.where(remainder_num == 0, weekly, div_round_array(remainder_num, weekly_den))
+    deposits = np.where(positive, full + ((remainder_num != 0) & ~capped), 0)
+    weekly = np.where(positive & (full > 0), weekly, final)
+    final = np.where(positive, final, 0)
+    
+    # Rows that need the exact-remainder / tie checks or the Decimal loop
+    reduced = weekly_den // np.maximum(np.gcd(weekly_num, weekly_den), 1)
+    for factor in (2, 5):
+        divisible = reduced % factor == 0
+        while divisible.any():
+            reduced = np.where(divisible, reduced // factor, reduced)
+            divisible = reduced % factor == 0
+    decimal_exact = (safe_days % 3 == 0) & (reduced == 1)
+    hazard = (remainder_num == 0) | (2 * (weekly_num % weekly_den) == weekly_den) | (2 * (remainder_num % weekly_den) == weekly_den)
+    for index in np.flatnonzero(~valid | (positive & ~capped & ~decimal_exact & hazard)):
+        goal_amount, deadline = float(goal_amounts[index]), int(days[index])
+        plan = _savings_plan_cents(goal_amount, deadline) or _savings_summary_decimal(goal_amount, deadline)
+        weekly[index], deposits[index], final[index] = plan
+    
+    return {
+        "weekly": from_cents_array(weekly),
+        "deposits": deposits,
+        "final": from_cents_array(final)
+    }
+
+
+def simulate_emergency_fund(
+    monthly_income: float,
+    monthly_expenses: float,
+    goal_amount: float,
+    deadline_days: int,
+    savings_share: float = 0.5,
+    starting_balance: float = 0.0,
+    income_volatility: float = 0.25,
+    expense_volatility: float = 0.10,
+    shocks_per_year: float = 2.0,
+    shock_amount: Optional[float] = None,
+    paths: int = RISK_PATHS,
+    horizon_weeks: int = RISK_HORIZON_WEEKS,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Monte Carlo projection of an emergency fund under volatile cash flow
+    
+    Each path draws weekly income (lognormal, coefficient of variation
+    income_volatility), weekly expenses (normal, expense_volatility) and
+    surprise expenses (a Poisson process with shocks_per_year on average,
+    exponentially sized with mean shock_amount, default half a month of
+    expenses). A savings_share of
+    every positive week goes into the fund; a negative week is paid out of
+    it, and the fund never drops below zero.
+    
+    Returns:
+        goal_probability (goal reached by deadline_days), median_weeks_to_goal,
+        expected_shortfall at the deadline, and per-week balance percentile
+        bands {"p5": [...], ...} for weeks 1..horizon
+    """
+    deadline_weeks = -(-deadline_days // 7)
+    horizon_weeks = max(horizon_weeks, deadline_weeks)
+    rng = np.random.default_rng(seed)
+    
+    income_mean = max(monthly_income, 0) / WEEKS_PER_MONTH
+    expense_mean = max(monthly_expenses, 0) / WEEKS_PER_MONTH
+    if shock_amount is None:
+        shock_amount = monthly_expenses * 0.5
+    
+    shape = (horizon_weeks, paths)
+    noise = rng.standard_normal((2,) + shape, dtype=np.float32)
+    
+    # Lognormal with the requested mean and coefficient of variation
+    sigma = np.float32(np.sqrt(np.log1p(income_volatility ** 2)))
+    income = np.float32(income_mean) * np.exp(sigma * noise[0] - sigma * sigma / 2)
+    expenses = np.maximum(np.float32(expense_mean) * (1 + np.float32(expense_volatility) * noise[1]), 0)
+    net = (income - expenses).ravel()
+    
+    # Surprise expenses as a Poisson process over all path-weeks
+    shock_count = rng.poisson(max(shocks_per_year, 0) / 52 * net.size)
+    if shock_count and shock_amount > 0:
+        cells = rng.integers(0, net.size, shock_count)
+        net -= np.bincount(cells, weights=rng.exponential(shock_amount, shock_count), minlength=net.size).astype(np.float32)
+    net = net.reshape(shape)
+    flow = np.where(net > 0, np.float32(savings_share) * net, net)
+    
+    balances = np.empty(shape, dtype=np.float32)
+    balance = np.full(paths, float(starting_balance))
+    first_hit = np.where(balance >= goal_amount, 0, -1)
+    for week in range(horizon_weeks):
+        balance = np.maximum(balance + flow[week], 0)
+        balances[week] = balance
+        first_hit[(first_hit < 0) & (balance >= goal_amount)] = week + 1
+    
+    reached = (first_hit >= 0) & (first_hit <= deadline_weeks)
+    at_deadline = balances[deadline_weeks - 1] if deadline_weeks > 0 else np.full(paths, float(starting_balance))
+    hit_weeks = first_hit[first_hit >= 0]
+    
+    # Linear-interpolated percentiles (numpy's default) from one sort per week
+    balances.sort(axis=1)
+    position = np.asarray(RISK_PERCENTILES) / 100 * (paths - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, paths - 1)
+    weight = position - lower
+    bands = (balances[:, lower] * (1 - weight) + balances[:, upper] * weight).T
+    
+    return {
+        "paths": paths,
+        "horizon_weeks": horizon_weeks,
+        "deadline_weeks": deadline_weeks,
+        "goal_probability": round(float(reached.mean()), 4),
+        "median_weeks_to_goal": float(np.median(hit_weeks)) if hit_weeks.size else None,
+        "expected_shortfall": round(float(np.maximum(goal_amount - at_deadline, 0).mean()), 2),
+        "bands": {f"p{q}": np.round(band, 2).tolist() for q, band in zip(RISK_PERCENTILES, bands)}
+    }
 
 
 def calculate_credit_utilization(balance: float, limit: float) -> Decimal:
@@ -143,8 +376,7 @@ def calculate_credit_utilization(balance: float, limit: float) -> Decimal:
     if limit == 0:
         return Decimal('0')
     
-    utilization = (Decimal(str(balance)) / Decimal(str(limit))) * Decimal('100')
-    return utilization.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return _percent(balance, limit)
 
 
 def generate_checksum(data: Dict[str, Any]) -> str:
@@ -165,5 +397,14 @@ def calculate_dti(monthly_debt_payments: float, gross_monthly_income: float) ->
     if gross_monthly_income == 0:
         return Decimal('999')  # Undefined, but flagged
     
-    dti = (Decimal(str(monthly_debt_payments)) / Decimal(str(gross_monthly_income))) * Decimal('100')
-    return dti.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return _percent(monthly_debt_payments, gross_monthly_income)
+
+
+def _percent(part: float, whole: float) -> Decimal:
+    """part / whole * 100, rounded half-up to 0.01"""
+    part_cents = exact_cents(part)
+    whole_cents = exact_cents(whole)
+    if part_cents is None or whole_cents is None:
+        ratio = (Decimal(str(part)) / Decimal(str(whole))) * Decimal('100')
+        return ratio.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return cents_to_decimal(div_round(part_cents * 10000, whole_cents))
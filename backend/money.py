@@ -0,0 +1,131 @@
+"""
+Fixed-point money core: amounts as integer cents
+
+Money is carried as int (or int64 arrays) of cents and every rounding point
+is explicit - a rational result is rounded once, with ROUND_HALF_UP (the CFP
+convention) or ROUND_HALF_EVEN (banker's). Conversion from floats goes
+through the float's shortest repr, exactly like Decimal(str(x)), so results
+match the original Decimal code paths.
+"""
+import math
+from decimal import Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+CENTS_PER_DOLLAR = 100
+
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN)
+
+
+def _check_rounding(rounding: str) -> None:
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unsupported rounding mode: {rounding}")
+
+
+def exact_cents(amount: Any) -> Optional[int]:
+    """Integer cents, or None when the amount has sub-cent digits"""
+    if isinstance(amount, float) and math.isfinite(amount):
+        cents = round(amount * CENTS_PER_DOLLAR)
+        if cents / CENTS_PER_DOLLAR == amount:
+            return cents
+    value = Decimal(str(amount)) * CENTS_PER_DOLLAR
+    if not value.is_finite() or value % 1 != 0:
+        return None
+    return int(value)
+
+
+def to_cents(amount: Any, rounding: str = ROUND_HALF_UP) -> int:
+    """Dollar amount (float, int, str or Decimal) to integer cents"""
+    _check_rounding(rounding)
+    cents = exact_cents(amount)
+    if cents is not None:
+        return cents
+    return int((Decimal(str(amount)) * CENTS_PER_DOLLAR).quantize(Decimal('1'), rounding=rounding))
+
+
+def from_cents(cents: int) -> float:
+    """Integer cents to the nearest float dollar amount"""
+    return cents / CENTS_PER_DOLLAR
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Integer cents to an exact two-place Decimal"""
+    return Decimal(cents).scaleb(-2)
+
+
+def div_round(numerator: int, denominator: int, rounding: str = ROUND_HALF_UP) -> int:
+    """
+    numerator / denominator rounded to an integer
+
+    ROUND_HALF_UP breaks ties away from zero (like Decimal), ROUND_HALF_EVEN
+    to the even neighbour.
+    """
+    _check_rounding(rounding)
+    if denominator == 0:
+        raise ZeroDivisionError("division by zero")
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+
+    quotient, remainder = divmod(abs(numerator), denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and (rounding == ROUND_HALF_UP or quotient % 2)):
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def is_tie(numerator: int, denominator: int) -> bool:
+    """True when numerator / denominator lies exactly halfway between integers"""
+    return 2 * (abs(numerator) % abs(denominator)) == abs(denominator)
+
+
+def exact_cents_array(amounts: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized exact_cents
+
+    Returns: (int64 cents, bool mask of amounts that are whole cents); cents
+    of the other amounts are the nearest cent and only approximate.
+    """
+    values = np.asarray(amounts, dtype=np.float64)
+    cents = np.rint(values * CENTS_PER_DOLLAR)
+    exact = np.isfinite(values) & (cents / CENTS_PER_DOLLAR == values)
+    return np.where(exact, cents, 0).astype(np.int64), exact
+
+
+def to_cents_array(amounts: Sequence[float], rounding: str = ROUND_HALF_UP) -> np.ndarray:
+    """
+    Dollar amounts to an int64 array of cents
+
+    Whole-cent values take the vectorized path; anything with sub-cent
+    digits is rounded exactly via to_cents.
+    """
+    _check_rounding(rounding)
+    values = np.asarray(amounts, dtype=np.float64)
+    cents, exact = exact_cents_array(values)
+    for index in np.flatnonzero(~exact):
+        cents[index] = to_cents(float(values[index]), rounding)
+    return cents
+
+
+def from_cents_array(cents: np.ndarray) -> np.ndarray:
+    """int64 cents to float64 dollars"""
+    return np.asarray(cents, dtype=np.int64) / CENTS_PER_DOLLAR
+
+
+def div_round_array(numerator: np.ndarray, denominator: np.ndarray, rounding: str = ROUND_HALF_UP) -> np.ndarray:
+    """Element-wise div_round over int64 arrays (denominators must be non-zero)"""
+    _check_rounding(rounding)
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.asarray(denominator, dtype=np.int64)
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    sign = np.where((numerator < 0) != (denominator < 0), -1, 1)
+    numerator = np.abs(numerator)
+    denominator = np.abs(denominator)
+
+    quotient, remainder = np.divmod(numerator, denominator)
+    twice = 2 * remainder
+    if rounding == ROUND_HALF_UP:
+        round_up = twice >= denominator
+    else:
+        round_up = (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    return sign * (quotient + round_up)
@@ -18,11 +18,22 @@ class Severity(str, Enum):
     HIGH = "high"
 
 
+class LegalCheckMode(str, Enum):
+    AUTO = "auto"
+    FULL = "full"
+    DETERMINISTIC = "deterministic"
+
+
 class ToneType(str, Enum):
     FORMAL = "formal"
     PLAIN = "plain"
 
 
+class PayoffStrategy(str, Enum):
+    SNOWBALL = "snowball"
+    AVALANCHE = "avalanche"
+
+
 # ============ ORCHESTRATOR SCHEMAS ============
 
 class OrchestratorRunInput(BaseModel):
@@ -59,6 +70,10 @@ class LegalCheckInput(BaseModel):
     action_type: str = Field(description="Type of action: debt_validation, settlement_offer, statute_check")
     context: Dict[str, Any] = Field(default_factory=dict)
     trace_id: str
+    mode: LegalCheckMode = Field(
+        default=LegalCheckMode.AUTO,
+        description="auto (LLM skipped for statute_check), full (rules + LLM), deterministic (rules only)"
+    )
 
 
 class LegalFlag(BaseModel):
@@ -83,12 +98,43 @@ class LegalCheckOutput(BaseModel):
     provenance_ref: Optional[str] = None
 
 
+class LegalBatchItem(BaseModel):
+    item_id: Optional[str] = None
+    state: str = Field(description="US state code, e.g., 'OH'")
+    debt_type: str = "credit_card"
+    account_date: Optional[str] = None
+    action_type: str = "statute_check"
+    context: Dict[str, Any] = Field(default_factory=dict)
+
+
+class LegalBatchCheckInput(BaseModel):
+    items: List[LegalBatchItem]
+    trace_id: str
+    mode: LegalCheckMode = LegalCheckMode.AUTO
+
+
+class LegalBatchItemResult(BaseModel):
+    index: int
+    item_id: Optional[str] = None
+    ok: bool
+    flags: List[LegalFlag] = Field(default_factory=list)
+    citations: List[LegalCitation] = Field(default_factory=list)
+    must_escalate: bool = False
+    degraded: bool = False  # Needed AI review but got none; deterministic results only
+
+
+class LegalBatchCheckOutput(BaseModel):
+    results: List[LegalBatchItemResult]
+    provenance_ref: Optional[str] = None
+
+
 # ============ CFP-AI SCHEMAS ============
 
 class BalanceInfo(BaseModel):
     name: str
     balance: float
     apr: float
+    min_payment: Optional[float] = None  # Defaults to 2% of balance
 
 
 class GoalInfo(BaseModel):
@@ -118,7 +164,9 @@ class SavingsScheduleEntry(BaseModel):
 class PaydownScheduleEntry(BaseModel):
     account: str
     payment: float
-    date: str
+    date: Optional[str] = None  # Payoff date; None if not paid off within the horizon
+    payoff_month: Optional[int] = None
+    interest_paid: Optional[float] = 0.0  # None if not paid off
 
 
 class CFPCalculations(BaseModel):
@@ -135,6 +183,78 @@ class CFPSimulateOutput(BaseModel):
     provenance_ref: Optional[str] = None
 
 
+class CFPSweepGrid(BaseModel):
+    debt_share: List[float] = Field(default_factory=lambda: [0.5], description="Fraction of surplus allocated to debt")
+    extra_payment: List[float] = Field(default_factory=lambda: [0.0], description="Monthly amount added to debt payments")
+    deadline_days: List[int] = Field(default_factory=list, description="Goal deadlines; defaults to the scenario goal's")
+
+
+class CFPSweepInput(BaseModel):
+    user_id: str
+    scenario: CFPScenario
+    grid: CFPSweepGrid = Field(default_factory=CFPSweepGrid)
+    strategy: PayoffStrategy = PayoffStrategy.SNOWBALL
+    trace_id: str
+
+
+class CFPSweepOutput(BaseModel):
+    ok: bool
+    monthly_surplus: float
+    points: int
+    columns: Dict[str, List[Any]]  # One list per column, one entry per grid point
+    checksum: str
+    assumptions: List[str] = Field(default_factory=list)
+    provenance_ref: Optional[str] = None
+
+
+class CFPRiskInput(BaseModel):
+    user_id: str
+    scenario: CFPScenario  # goal required
+    savings_share: float = Field(default=0.5, description="Fraction of each positive week saved")
+    starting_balance: float = 0.0
+    income_volatility: float = Field(default=0.25, description="Coefficient of variation of weekly income")
+    expense_volatility: float = Field(default=0.10, description="Coefficient of variation of weekly expenses")
+    shocks_per_year: float = 2.0
+    shock_amount: Optional[float] = None  # Mean surprise expense; defaults to half a month of expenses
+    paths: int = 10000
+    horizon_weeks: int = 104
+    seed: Optional[int] = None  # Defaults to a hash of the inputs
+    trace_id: str
+
+
+class CFPRiskOutput(BaseModel):
+    ok: bool
+    goal_probability: float
+    deadline_weeks: int
+    median_weeks_to_goal: Optional[float] = None
+    expected_shortfall: float
+    bands: Dict[str, List[float]]  # Balance percentiles per week, weeks 1..horizon
+    paths: int
+    horizon_weeks: int
+    seed: int
+    checksum: str
+    assumptions: List[str] = Field(default_factory=list)
+    provenance_ref: Optional[str] = None
+
+
+class CFPHorizonInput(BaseModel):
+    user_id: str
+    balances: List[BalanceInfo]
+    extra_payment: float = 0.0  # Added to every debt's minimum payment
+    trace_id: str
+
+
+class CFPHorizonOutput(BaseModel):
+    ok: bool
+    columns: Dict[str, List[Any]]  # One entry per debt, in request order
+    debt_free_months: Optional[int] = None
+    debt_free_date: Optional[str] = None
+    total_interest: Optional[float] = None  # None unless every debt is paid off
+    checksum: str
+    assumptions: List[str] = Field(default_factory=list)
+    provenance_ref: Optional[str] = None
+
+
 class CFPVerifyInput(BaseModel):
     calculations: Dict[str, Any]
     expected_checksum: str
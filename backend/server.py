@@ -35,6 +35,22 @@ async def lifespan(app: FastAPI):
     await init_databases()
     logger.info("All databases connected")
     
+    # Train local intent classifier from logged LLM intents
+    from database import get_mongo_db
+    from intent_classifier import load_intent_classifier
+    try:
+        await load_intent_classifier(get_mongo_db())
+    except Exception as e:
+        logger.warning(f"Intent classifier training skipped: {e}")
+    
+    # Load legal rules/SOL snapshot and watch its version key
+    from legal_knowledge import legal_knowledge
+    try:
+        await legal_knowledge.load(get_mongo_db())
+    except Exception as e:
+        logger.warning(f"Legal KB preload skipped: {e}")
+    legal_knowledge.start_refresh_loop(get_mongo_db)
+    
     # Initialize event bus
     from event_bus import event_bus, register_event_handlers
     register_event_handlers()
@@ -50,6 +66,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down EEFai platform...")
+    await legal_knowledge.stop_refresh_loop()
     await close_databases()
     logger.info("All databases closed")
 
@@ -0,0 +1,111 @@
+"""
+Statute of limitations matrix and vectorized expiry arithmetic
+
+SOL years are held in a dense state x debt_type matrix so lookups for a
+whole portfolio are a single array gather, and expiry dates / days remaining
+are computed with datetime64 arithmetic instead of per-account timedeltas.
+A missing entry is reported as unknown (-1) rather than silently assumed.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Marker for a state/debt type pair with no SOL on file
+UNKNOWN_SOL = -1
+
+# SOL periods are counted as years * 365 days (the original LegalAI rule)
+DAYS_PER_SOL_YEAR = 365
+
+
+class SOLMatrix:
+    """Dense state x debt_type table of SOL years"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, int]]):
+        entries = [(state.upper(), debt_type.lower(), int(years)) for state, debt_type, years in entries]
+        self.states: List[str] = sorted({state for state, _, _ in entries})
+        self.debt_types: List[str] = sorted({debt_type for _, debt_type, _ in entries})
+        self.state_index: Dict[str, int] = {state: i for i, state in enumerate(self.states)}
+        self.debt_type_index: Dict[str, int] = {debt_type: j for j, debt_type in enumerate(self.debt_types)}
+
+        self.years = np.full((len(self.states), len(self.debt_types)), UNKNOWN_SOL, dtype=np.int16)
+        for state, debt_type, years in entries:
+            self.years[self.state_index[state], self.debt_type_index[debt_type]] = years
+        self.years.setflags(write=False)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "SOLMatrix":
+        """Build from statute_of_limitations documents"""
+        return cls((row['state_code'], row['debt_type'], row['years']) for row in rows)
+
+    def lookup(self, state: str, debt_type: str) -> Optional[int]:
+        """SOL years for one pair, or None when not on file"""
+        years = self.lookup_many([state], [debt_type])[0]
+        return None if years == UNKNOWN_SOL else int(years)
+
+    def lookup_many(self, states: Sequence[str], debt_types: Sequence[str]) -> np.ndarray:
+        """SOL years per (state, debt_type) pair; UNKNOWN_SOL where not on file"""
+        rows = np.array([self.state_index.get(state.upper(), -1) for state in states], dtype=np.int64)
+        cols = np.array([self.debt_type_index.get(debt_type.lower(), -1) for debt_type in debt_types], dtype=np.int64)
+        known = (rows >= 0) & (cols >= 0)
+        years = np.full(len(rows), UNKNOWN_SOL, dtype=np.int64)
+        years[known] = self.years[rows[known], cols[known]]
+        return years
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "states": len(self.states),
+            "debt_types": self.debt_types,
+            "entries": int((self.years != UNKNOWN_SOL).sum())
+        }
+
+
+def parse_account_dates(values: Sequence[Optional[str]]) -> np.ndarray:
+    """ISO date strings to datetime64[D]; NaT where missing or unparseable"""
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(datetime.fromisoformat(value).date() if value else None)
+        except (TypeError, ValueError):
+            parsed.append(None)
+    return np.array([np.datetime64('NaT') if d is None else d for d in parsed], dtype='datetime64[D]')
+
+
+def compute_expiry(account_dates: np.ndarray, years: np.ndarray, today: Optional[date] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expiry dates and days remaining for arrays of accounts
+
+    Args:
+        account_dates: datetime64[D] array (NaT for unknown dates)
+        years: SOL years per account (UNKNOWN_SOL where not on file)
+        today: Reference date (defaults to the local date)
+
+    Returns:
+        (expiry datetime64[D], days_remaining int64); expiry is NaT and
+        days_remaining is 0 where the date or SOL is unknown. Accounts are
+        expired where days_remaining <= 0 and expiry is not NaT.
+    """
+    account_dates = np.asarray(account_dates, dtype='datetime64[D]')
+    years = np.asarray(years, dtype=np.int64)
+    reference = np.datetime64(today or datetime.now().date(), 'D')
+
+    valid = ~np.isnat(account_dates) & (years != UNKNOWN_SOL)
+    expiry = np.full(account_dates.shape, np.datetime64('NaT'), dtype='datetime64[D]')
+    expiry[valid] = account_dates[valid] + (years[valid] * DAYS_PER_SOL_YEAR).astype('timedelta64[D]')
+
+    days_remaining = np.zeros(account_dates.shape, dtype=np.int64)
+    days_remaining[valid] = (expiry[valid] - reference).astype(np.int64)
+    return expiry, days_remaining
+
+
+def expired_mask(expiry: np.ndarray, days_remaining: np.ndarray) -> np.ndarray:
+    """Accounts whose SOL has run out"""
+    return ~np.isnat(expiry) & (days_remaining <= 0)
+
+
+@lru_cache(maxsize=1)
+def seed_sol_matrix() -> SOLMatrix:
+    """Matrix over database.SOL_SEED_DATA, used before the DB is seeded"""
+    from database import SOL_SEED_DATA
+    return SOLMatrix(SOL_SEED_DATA)
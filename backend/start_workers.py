@@ -4,6 +4,7 @@ Usage: python start_workers.py
 """
 import asyncio
 import logging
+import os
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -11,11 +12,15 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-from job_queue import job_queue, register_all_workers
+from job_queue import ai_worker_concurrency, job_queue, register_all_workers
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# AI queue micro-batching; concurrency defaults to (and is capped at) the background admission limit
+AI_WORKER_BATCH_SIZE = int(os.environ.get('AI_WORKER_BATCH_SIZE', '16'))
+AI_WORKER_CONCURRENCY = int(os.environ['AI_WORKER_CONCURRENCY']) if os.environ.get('AI_WORKER_CONCURRENCY') else None
+
 
 async def main():
     """Start all worker processes"""
@@ -28,7 +33,7 @@ async def main():
     register_all_workers()
     
     # Start workers for each queue
-    queues = ['ocr', 'pdf', 'email', 'ai']
+    queues = ['ocr', 'pdf', 'email']
     
     tasks = []
     for queue_name in queues:
@@ -36,6 +41,12 @@ async def main():
         tasks.append(task)
         logger.info(f"Worker spawned for {queue_name} queue")
     
+    # AI jobs are I/O bound - pull them in batches and run concurrently
+    tasks.append(asyncio.create_task(
+        job_queue.start_batch_worker('ai', AI_WORKER_BATCH_SIZE, ai_worker_concurrency(AI_WORKER_CONCURRENCY))
+    ))
+    logger.info("Batch worker spawned for ai queue")
+    
     logger.info(f"All {len(tasks)} workers running. Press Ctrl+C to stop.")
     
     # Run forever
@@ -0,0 +1,381 @@
+"""Behaviour tests for AIProvider and its call-path helpers, against a fake LlmChat"""
+import asyncio
+
+import pytest
+
+import ai_utils
+from ai_utils import AIProvider
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_each_call_gets_a_fresh_client(fake_llm):
+    """No LlmChat is shared between calls, so no caller sees another's history"""
+    provider = AIProvider(temperature=0.7, hedge=False)
+
+    async def scenario():
+        await provider.generate("sys", "first user's secret", session_id="alice")
+        return await provider.generate("sys", "hello", session_id="bob")
+
+    assert run(scenario()) == "openai: hello"
+
+    assert len(fake_llm.chats) == 2
+    (_, first_session, _, first_history), (_, second_session, _, second_history) = fake_llm.calls
+    assert (first_session, second_session) == ("alice", "bob")
+    assert first_history == second_history == 1  # just the system message
+
+
+def test_identical_concurrent_calls_share_one_upstream_call(fake_llm):
+    """Deterministic prompts in flight are coalesced; followers are counted as such"""
+    fake_llm.delays["openai"] = 0.05
+    provider = AIProvider(temperature=0.0, hedge=False)
+
+    async def scenario():
+        return await asyncio.gather(*(provider.generate("sys", "same", caller="test") for _ in range(5)))
+
+    assert run(scenario()) == ["openai: same"] * 5
+    assert len(fake_llm.calls) == 1
+    assert ai_utils.inflight_calls.snapshot() == {"leaders": 1, "followers": 4, "in_flight": 0}
+    assert ai_utils.llm_metrics.snapshot()["callers"]["test"][f"coalesced/{ai_utils.OPENAI_MODEL[1]}"]["calls"] == 4
+
+
+def test_interactive_call_does_not_join_a_background_flight(fake_llm):
+    """An interactive caller is not queued behind a background leader waiting for admission"""
+    fake_llm.delays["openai"] = 0.05
+    background_limit = ai_utils.admission_controller.class_limits["background"]
+    provider = AIProvider(temperature=0.0, hedge=False)
+
+    async def scenario():
+        # Fill the background class so the background leader has to queue
+        busy = [
+            asyncio.create_task(provider.generate("sys", f"busy {n}", priority="background"))
+            for n in range(background_limit)
+        ]
+        await asyncio.sleep(0)
+        leader = asyncio.create_task(provider.generate("sys", "same", priority="background"))
+        await asyncio.sleep(0)
+        interactive = await provider.generate("sys", "same", priority="interactive")
+        finished_first = not leader.done()
+        await asyncio.gather(leader, *busy)
+        return interactive, finished_first
+
+    interactive, finished_first = run(scenario())
+
+    assert interactive == "openai: same"
+    assert finished_first
+    assert ai_utils.inflight_calls.snapshot()["followers"] == 0
+
+
+def test_deterministic_response_is_cached_until_ttl_expires(fake_llm):
+    provider = AIProvider(temperature=0.0, hedge=False)
+
+    async def scenario():
+        first = await provider.generate("sys", "q", cache_ttl=0.1)
+        cached = await provider.generate("sys", "q", cache_ttl=0.1)
+        calls_while_fresh = len(fake_llm.calls)
+        await asyncio.sleep(0.15)
+        await provider.generate("sys", "q", cache_ttl=0.1)
+        return first, cached, calls_while_fresh
+
+    first, cached, calls_while_fresh = run(scenario())
+
+    assert first == cached == "openai: q"
+    assert calls_while_fresh == 1
+    assert len(fake_llm.calls) == 2
+    stats = ai_utils.response_cache.get_stats()
+    assert (stats["memory_hits"], stats["misses"], stats["sets"]) == (1, 2, 2)
+
+
+def test_fallback_answer_is_not_cached(fake_llm, fake_redis):
+    """A degraded answer is returned once, in neither tier; the next call tries the primary again"""
+    fake_llm.failures["openai"] = RuntimeError("upstream 500")
+    provider = AIProvider(temperature=0.0, hedge=False)
+
+    async def scenario():
+        degraded = await provider.generate("sys", "q", cache_ttl=60)
+        stored_after_fallback = dict(fake_redis.values)
+        del fake_llm.failures["openai"]
+        fresh = await provider.generate("sys", "q", cache_ttl=60)
+        cached = await provider.generate("sys", "q", cache_ttl=60)
+        return degraded, stored_after_fallback, fresh, cached
+
+    degraded, stored_after_fallback, fresh, cached = run(scenario())
+
+    assert degraded == "anthropic: q"
+    assert stored_after_fallback == {}
+    assert fresh == cached == "openai: q"
+    assert [call[0] for call in fake_llm.calls] == ["openai", "anthropic", "openai"]
+    assert ai_utils.response_cache.get_stats()["sets"] == 1
+    assert len(fake_redis.values) == 1
+
+
+def test_source_is_returned_per_call_on_a_shared_provider(fake_llm):
+    """Concurrent calls on one instance each learn who answered them"""
+    fake_llm.failures["openai"] = RuntimeError("upstream 500")
+    fake_llm.delays["anthropic"] = 0.02
+    provider = AIProvider(temperature=0.0, hedge=False)
+
+    async def scenario():
+        await ai_utils.response_cache.set(ai_utils.ResponseCache.make_key(
+            ai_utils.OPENAI_MODEL[1], 0.0, "sys", "cached"
+        ), "openai: cached", 60)
+        return await asyncio.gather(
+            provider.generate_with_source("sys", "fresh", cache_ttl=60),
+            provider.generate_with_source("sys", "cached", cache_ttl=60)
+        )
+
+    assert run(scenario()) == [("anthropic: fresh", "anthropic"), ("openai: cached", "cache")]
+
+
+def test_redis_tier_serves_other_processes_and_uncached_calls_skip_it(fake_llm, fake_redis):
+    """A fresh memory tier falls back to Redis; temperature > 0 or no TTL is never cached"""
+    provider = AIProvider(temperature=0.0, hedge=False)
+
+    async def scenario():
+        await provider.generate("sys", "q", cache_ttl=60)
+        ai_utils.response_cache.clear()  # as if another process
+        from_redis = await provider.generate("sys", "q", cache_ttl=60)
+        await provider.generate("sys", "q")
+        await AIProvider(temperature=0.7, hedge=False).generate("sys", "q", cache_ttl=60)
+        return from_redis
+
+    assert run(scenario()) == "openai: q"
+    assert ai_utils.response_cache.get_stats()["redis_hits"] == 1
+    assert len(fake_llm.calls) == 3
+
+
+def test_hedge_delay_uses_primary_percentile_within_budget(fake_llm, monkeypatch):
+    monkeypatch.setattr(ai_utils, "AI_HEDGE_MIN_DELAY", 0.01)
+    histogram = ai_utils.latency_histograms["openai"]
+
+    assert ai_utils.hedge_delay("openai") == ai_utils.AI_HEDGE_MAX_DELAY  # too few samples
+    for n in range(1, 101):
+        histogram.record(n / 1000)
+    assert ai_utils.hedge_delay("openai") == 0.095
+    histogram.record(60.0)
+    assert ai_utils.hedge_delay("openai") <= ai_utils.AI_HEDGE_MAX_DELAY
+
+
+def test_hedge_fires_after_percentile_delay_and_fallback_wins(fake_llm, monkeypatch):
+    """A slow primary is raced by Claude once the p95 delay passes; the loser is cancelled"""
+    monkeypatch.setattr(ai_utils, "AI_HEDGE_MIN_DELAY", 0.01)
+    for _ in range(ai_utils.AI_HEDGE_MIN_SAMPLES):
+        ai_utils.latency_histograms["openai"].record(0.05)
+    fake_llm.delays["openai"] = 5.0
+    provider = AIProvider(temperature=0.7, hedge=True)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        response = await provider.generate("sys", "q", caller="test")
+        return response, loop.time() - start
+
+    response, elapsed = run(scenario())
+
+    assert response == "anthropic: q"
+    assert 0.05 <= elapsed < 1.0
+    assert [call[0] for call in fake_llm.calls] == ["openai", "anthropic"]
+    assert fake_llm.active == 0  # the primary was cancelled
+    # The cancelled primary still records its elapsed time as a lower bound
+    assert max(ai_utils.latency_histograms["openai"].samples) >= 0.05
+    series = ai_utils.llm_metrics.snapshot()["callers"]["test"][f"anthropic/{ai_utils.CLAUDE_MODEL[1]}"]
+    assert series["fallbacks"] == 1
+
+
+def test_primary_answering_before_the_hedge_delay_is_not_hedged(fake_llm):
+    provider = AIProvider(temperature=0.7, hedge=True)
+
+    assert run(provider.generate("sys", "q")) == "openai: q"
+    assert [call[0] for call in fake_llm.calls] == ["openai"]
+
+
+def test_breaker_opens_on_failure_rate_then_half_opens_for_one_probe():
+    breaker = ai_utils.CircuitBreaker("test", window_seconds=60, failure_rate=0.5, min_calls=4, open_seconds=0.05)
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == breaker.CLOSED  # below min_calls
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow_request()
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.is_available()
+    assert breaker.allow_request()
+    assert breaker.state == breaker.HALF_OPEN
+    assert not breaker.allow_request()  # single probe
+
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+
+
+def test_open_primary_circuit_routes_calls_to_fallback(fake_llm, monkeypatch):
+    """Repeated OpenAI failures open its circuit; later calls go straight to Claude"""
+    providers = ("openai", "anthropic")
+    monkeypatch.setattr(ai_utils, "circuit_breakers", {
+        name: ai_utils.CircuitBreaker(name, min_calls=2, open_seconds=60) for name in providers
+    })
+    fake_llm.failures["openai"] = RuntimeError("upstream 500")
+    provider = AIProvider(temperature=0.7, hedge=False)
+
+    async def scenario():
+        return [await provider.generate("sys", f"q{n}") for n in range(4)]
+
+    assert run(scenario()) == [f"anthropic: q{n}" for n in range(4)]
+    assert [call[0] for call in fake_llm.calls] == ["openai", "anthropic", "openai", "anthropic", "anthropic", "anthropic"]
+    health = ai_utils.get_provider_health()
+    assert health["openai"]["state"] == "open"
+    assert health["anthropic"]["state"] == "closed"
+
+
+def _limits(limit):
+    return {name: limit for name in ai_utils.PRIORITY_CLASSES}
+
+
+def test_admission_sheds_call_whose_deadline_passes_while_queued(fake_llm):
+    controller = ai_utils.AdmissionController(max_concurrency=1, class_limits=_limits(1))
+
+    async def scenario():
+        now = ai_utils.time.monotonic
+        await controller.acquire("interactive", now() + 1)
+        try:
+            await controller.acquire("background", now() + 0.05)
+        except ai_utils.AIOverloadedError as error:
+            return error
+        finally:
+            controller.release("interactive")
+
+    error = run(scenario())
+
+    assert isinstance(error, ai_utils.AIOverloadedError)
+    assert controller.snapshot()["shed"] == 1
+    assert controller.snapshot()["active"]["interactive"] == 0
+
+
+def test_admission_sheds_up_front_when_estimated_wait_exceeds_deadline(fake_llm):
+    """With 10 s calls and a busy slot, a 1 s deadline is rejected without queueing"""
+    for _ in range(10):
+        ai_utils.latency_histograms["openai"].record(10.0)
+    controller = ai_utils.AdmissionController(max_concurrency=1, class_limits=_limits(1))
+
+    async def scenario():
+        now = ai_utils.time.monotonic
+        await controller.acquire("legal", now() + 30)
+        try:
+            await controller.acquire("legal", now() + 1)
+        except ai_utils.AIOverloadedError:
+            return controller.snapshot()
+
+    snapshot = run(scenario())
+    assert (snapshot["shed"], snapshot["queued"]) == (1, 0)
+
+
+def test_admission_serves_higher_priority_waiters_first(fake_llm):
+    controller = ai_utils.AdmissionController(max_concurrency=1, class_limits=_limits(1))
+    order = []
+
+    async def waiter(priority):
+        async with controller.slot(priority, ai_utils.time.monotonic() + 5):
+            order.append(priority)
+
+    async def scenario():
+        await controller.acquire("legal", ai_utils.time.monotonic() + 5)
+        waiters = [asyncio.create_task(waiter(p)) for p in ("background", "legal", "interactive")]
+        await asyncio.sleep(0.01)
+        controller.release("legal")
+        await asyncio.gather(*waiters)
+
+    run(scenario())
+    assert order == ["interactive", "legal", "background"]
+
+
+def test_token_bucket_raises_when_refill_would_miss_deadline():
+    bucket = ai_utils.TokenBucket(rate=1, capacity=1)
+
+    async def scenario():
+        await bucket.acquire()
+        try:
+            await bucket.acquire(ai_utils.time.monotonic() + 0.1)
+        except ai_utils.AIOverloadedError:
+            return True
+
+    assert run(scenario())
+
+
+def test_generate_surfaces_overload_when_class_is_saturated(fake_llm, monkeypatch):
+    monkeypatch.setattr(ai_utils, "admission_controller", ai_utils.AdmissionController(1, _limits(1)))
+    fake_llm.delays["openai"] = 0.2
+    provider = AIProvider(temperature=0.7, hedge=False)
+
+    async def scenario():
+        busy = asyncio.create_task(provider.generate("sys", "slow"))
+        await asyncio.sleep(0.01)
+        try:
+            await provider.generate("sys", "q", deadline=0.05, caller="test")
+        except ai_utils.AIOverloadedError:
+            return await busy
+
+    assert run(scenario()) == "openai: slow"
+    errors = ai_utils.llm_metrics.snapshot()["callers"]["test"]["none/none"]["errors"]
+    assert errors == {"AIOverloadedError": 1}
+
+
+def test_metrics_count_calls_sizes_cost_and_cache_hits_per_caller(fake_llm):
+    provider = AIProvider(temperature=0.0, hedge=False)
+    system, user = "s" * 400, "u" * 400  # 200 prompt tokens per call
+
+    async def scenario():
+        await provider.generate(system, user, cache_ttl=60, caller="EEFai")
+        await provider.generate(system, user, cache_ttl=60, caller="EEFai")
+        await provider.generate(system, "other", caller="LegalAI")
+
+    run(scenario())
+    callers = ai_utils.llm_metrics.snapshot()["callers"]
+    openai_key = f"openai/{ai_utils.OPENAI_MODEL[1]}"
+
+    upstream = callers["EEFai"][openai_key]
+    assert (upstream["calls"], upstream["fallbacks"], upstream["errors"]) == (1, 0, {})
+    assert upstream["prompt_tokens_est"] == 200
+    assert upstream["response_tokens_est"] == len(f"openai: {user}") // ai_utils.CHARS_PER_TOKEN
+    input_price, output_price = ai_utils.MODEL_COST_PER_1M_TOKENS[ai_utils.OPENAI_MODEL[1]]
+    assert upstream["cost_usd_est"] == round((200 * input_price + upstream["response_tokens_est"] * output_price) / 1e6, 4)
+    assert upstream["latency"]["count"] == 1
+
+    cached = callers["EEFai"][f"cache/{ai_utils.OPENAI_MODEL[1]}"]
+    assert (cached["calls"], cached["cost_usd_est"]) == (1, 0.0)
+    assert callers["LegalAI"][openai_key]["calls"] == 1
+
+
+def test_cassette_records_then_replays_without_upstream_calls(fake_llm, monkeypatch, tmp_path):
+    provider = AIProvider(temperature=0.0, hedge=False)
+    monkeypatch.setattr(ai_utils, "cassette", ai_utils.Cassette("record", str(tmp_path)))
+    assert run(provider.generate("sys", "q")) == "openai: q"
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    replay = ai_utils.Cassette("replay", str(tmp_path), latency_spec="fixed:0.01")
+    monkeypatch.setattr(ai_utils, "cassette", replay)
+    monkeypatch.setattr(ai_utils, "inflight_calls", ai_utils.SingleFlight())
+    assert run(provider.generate("sys", "q")) == "openai: q"
+    assert len(fake_llm.calls) == 1
+    assert replay.snapshot()["replayed"] == 1
+
+    # Both providers miss the cassette; the miss is reported, not sent upstream
+    with pytest.raises(Exception, match="No cassette recording"):
+        run(provider.generate("sys", "never recorded"))
+    assert replay.snapshot()["misses"] == 2
+    assert len(fake_llm.calls) == 1
+
+
+def test_cassette_latency_specs():
+    cassette = ai_utils.Cassette("off", latency_spec="uniform:0.1,0.2", seed=1)
+
+    assert 0.1 <= cassette.sample_latency(5.0) <= 0.2
+    assert ai_utils.Cassette("off", latency_spec="recorded").sample_latency(0.3) == 0.3
+    assert ai_utils.Cassette("off", latency_spec="none").sample_latency(0.3) == 0.0
@@ -0,0 +1,157 @@
+"""Unit tests for the month-by-month debt payoff simulator"""
+from datetime import date
+
+import numpy as np
+
+from debt_simulator import (
+    NOT_PAID_OFF,
+    add_months,
+    nper,
+    payoff_horizon,
+    payoff_schedule,
+    simulate_payoff,
+    simulate_payoff_grid
+)
+
+
+def test_single_debt_interest_and_payoff():
+    """$1000 at 12% APR with $100/month: 1% interest per month, paid off in month 11"""
+    simulation = simulate_payoff([{"name": "Card", "balance": 1000, "apr": 0.12, "min_payment": 100}], 0)
+
+    assert simulation.interest[0, 0] == 1000  # cents: 1% of $1000
+    assert simulation.interest[1, 0] == 910   # 1% of $910, rounded half-up
+    assert int(simulation.payoff_month[0]) == 11
+    assert simulation.payments.sum() == 100000 + simulation.total_interest_cents()
+
+
+def test_freed_minimum_rolls_over_to_next_debt():
+    """Once the small debt is gone its minimum keeps paying the large one"""
+    balances = [
+        {"name": "Big", "balance": 1000, "apr": 0, "min_payment": 50},
+        {"name": "Small", "balance": 100, "apr": 0, "min_payment": 50},
+    ]
+    simulation = simulate_payoff(balances, 50, "snowball")
+
+    assert simulation.names == ["Small", "Big"]
+    # Month 1: Small gets 50 + 50 extra and is paid off; Big gets its 50
+    assert list(simulation.payments[0]) == [10000, 5000]
+    # Budget stays 150/month: 950 left on Big -> 7 more months
+    assert list(simulation.payoff_month) == [1, 8]
+    assert simulation.payments.sum() == 110000
+
+
+def test_avalanche_targets_highest_apr_and_saves_interest():
+    balances = [
+        {"name": "Low", "balance": 500, "apr": 0.05},
+        {"name": "High", "balance": 3000, "apr": 0.29},
+    ]
+    snowball = simulate_payoff(balances, 200, "snowball")
+    avalanche = simulate_payoff(balances, 200, "avalanche")
+
+    assert avalanche.names == ["High", "Low"]
+    assert avalanche.paid_off and snowball.paid_off
+    assert avalanche.total_interest_cents() < snowball.total_interest_cents()
+
+
+def test_unpayable_debt_reports_no_payoff():
+    """Minimum below the monthly interest never converges"""
+    schedule = payoff_schedule([{"name": "Card", "balance": 10000, "apr": 0.3, "min_payment": 10}], 0, "snowball")
+
+    assert schedule[0]["payoff_month"] is None
+    assert schedule[0]["date"] is None
+
+
+def test_schedule_uses_calendar_months():
+    schedule = payoff_schedule(
+        [{"name": "Card", "balance": 300, "apr": 0, "min_payment": 100}], 0, "avalanche", start=date(2024, 1, 31)
+    )
+
+    assert schedule[0]["payoff_month"] == 3
+    assert schedule[0]["date"] == "2024-04-30"
+    assert add_months(date(2024, 1, 31), 1) == date(2024, 2, 29)
+
+
+def test_grid_matches_individual_simulations():
+    """Each extra-payment level in the grid equals its own simulation"""
+    balances = [
+        {"name": "Card", "balance": 4200, "apr": 0.2299},
+        {"name": "Store", "balance": 650, "apr": 0.1899},
+        {"name": "Paid", "balance": 0, "apr": 0.1},
+    ]
+    levels = [0, 75.5, 250, 250.0, 1200]
+    grid = simulate_payoff_grid(balances, levels, "avalanche")
+
+    for index, extra in enumerate(levels):
+        simulation = simulate_payoff(balances, extra, "avalanche")
+        assert simulation.paid_off
+        assert grid["months"][index] == simulation.payoff_month.max() == simulation.months
+        assert grid["total_interest"][index] == simulation.total_interest_cents()
+
+
+def test_schedule_and_grid_match_month_loop_for_random_single_debts():
+    """Seeded parity: same payoff month and interest to the cent as simulate_payoff, whatever the debt count"""
+    rng = np.random.default_rng(2025)
+    debts = [
+        {"name": "Reported A", "balance": 1036.15, "apr": 0.2355},
+        {"name": "Reported B", "balance": 973.88, "apr": 0.2367},
+    ] + [
+        {"name": f"Debt {n}", "balance": round(float(balance), 2), "apr": round(float(apr), 4)}
+        for n, (balance, apr) in enumerate(zip(rng.uniform(10, 20000, 300), rng.uniform(0, 0.3, 300)))
+    ]
+    extras = [0, 0] + [round(float(extra), 2) for extra in rng.choice([0, 0, 25, 137.5], 300)]
+
+    for debt, extra in zip(debts, extras):
+        simulation = simulate_payoff([debt], extra)
+        row = payoff_schedule([debt], extra, "snowball")[0]
+        grid = simulate_payoff_grid([debt], [extra])
+
+        expected_month = int(simulation.payoff_month[0]) if simulation.paid_off else None
+        assert row["payoff_month"] == expected_month, debt
+        assert (grid["months"][0] == NOT_PAID_OFF) == (expected_month is None), debt
+        if expected_month is not None:
+            assert round(row["interest_paid"] * 100) == simulation.total_interest_cents(), debt
+            assert grid["months"][0] == expected_month, debt
+            assert grid["total_interest"][0] == simulation.total_interest_cents(), debt
+
+
+def test_nper_and_horizon_edges():
+    """$10,000 at 6% for 60 months pays 193.33/month; payments below interest never finish"""
+    assert round(float(nper(10000, 0.06, 193.33)), 2) == 60.0
+    assert float(nper(10000, 0.24, 200)) == float("inf")
+
+    horizon = payoff_horizon([1200, 0, 10000], [0, 0.2, 0.24], [100, 50, 150])
+    assert list(horizon["months"]) == [12, 0, NOT_PAID_OFF]
+    assert list(horizon["total_interest"][:2]) == [0, 0]
+    assert horizon["final_payment"][0] == 10000
+
+
+def test_non_amortizing_debt_stops_instead_of_overflowing():
+    """Interest at or above the whole budget never pays off; no int64 wraparound"""
+    simulation = simulate_payoff([
+        {"name": "a", "balance": 20000, "apr": 0.36},
+        {"name": "b", "balance": 100, "apr": 0.1},
+    ], 0)
+
+    assert not simulation.paid_off
+    assert simulation.total_interest_cents() >= 0
+    assert simulation.months < 12
+
+    schedule = payoff_schedule([{"name": "Card", "balance": 3000, "apr": 0.36}], 0, "snowball")
+    assert schedule[0]["payoff_month"] is None
+    assert schedule[0]["interest_paid"] is None
+
+    grid = simulate_payoff_grid([{"name": "Card", "balance": 3000, "apr": 0.36}], [0, 500])
+    assert list(grid["paid_off"]) == [False, True]
+    assert grid["total_interest"][0] == 0
+    assert grid["total_interest"][1] > 0
+
+
+def test_interest_on_huge_balances_is_exact():
+    """balance * rate numerator beyond int64 falls back to exact integers"""
+    balance = 10 ** 13  # $100B in cents; * 999,999 overflows int64
+    simulation = simulate_payoff([
+        {"name": "Jumbo", "balance": balance / 100, "apr": 0.999999, "min_payment": balance / 10},
+        {"name": "Small", "balance": 100, "apr": 0.1},
+    ], 0, "avalanche", max_months=1)
+
+    assert simulation.interest[0, 0] == (balance * 999999 + 6 * 10 ** 6) // (12 * 10 ** 6)
@@ -0,0 +1,41 @@
+"""EEFai conversation recording"""
+import asyncio
+
+from agents.eefai import record_conversation
+from event_bus import event_bus
+
+
+def test_concurrent_first_messages_create_one_instance(fake_mongo, monkeypatch):
+    published = []
+
+    async def publish(event_type, data):
+        published.append((event_type, data['user_id']))
+
+    monkeypatch.setattr(event_bus, "publish", publish)
+
+    async def scenario():
+        await asyncio.gather(*(
+            record_conversation("new@example.com", f"hi {n}", "hello", "general_question", "local")
+            for n in range(2)
+        ))
+        await record_conversation("new@example.com", "again", "hello", "general_question", "local")
+
+    asyncio.run(scenario())
+
+    (instance,) = fake_mongo.eefai_state.docs
+    assert instance["stage"] == "stabilize"
+    assert [entry["user_message"] for entry in instance["conversation_history"]] == ["hi 0", "hi 1", "again"]
+    assert published == [("user.registered", "new@example.com")]
+
+
+def test_history_keeps_the_last_30_exchanges(fake_mongo, monkeypatch):
+    monkeypatch.setattr(event_bus, "publish", lambda *args: asyncio.sleep(0))
+
+    async def scenario():
+        for n in range(35):
+            await record_conversation("u", f"m{n}", "r", "general_question", "local")
+
+    asyncio.run(scenario())
+
+    history = fake_mongo.eefai_state.docs[0]["conversation_history"]
+    assert [entry["user_message"] for entry in history] == [f"m{n}" for n in range(5, 35)]
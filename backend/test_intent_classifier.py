@@ -0,0 +1,84 @@
+"""Unit tests for the local EEFai intent classifier"""
+import pytest
+from intent_classifier import IntentClassifier, INTENT_CONFIDENCE_THRESHOLD, MIN_TRAINING_EXAMPLES
+
+
+TRAINING = [
+    ("I got a letter from a debt collector", "upload_debt_letter"),
+    ("a collection agency keeps calling me", "upload_debt_letter"),
+    ("help me save for emergencies", "create_savings_plan"),
+    ("I want to build an emergency fund", "create_savings_plan"),
+    ("there is a wrong account on my credit report", "dispute_credit_item"),
+    ("I want to dispute a late payment", "dispute_credit_item"),
+    ("what is the status of my letter", "check_status"),
+    ("any update on my progress", "check_status"),
+    ("hello there", "general_question"),
+    ("what can you do for me", "general_question"),
+]
+
+
+def trained_classifier():
+    classifier = IntentClassifier()
+    repeats = MIN_TRAINING_EXAMPLES // len(TRAINING) + 1
+    classifier.train(TRAINING * repeats)
+    return classifier
+
+
+def test_keyword_rules_without_training():
+    """Cold start answers unambiguous keyword matches"""
+    classifier = IntentClassifier()
+    intent, confidence = classifier.predict("A debt collector sent me this")
+    
+    assert classifier.trained is False
+    assert intent == "upload_debt_letter"
+    assert confidence >= INTENT_CONFIDENCE_THRESHOLD
+
+
+def test_ambiguous_keywords_defer_to_llm():
+    """Keywords from several intents give no confident answer"""
+    classifier = IntentClassifier()
+    intent, confidence = classifier.predict("dispute the collection and start savings")
+    
+    assert intent is None
+    assert confidence < INTENT_CONFIDENCE_THRESHOLD
+
+
+def test_too_few_examples_keeps_model_inactive():
+    classifier = IntentClassifier()
+    used = classifier.train(TRAINING)
+    
+    assert used == len(TRAINING)
+    assert classifier.trained is False
+
+
+def test_trained_model_classifies_without_keywords():
+    classifier = trained_classifier()
+    intent, confidence = classifier.predict("i would like to build up an emergency cushion")
+    
+    assert classifier.trained is True
+    assert intent == "create_savings_plan"
+    assert 0 < confidence <= 1
+
+
+def test_out_of_domain_message_defers_to_llm():
+    """The model alone never skips the LLM; keyword and model must agree"""
+    classifier = trained_classifier()
+    
+    for message in ("what is the weather", "tell me a joke", "who won the game last night"):
+        intent, confidence = classifier.predict(message)
+        assert confidence < INTENT_CONFIDENCE_THRESHOLD, (message, intent, confidence)
+    
+    intent, confidence = classifier.predict("what is the status of my letter")
+    assert intent == "check_status"
+    assert confidence >= INTENT_CONFIDENCE_THRESHOLD
+
+
+def test_unknown_intents_ignored_in_training():
+    classifier = IntentClassifier()
+    used = classifier.train([("something", "not_an_action")] + TRAINING)
+    
+    assert used == len(TRAINING)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""Unit tests for the micro-batched ai queue worker"""
+import asyncio
+
+import ai_utils
+from job_queue import AI_WORKER_PRIORITY, JobQueue, ai_worker, ai_worker_concurrency
+
+
+def test_worker_concurrency_follows_background_class_limit():
+    limit = ai_utils.AI_CLASS_LIMITS[AI_WORKER_PRIORITY]
+
+    assert ai_worker_concurrency() == limit
+    assert ai_worker_concurrency(limit * 2) == limit
+    assert ai_worker_concurrency(1) == 1
+
+
+def test_batch_worker_runs_ai_jobs_without_admission_queueing(fake_llm, fake_redis):
+    """A batch larger than the class limit completes with every job admitted straight away"""
+    fake_llm.delays["openai"] = 0.02
+    queue = JobQueue()
+    queue.redis = fake_redis
+    queue.register_worker('ai', ai_worker)
+    concurrency = ai_worker_concurrency(8)
+
+    async def scenario():
+        job_ids = [
+            await queue.enqueue('ai', {"system_message": "sys", "user_message": f"job {n}", "temperature": 0.5})
+            for n in range(12)
+        ]
+        worker = asyncio.create_task(queue.start_batch_worker('ai', batch_size=16, concurrency=concurrency))
+        try:
+            for _ in range(200):
+                results = [await queue.get_result(job_id) for job_id in job_ids]
+                if all(result["status"] == "completed" for result in results):
+                    return results
+                await asyncio.sleep(0.01)
+            raise AssertionError(f"jobs still pending: {results}")
+        finally:
+            worker.cancel()
+
+    results = asyncio.run(scenario())
+
+    assert sorted(result["result"]["result"] for result in results) == sorted(f"openai: job {n}" for n in range(12))
+    assert fake_llm.max_active <= concurrency
+    assert ai_utils.admission_controller.stats["queued"] == 0
+
+
+def _recording_queue(redis, handler):
+    """JobQueue on the given Redis that logs every stored status"""
+    queue = JobQueue()
+    queue.redis = redis
+    queue.register_worker('work', handler)
+    statuses = []
+    store_result = queue.store_result
+
+    async def record(job_id, status, result=None, error=None):
+        statuses.append(status)
+        await store_result(job_id, status, result, error)
+
+    queue.store_result = record
+    return queue, statuses
+
+
+def test_legacy_worker_reports_failed_only_when_retries_run_out(fake_redis):
+    attempts = {"flaky": 0, "broken": 0}
+
+    async def handler(job_data):
+        attempts[job_data["name"]] += 1
+        if job_data["name"] == "broken" or attempts["flaky"] < 2:
+            raise RuntimeError("boom")
+        return "ok"
+
+    async def scenario(name):
+        queue, statuses = _recording_queue(fake_redis, handler)
+        job_id = await queue.enqueue('work', {"name": name})
+        worker = asyncio.create_task(queue.start_worker('work'))
+        try:
+            for _ in range(100):
+                record = await queue.get_result(job_id)
+                if record["status"] in ("completed", "failed"):
+                    return record, statuses
+                await asyncio.sleep(0.01)
+            raise AssertionError(f"job still pending: {record}")
+        finally:
+            worker.cancel()
+
+    record, statuses = asyncio.run(scenario("flaky"))
+    assert record["result"] == "ok"
+    assert "failed" not in statuses
+    assert statuses.count("retrying") == 1
+
+    record, statuses = asyncio.run(scenario("broken"))
+    assert (attempts["broken"], record["error"]) == (3, "boom")
+    assert statuses.count("failed") == 1 and statuses[-1] == "failed"
+
+
+def test_cancelled_batch_worker_cancels_and_requeues_in_flight_jobs(fake_redis):
+    started, cancelled = [], []
+
+    async def handler(job_data):
+        started.append(job_data["n"])
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(job_data["n"])
+            raise
+
+    async def scenario():
+        queue, _ = _recording_queue(fake_redis, handler)
+        job_ids = [await queue.enqueue('work', {"n": n}) for n in range(2)]
+        worker = asyncio.create_task(queue.start_batch_worker('work', concurrency=2))
+        while len(started) < 2:
+            await asyncio.sleep(0.01)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        return queue, job_ids
+
+    queue, job_ids = asyncio.run(scenario())
+
+    assert sorted(cancelled) == [0, 1]
+    assert len(queue.redis.sets["queue:work"]) == 2
+    assert [asyncio.run(queue.get_result(job_id))["status"] for job_id in job_ids] == ["pending", "pending"]
@@ -0,0 +1,106 @@
+"""Batch legal checks must match /check item by item"""
+import asyncio
+
+from agents.legal import batch_item_context, check_legal, check_legal_batch, run_batch_ai_analysis
+from complete_legal_rules import DEFAULT_LEGAL_CHECKS
+from legal_knowledge import LegalSnapshot, legal_knowledge
+from schemas import LegalBatchCheckInput, LegalBatchItem, LegalCheckInput, LegalCheckMode, UserState
+
+
+WILDCARD_CHECK = {
+    'check_code': 'CA_ANY_ACTION', 'action_types': ['*'],
+    'when': {'field': 'state', 'op': 'eq', 'value': 'CA'},
+    'severity': 'low',
+    'explanation': 'California consumers are also covered by the Rosenthal Act.',
+    'citation': {'id': 'CA_RFDCPA', 'title': 'Rosenthal Act', 'text_snippet': 'Cal. Civ. Code § 1788'},
+}
+
+SOL_ROWS = [
+    {'state_code': 'CA', 'debt_type': 'credit_card', 'years': 4},
+    {'state_code': 'OH', 'debt_type': 'credit_card', 'years': 6},
+]
+
+ITEMS = [
+    LegalBatchItem(item_id="expired", state="CA", account_date="2010-01-01"),
+    LegalBatchItem(item_id="recent", state="OH", account_date="2024-06-01"),
+    LegalBatchItem(item_id="unknown-sol", state="OH", debt_type="medical", account_date="2010-01-01"),
+    LegalBatchItem(item_id="validation", state="CA", action_type="debt_validation"),
+    LegalBatchItem(item_id="late-call", state="OH", action_type="collection_contact", context={"contact_hour": 22}),
+    LegalBatchItem(item_id="dispute", state="CA", action_type="credit_dispute"),
+]
+
+
+def test_batch_matches_single_checks(monkeypatch):
+    """Statute items also get the compiled (including '*') checks, exactly like /check"""
+    monkeypatch.setattr(
+        legal_knowledge, "snapshot", LegalSnapshot("test", [], SOL_ROWS, DEFAULT_LEGAL_CHECKS + [WILDCARD_CHECK])
+    )
+    mode = LegalCheckMode.DETERMINISTIC
+
+    async def scenario():
+        batch = await check_legal_batch(LegalBatchCheckInput(items=ITEMS, trace_id="t", mode=mode))
+        singles = [
+            await check_legal(LegalCheckInput(
+                user_state=UserState(state=item.state),
+                action_type=item.action_type,
+                context=batch_item_context(item),
+                trace_id="t",
+                mode=mode
+            ))
+            for item in ITEMS
+        ]
+        return batch, singles
+
+    batch, singles = asyncio.run(scenario())
+
+    for result, single in zip(batch.results, singles):
+        assert (result.ok, result.flags, result.citations, result.must_escalate) == (
+            single.ok, single.flags, single.citations, single.must_escalate
+        ), result.item_id
+    codes = {result.item_id: [flag.code for flag in result.flags] for result in batch.results}
+    assert codes["expired"] == ["SOL_EXPIRED", "CA_ANY_ACTION"]
+    assert codes["unknown-sol"] == ["SOL_UNKNOWN"]
+
+
+def test_ai_groups_never_mix_states(monkeypatch):
+    """Each AI prompt covers one state, and its rule search is filtered by it"""
+    calls = []
+
+    async def fake_group(items, group, state, session_id):
+        calls.append((state, [items[i].state.upper() for i in group]))
+        return {}
+
+    monkeypatch.setattr("agents.legal._analyze_batch_group", fake_group)
+    asyncio.run(run_batch_ai_analysis(ITEMS, list(range(len(ITEMS))), "t"))
+
+    assert sorted(state for state, _ in calls) == ["CA", "OH"]
+    assert all(set(states) == {state} for state, states in calls)
+
+
+def test_failed_ai_group_keeps_deterministic_results(monkeypatch):
+    """A failed state group and an item the model left out come back degraded and escalated, not clean"""
+    monkeypatch.setattr(
+        legal_knowledge, "snapshot", LegalSnapshot("test", [], SOL_ROWS, DEFAULT_LEGAL_CHECKS)
+    )
+    items = [
+        LegalBatchItem(item_id="oh-late-call", state="OH", action_type="collection_contact", context={"contact_hour": 22}),
+        LegalBatchItem(item_id="ca-reviewed", state="CA", action_type="collection_contact", context={"note": "x"}),
+        LegalBatchItem(item_id="ca-omitted", state="CA", action_type="collection_contact", context={"note": "y"}),
+        LegalBatchItem(item_id="ca-statute", state="CA", account_date="2010-01-01"),
+    ]
+
+    async def fake_group(items, group, state, session_id):
+        if state == "OH":
+            raise RuntimeError("upstream 500")
+        return {group[0]: ([], False)}
+
+    monkeypatch.setattr("agents.legal._analyze_batch_group", fake_group)
+    batch = asyncio.run(check_legal_batch(LegalBatchCheckInput(items=items, trace_id="t", mode=LegalCheckMode.FULL)))
+    results = {result.item_id: result for result in batch.results}
+
+    assert [flag.code for flag in results["oh-late-call"].flags] == ["FDCPA_CONTACT_HOURS"]
+    assert (results["oh-late-call"].degraded, results["oh-late-call"].must_escalate) == (True, True)
+    assert (results["ca-reviewed"].degraded, results["ca-reviewed"].must_escalate) == (False, False)
+    assert (results["ca-omitted"].degraded, results["ca-omitted"].must_escalate) == (True, True)
+    assert results["ca-statute"].degraded
+    assert [flag.code for flag in results["ca-statute"].flags] == ["SOL_EXPIRED"]
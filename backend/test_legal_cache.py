@@ -0,0 +1,82 @@
+"""Legal check result cache: keys, knowledge-version invalidation and degraded answers"""
+import asyncio
+
+from agents import legal
+from agents.legal import LEGAL_DB_VERSION, check_legal, legal_check_input_hash
+from cache_layer import legal_check_cache_key
+from complete_legal_rules import DEFAULT_LEGAL_CHECKS
+from legal_knowledge import LegalSnapshot, legal_knowledge
+from schemas import LegalCheckInput, LegalCheckMode, UserState
+
+
+def check_input(context, trace_id="t", mode=LegalCheckMode.FULL):
+    return LegalCheckInput(
+        user_state=UserState(state="CA"),
+        action_type="collection_contact",
+        context=context,
+        trace_id=trace_id,
+        mode=mode
+    )
+
+
+def test_key_keeps_empty_and_missing_fields_apart():
+    mode = LegalCheckMode.FULL
+    hashes = [
+        legal_check_input_hash(check_input(context), mode)
+        for context in ({}, {"note": None}, {"note": ""}, {"note": []}, {"note": "x"})
+    ]
+
+    assert len(set(hashes)) == len(hashes)
+    assert legal_check_input_hash(check_input({"note": "x"}, trace_id="other"), mode) == hashes[-1]
+    assert legal_check_input_hash(check_input({}), LegalCheckMode.DETERMINISTIC) != hashes[0]
+
+
+def test_knowledge_version_bump_misses_the_cache(fake_redis, monkeypatch):
+    input_data = check_input({"contact_hour": 22}, mode=LegalCheckMode.DETERMINISTIC)
+
+    async def check_with(version):
+        monkeypatch.setattr(legal_knowledge, "snapshot", LegalSnapshot(version, [], [], DEFAULT_LEGAL_CHECKS))
+        await check_legal(input_data)
+        return legal_check_cache_key(
+            f"{LEGAL_DB_VERSION}:{version}",
+            legal_check_input_hash(input_data, LegalCheckMode.DETERMINISTIC)
+        )
+
+    async def scenario():
+        return await check_with("v1"), await check_with("v1"), await check_with("v2")
+
+    first, repeat, bumped = asyncio.run(scenario())
+
+    assert first == repeat != bumped
+    assert set(fake_redis.values) == {first, bumped}
+
+
+def test_degraded_ai_review_is_not_cached(fake_redis, monkeypatch):
+    monkeypatch.setattr(legal_knowledge, "snapshot", LegalSnapshot("v1", [], [], DEFAULT_LEGAL_CHECKS))
+    reviews = {"degraded": True}
+
+    async def fake_ai_analysis(input_data):
+        return [], False, reviews["degraded"]
+
+    monkeypatch.setattr(legal, "run_ai_analysis", fake_ai_analysis)
+    input_data = check_input({"note": "free text the rule engine does not read"})
+
+    async def scenario():
+        await check_legal(input_data)
+        after_degraded = dict(fake_redis.values)
+        reviews["degraded"] = False
+        await check_legal(input_data)
+        return after_degraded
+
+    assert asyncio.run(scenario()) == {}
+    assert len(fake_redis.values) == 1
+
+
+def test_fallback_provider_review_is_degraded(fake_llm, monkeypatch):
+    """An answer from the fallback provider marks the AI review degraded"""
+    monkeypatch.setattr(legal_knowledge, "snapshot", LegalSnapshot("v1", [], [], DEFAULT_LEGAL_CHECKS))
+    fake_llm.failures["openai"] = RuntimeError("upstream 500")
+
+    _, _, degraded = asyncio.run(legal.run_ai_analysis(check_input({"note": "x"})))
+
+    assert degraded
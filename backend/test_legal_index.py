@@ -0,0 +1,28 @@
+"""Unit tests for the BM25 legal rule index"""
+from legal_index import RuleIndex, build_rule_query, complete_rule_index, tokenize
+
+
+def test_tokenize_strips_stopwords_and_suffixes():
+    """Stopwords are removed and plural/tense variants share a term"""
+    assert tokenize("The disputes were disputed") == ["disput", "disput"]
+
+
+def test_search_ranks_matching_rule_first():
+    """The rule matching the action vocabulary ranks first"""
+    index = complete_rule_index()
+
+    assert index.search(build_rule_query("debt_validation"), k=3)[0]['rule_code'] == 'FDCPA_809'
+    assert index.search(build_rule_query("credit_dispute"), k=3)[0]['rule_code'] == 'FCRA_611'
+
+
+def test_search_filters_other_states():
+    """Rules scoped to another state are never returned"""
+    index = RuleIndex([
+        {'rule_code': 'CA_RULE', 'rule_type': 'debt_collection', 'state_code': 'CA', 'rule_text': 'collector calls'},
+        {'rule_code': 'NY_RULE', 'rule_type': 'debt_collection', 'state_code': 'NY', 'rule_text': 'collector calls'},
+        {'rule_code': 'FED_RULE', 'rule_type': 'debt_collection', 'state_code': None, 'rule_text': 'collector'},
+    ])
+
+    codes = [rule['rule_code'] for rule in index.search("collector calls", k=5, state='ca')]
+
+    assert codes == ['CA_RULE', 'FED_RULE']
@@ -0,0 +1,38 @@
+"""Unit tests for the in-process legal knowledge snapshot"""
+from legal_knowledge import LegalSnapshot
+
+
+RULES = [
+    {'rule_code': 'FDCPA_809', 'rule_type': 'debt_collection', 'state_code': None, 'rule_text': 'Validation'},
+    {'rule_code': 'FCRA_611', 'rule_type': 'credit_reporting', 'state_code': None, 'rule_text': 'Disputes'},
+    {'rule_code': 'CA_RFDCPA', 'rule_type': 'debt_collection', 'state_code': 'CA', 'rule_text': 'Rosenthal Act'},
+    {'rule_code': 'CROA_404', 'rule_type': 'credit_repair', 'state_code': None, 'rule_text': 'Disclosures'},
+]
+
+SOL_ROWS = [
+    {'state_code': 'CA', 'debt_type': 'credit_card', 'years': 4},
+    {'state_code': 'NY', 'debt_type': 'credit_card', 'years': 6},
+]
+
+
+def test_snapshot_indexes_rules():
+    """Rules are reachable by code, type and state"""
+    snapshot = LegalSnapshot("v-test", RULES, SOL_ROWS)
+
+    assert snapshot.rule('FCRA_611')['rule_text'] == 'Disputes'
+    assert snapshot.rule('MISSING') is None
+    assert [r['rule_code'] for r in snapshot.rules_of_type('debt_collection', 'credit_reporting')] == [
+        'FDCPA_809', 'FCRA_611', 'CA_RFDCPA'
+    ]
+    assert [r['rule_code'] for r in snapshot.rules_for_state('ca')] == [
+        'FDCPA_809', 'FCRA_611', 'CROA_404', 'CA_RFDCPA'
+    ]
+
+
+def test_snapshot_sol_lookup_is_case_insensitive():
+    """SOL rows are keyed by upper-case state and lower-case debt type"""
+    snapshot = LegalSnapshot("v-test", RULES, SOL_ROWS)
+
+    assert snapshot.sol_row('ca', 'Credit_Card')['years'] == 4
+    assert snapshot.sol_row('TX', 'credit_card') is None
+    assert snapshot.summary()['sol_rows'] == 2
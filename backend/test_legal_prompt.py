@@ -0,0 +1,53 @@
+"""Unit tests for LegalAI prompt assembly"""
+from legal_prompt import (
+    build_system_prompt,
+    build_user_prompt,
+    compact_context,
+    estimate_tokens,
+    rules_key
+)
+
+
+RULES = [
+    {'rule_code': 'FDCPA_809', 'rule_text': 'Debt collector must   provide validation\n within 30 days.'},
+    {'rule_code': 'FCRA_611', 'rule_text': 'Credit bureaus must investigate disputes within 30 days.'},
+]
+
+
+def test_system_prompt_is_cached_per_version():
+    """Same version and rules should return the cached prompt object"""
+    first = build_system_prompt("v-test", rules_key(RULES))
+    second = build_system_prompt("v-test", rules_key(RULES))
+
+    assert first is second
+    assert "- FDCPA_809: Debt collector must provide validation within 30 days." in first
+    assert build_system_prompt("v-other", rules_key(RULES)) != first
+
+
+def test_compact_context_drops_empty_and_duplicate_fields():
+    """Empty values and values repeated under another key are removed"""
+    letter = "Please pay the balance owed to Acme Collections immediately."
+    context = {"letter": letter, "letter_copy": letter, "notes": ["a", "a", "b"], "empty": "", "none": None}
+
+    compacted = compact_context(context)
+
+    assert compacted == {"letter": letter, "notes": ["a", "b"]}
+
+
+def test_compact_context_respects_token_budget():
+    """Long fields are truncated so the serialized context fits the budget"""
+    context = {"creditor_name": "Acme", "letter_text": "word " * 5000}
+
+    compacted = compact_context(context, token_budget=200)
+
+    assert compacted["creditor_name"] == "Acme"
+    assert compacted["letter_text"].endswith("…")
+    assert estimate_tokens(build_user_prompt("debt_validation", "CA", context)) < 5000 // 4
+
+
+def test_user_prompt_is_order_independent():
+    """Key order in the context does not change the prompt"""
+    a = build_user_prompt("statute_check", "NY", {"debt_type": "credit_card", "account_date": "2015-01-01"})
+    b = build_user_prompt("statute_check", "NY", {"account_date": "2015-01-01", "debt_type": "credit_card"})
+
+    assert a == b
@@ -0,0 +1,64 @@
+"""Unit tests for the compiled legal rule engine"""
+from datetime import date
+
+from complete_legal_rules import DEFAULT_LEGAL_CHECKS
+from legal_rule_engine import RuleEngine, compile_condition
+
+
+def test_default_checks_reproduce_original_fdcpa_fcra_output():
+    """Seeded checks give the same flags/citations as the old hand-written checks"""
+    engine = RuleEngine(DEFAULT_LEGAL_CHECKS)
+
+    flags, citations = engine.evaluate("debt_validation", "OH", {}, "v1.0")
+    assert [f.code for f in flags] == ["FDCPA_VALIDATION_REQUIRED"]
+    assert flags[0].explanation == "Under FDCPA § 809, you have the right to request debt validation."
+    assert [(c.id, c.db_version) for c in citations] == [("FDCPA_809", "v1.0")]
+
+    flags, _ = engine.evaluate("debt_validation", "OH", {"creditor_name": "Acme"}, "v1.0")
+    assert flags == []
+
+    flags, citations = engine.evaluate("credit_dispute", "OH", {}, "v1.0")
+    assert [f.code for f in flags] == ["FCRA_DISPUTE_RIGHT"]
+    assert [c.id for c in citations] == ["FCRA_611"]
+
+
+def test_conditions_cover_numbers_dates_and_combinators():
+    """Numeric, date, regex and boolean combinators compile to predicates"""
+    fields = set()
+    predicate = compile_condition({'all': [
+        {'field': 'context.calls', 'op': 'gt', 'value': 7},
+        {'any': [
+            {'field': 'context.notice_date', 'op': 'days_since_lte', 'value': 30},
+            {'field': 'context.note', 'op': 'matches', 'value': r'\bthreat'}
+        ]},
+        {'not': {'field': 'state', 'op': 'in', 'value': ['ny']}}
+    ]}, fields)
+    today = date(2024, 3, 1)
+
+    assert predicate({"state": "CA", "context": {"calls": 8, "notice_date": "2024-02-15"}}, today)
+    assert predicate({"state": "CA", "context": {"calls": "9", "note": "They THREATENED me"}}, today)
+    assert not predicate({"state": "NY", "context": {"calls": 8, "notice_date": "2024-02-15"}}, today)
+    assert not predicate({"state": "CA", "context": {"calls": 8, "notice_date": "2023-01-01"}}, today)
+    assert not predicate({"state": "CA", "context": {"notice_date": "2024-02-15"}}, today)
+    assert fields == {"context.calls", "context.notice_date", "context.note", "state"}
+
+
+def test_bad_checks_are_skipped_and_reported():
+    """A check that fails to compile does not break the others"""
+    engine = RuleEngine([
+        {'check_code': 'BROKEN', 'when': {'field': 'context.x', 'op': 'nope'}, 'explanation': 'x'},
+        {'check_code': 'OK', 'action_types': ['a'], 'when': {}, 'explanation': 'fine'},
+    ])
+
+    assert list(engine.errors) == ['BROKEN']
+    assert [f.code for f in engine.evaluate("a", "CA", {}, "v1")[0]] == ['OK']
+
+
+def test_residual_context_is_what_no_check_reads():
+    """Only context fields unknown to the checks are left for the LLM"""
+    engine = RuleEngine(DEFAULT_LEGAL_CHECKS)
+
+    assert engine.residual_context("debt_validation", {"creditor_name": "Acme", "calls_last_7_days": 2}) == {}
+    assert engine.residual_context("debt_validation", {"creditor_name": "Acme", "letter_text": "Pay now"}) == {
+        "letter_text": "Pay now"
+    }
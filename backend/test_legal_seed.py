@@ -0,0 +1,54 @@
+"""Unit tests for legal seed content hashing and idempotent seeding"""
+import asyncio
+from datetime import datetime, timezone
+
+import database
+from complete_legal_rules import (
+    COMPLETE_CROA_RULES,
+    COMPLETE_FCRA_RULES,
+    COMPLETE_FDCPA_RULES,
+    seed_complete_legal_rules
+)
+from legal_knowledge import LEGAL_KB_VERSION_KEY, legal_knowledge
+from legal_seed import content_hash, has_changes, seed_legal_knowledge, sol_seed_documents
+
+
+def test_content_hash_ignores_bookkeeping_fields():
+    """updated_at/content_hash do not change the hash; content does"""
+    doc = {'state_code': 'CA', 'debt_type': 'credit_card', 'years': 4}
+    stored = {**doc, 'content_hash': 'abc', 'updated_at': datetime.now(timezone.utc)}
+
+    assert content_hash(stored) == content_hash(doc)
+    assert content_hash({**doc, 'years': 5}) != content_hash(doc)
+
+
+def test_sol_seed_documents_are_unique_per_state_and_debt_type():
+    """Seed data has one row per (state, debt_type)"""
+    docs = sol_seed_documents()
+    keys = {(doc['state_code'], doc['debt_type']) for doc in docs}
+
+    assert len(keys) == len(docs) == 100
+
+
+def test_seeding_twice_keeps_the_knowledge_version(fake_mongo, monkeypatch):
+    """A second run (through any seeder) finds every row unchanged and does not bump the version"""
+    monkeypatch.setattr(legal_knowledge, "snapshot", None)
+    db = fake_mongo
+
+    first = asyncio.run(seed_legal_knowledge(db))
+    asyncio.run(database.seed_legal_data_mongo())
+    asyncio.run(seed_complete_legal_rules(db))
+    second = asyncio.run(seed_legal_knowledge(db))
+
+    assert first["version"] is not None
+    assert second["version"] is None
+    assert not has_changes(second["collections"])
+    meta = asyncio.run(db.legal_meta.find_one({'_id': LEGAL_KB_VERSION_KEY}))
+    assert meta["version"] == first["version"]
+
+
+def test_legal_rule_codes_have_one_source():
+    """Every seeded rule code appears once, so no two seeders fight over a row"""
+    codes = [rule['rule_code'] for rule in COMPLETE_FDCPA_RULES + COMPLETE_FCRA_RULES + COMPLETE_CROA_RULES]
+
+    assert len(codes) == len(set(codes))
@@ -0,0 +1,133 @@
+"""Golden-vector tests: the integer-cents math must match the original Decimal outputs"""
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from agents.cfp import CFP_RISK_MAX_WEEKS, CFP_VERSION, simulate_risk, simulate_scenario
+from canonical_json import payload_hash
+from math_utils import (
+    calculate_amortization,
+    calculate_credit_utilization,
+    calculate_dti,
+    calculate_monthly_surplus,
+    generate_savings_schedule,
+    monthly_surplus_array,
+    savings_plan_array,
+    simulate_emergency_fund
+)
+from schemas import CFPRiskInput, CFPSimulateInput
+
+GOLDEN = json.loads((Path(__file__).parent / 'cfp_golden_vectors.json').read_text())
+
+
+def test_surplus_and_checksum_match_golden():
+    """monthly_surplus is bit-identical, so the simulate checksum is stable"""
+    for row in GOLDEN['surplus']:
+        surplus = float(calculate_monthly_surplus(row['income'], row['expenses']))
+        checksum = payload_hash({
+            "income": float(row['income']),
+            "expenses": float(row['expenses']),
+            "monthly_surplus": surplus,
+            "cfp_version": CFP_VERSION
+        })
+
+        assert surplus == row['monthly_surplus'], row
+        assert checksum == row['checksum'], row
+
+    surpluses = monthly_surplus_array(
+        [row['income'] for row in GOLDEN['surplus']],
+        [row['expenses'] for row in GOLDEN['surplus']]
+    )
+    assert list(surpluses) == [row['monthly_surplus'] for row in GOLDEN['surplus']]
+
+
+def test_amortization_matches_golden():
+    for row in GOLDEN['amortization']:
+        assert str(calculate_amortization(row['principal'], row['apr'], row['months'])) == row['payment'], row
+
+
+def test_savings_schedule_matches_golden():
+    """Including the Decimal path's trailing 0.00 deposit (e.g. $1000 over 90 days)"""
+    for row in GOLDEN['savings_schedule']:
+        amounts = [entry['amount'] for entry in generate_savings_schedule(row['goal_amount'], row['deadline_days'], 0)]
+        assert amounts == row['amounts'], row
+
+    plans = savings_plan_array(
+        [row['goal_amount'] for row in GOLDEN['savings_schedule']],
+        [row['deadline_days'] for row in GOLDEN['savings_schedule']]
+    )
+    for index, row in enumerate(GOLDEN['savings_schedule']):
+        amounts = row['amounts']
+        assert int(plans['deposits'][index]) == len(amounts), row
+        if amounts:
+            assert plans['weekly'][index] == amounts[0], row
+            assert plans['final'][index] == amounts[-1], row
+
+
+def test_ratios_match_golden():
+    for row in GOLDEN['credit_utilization']:
+        assert str(calculate_credit_utilization(row['balance'], row['limit'])) == row['utilization'], row
+    for row in GOLDEN['dti']:
+        assert str(calculate_dti(row['monthly_debt_payments'], row['gross_monthly_income'])) == row['dti'], row
+
+
+def test_simulate_matches_golden():
+    """/simulate surplus, savings plan, paydown schedule (to the cent) and checksum"""
+    for row in GOLDEN['simulate']:
+        result = asyncio.run(simulate_scenario(
+            CFPSimulateInput(user_id="golden", scenario=row['scenario'], trace_id="golden")
+        ))
+        calculations = result.calculations
+        paydown = [
+            {
+                "account": entry.account,
+                "payment": entry.payment,
+                "payoff_month": entry.payoff_month,
+                "interest_paid": entry.interest_paid
+            }
+            for entry in calculations.paydown_schedule
+        ]
+
+        assert calculations.monthly_surplus == row['monthly_surplus'], row['scenario']
+        assert [entry.amount for entry in calculations.savings_plan] == row['savings_amounts'], row['scenario']
+        assert paydown == row['paydown'], row['scenario']
+        assert result.checksum == row['checksum'], row['scenario']
+
+
+def test_emergency_fund_is_seeded_and_matches_steady_case():
+    """Same seed, same result; without volatility it reduces to the steady savings rate"""
+    first = simulate_emergency_fund(3000, 2200, 1000, 90, paths=500, seed=7)
+    assert simulate_emergency_fund(3000, 2200, 1000, 90, paths=500, seed=7) == first
+    assert 0 < first["goal_probability"] < 1
+    bands = first["bands"]
+    assert all(low <= high for low, high in zip(bands["p5"], bands["p95"]))
+
+    # 800/month surplus, half saved: ~92.31/week reaches $1000 in week 11
+    steady = simulate_emergency_fund(
+        3000, 2200, 1000, 90,
+        income_volatility=0, expense_volatility=0, shocks_per_year=0, paths=50, seed=7
+    )
+    assert steady["goal_probability"] == 1.0
+    assert steady["median_weeks_to_goal"] == 11
+    assert steady["bands"]["p5"][0] == steady["bands"]["p95"][0] == 92.31
+
+
+def test_risk_rejects_deadline_beyond_week_cap():
+    """The engine runs to the deadline, so a huge deadline_days must not bypass CFP_RISK_MAX_WEEKS"""
+    request = CFPRiskInput(
+        user_id="u",
+        scenario={
+            "income": 3000,
+            "expenses": 2200,
+            "goal": {"type": "emergency", "amount": 1000, "deadline_days": 7 * CFP_RISK_MAX_WEEKS + 1}
+        },
+        paths=10,
+        horizon_weeks=4,
+        trace_id="t"
+    )
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(simulate_risk(request))
+    assert error.value.status_code == 400
@@ -0,0 +1,28 @@
+"""Unit tests for the integer-cents money core"""
+from decimal import ROUND_HALF_EVEN
+
+import numpy as np
+
+from money import div_round, div_round_array, exact_cents, to_cents, to_cents_array
+
+
+def test_float_conversion_follows_shortest_repr():
+    """1.005 is 100.49999... in binary but converts like Decimal('1.005')"""
+    assert to_cents(1.005) == 101
+    assert to_cents(2.675, ROUND_HALF_EVEN) == 268
+    assert to_cents(0.1 + 0.2) == 30
+    assert exact_cents(19.99) == 1999
+    assert exact_cents(0.125) is None
+    assert list(to_cents_array([1.005, 19.99, -2.5])) == [101, 1999, -250]
+
+
+def test_rounding_modes():
+    assert [div_round(n, 2) for n in (5, 7, -5)] == [3, 4, -3]
+    assert [div_round(n, 2, ROUND_HALF_EVEN) for n in (5, 7, -5)] == [2, 4, -2]
+    assert div_round(10, 3) == 3 and div_round(-10, 3) == -3
+
+    numerators = np.array([5, 7, -5, 10, -10, 11])
+    assert list(div_round_array(numerators, 2)) == [div_round(int(n), 2) for n in numerators]
+    assert list(div_round_array(numerators, 2, ROUND_HALF_EVEN)) == [
+        div_round(int(n), 2, ROUND_HALF_EVEN) for n in numerators
+    ]
@@ -0,0 +1,46 @@
+"""Unit tests for the SOL matrix and expiry arithmetic"""
+from datetime import date
+
+import numpy as np
+
+from sol_engine import (
+    UNKNOWN_SOL,
+    SOLMatrix,
+    compute_expiry,
+    expired_mask,
+    parse_account_dates,
+    seed_sol_matrix
+)
+
+
+def test_seed_matrix_covers_all_states():
+    """Every state has credit_card and written_contract periods"""
+    matrix = seed_sol_matrix()
+
+    assert len(matrix.states) == 50
+    assert matrix.lookup('ca', 'Credit_Card') == 4
+    assert matrix.lookup('IL', 'written_contract') == 10
+
+
+def test_missing_entries_are_unknown_not_defaulted():
+    """Unknown state or debt type is reported, never assumed"""
+    matrix = SOLMatrix([('CA', 'credit_card', 4)])
+
+    assert matrix.lookup('CA', 'medical') is None
+    assert list(matrix.lookup_many(['CA', 'ZZ', 'CA'], ['credit_card', 'credit_card', 'auto'])) == [
+        4, UNKNOWN_SOL, UNKNOWN_SOL
+    ]
+
+
+def test_compute_expiry_matches_years_times_365_days():
+    """Expiry is account date + years * 365 days; days remaining against today"""
+    dates = parse_account_dates(['2020-01-01', '2022-06-15T10:30:00', None, 'not a date'])
+    years = np.array([4, 3, 4, 4])
+
+    expiry, remaining = compute_expiry(dates, years, today=date(2024, 1, 1))
+
+    assert str(expiry[0]) == '2023-12-31'
+    assert str(expiry[1]) == '2025-06-14'
+    assert np.isnat(expiry[2]) and np.isnat(expiry[3])
+    assert list(remaining) == [-1, 530, 0, 0]
+    assert list(expired_mask(expiry, remaining)) == [True, False, False, False]